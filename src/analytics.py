@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+from src.core.derived_registry import Registry, pct
+from src.core.schema import compact_frame
+
 def round_half_up(series, decimals=0):
     """
     Round numbers standardly (half up away from zero).
@@ -177,8 +180,12 @@ def normalize_stats(df):
     df[cols] = df[cols].fillna(0)
     return df
 
-def calculate_derived_stats(df):
-    """Vectorized calculation of advanced stats for players."""
+def calculate_derived_stats(df, metrics=None):
+    """Vectorized calculation of advanced stats for players.
+
+    metrics: names from PLAYER_METRICS to compute (default: all). Metrics already
+    computed on the same inputs are not recomputed (see src.core.derived_registry).
+    """
     if df.empty: return df
     
     # Ensure all columns exist (defensive)
@@ -189,24 +196,9 @@ def calculate_derived_stats(df):
     # Only calculate 2PM/2PA if they are missing or zero
     # The parser provides accurate 2PM/2PA from actual game data, don't overwrite it
     mask_2p_missing = (df["2PM"].fillna(0) == 0) & (df["2PA"].fillna(0) == 0)
-    df.loc[mask_2p_missing, "2PM"] = df.loc[mask_2p_missing, "FGM"] - df.loc[mask_2p_missing, "3PM"]
-    df.loc[mask_2p_missing, "2PA"] = df.loc[mask_2p_missing, "FGA"] - df.loc[mask_2p_missing, "3PA"]
-    
-    
-    # 1. Percentages
-    df["FG%"] = (df["FGM"] / df["FGA"] * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    df["2P%"] = (df["2PM"] / df["2PA"] * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    df["3P%"] = (df["3PM"] / df["3PA"] * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    df["FT%"] = (df["FTM"] / df["FTA"] * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    df["eFG%"] = ((df["FGM"] + 0.5 * df["3PM"]) / df["FGA"] * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    
-    ts_denom = 2 * (df["FGA"] + 0.44 * df["FTA"])
-    df["TS%"] = (df["PTS"] / ts_denom * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    
-    # 2. Efficiency (NBA)
-    missed_fg = df["FGA"] - df["FGM"]
-    missed_ft = df["FTA"] - df["FTM"]
-    df["Eff"] = (df["PTS"] + df["REB"] + df["AST"] + df["STL"] + df["BLK"]) - (missed_fg + missed_ft + df["TOV"])
+    if mask_2p_missing.any():
+        df.loc[mask_2p_missing, "2PM"] = df.loc[mask_2p_missing, "FGM"] - df.loc[mask_2p_missing, "3PM"]
+        df.loc[mask_2p_missing, "2PA"] = df.loc[mask_2p_missing, "FGA"] - df.loc[mask_2p_missing, "3PA"]
     
     # 3. Advanced Context (Possessions)
     # Only calculate TmPoss/OppPoss if they don't exist or are all zeros
@@ -216,16 +208,60 @@ def calculate_derived_stats(df):
     
     if "OppPoss" not in df.columns or (df["OppPoss"] == 0).all():
         df["OppPoss"] = df["OppFGA"] + 0.44 * df["OppFTA"] - df["OppOREB"] + df["OppTOV"]
-    
-    df["PPoss"] = df["FGA"] + 0.44 * df["FTA"] + df["TOV"]
-    df["TSA"] = df["FGA"] + 0.44 * df["FTA"]
-    
-    # 4. Advanced Metrics
-    # USG% = 100 * ((FGA + 0.44 * FTA + TOV) * (TmMin / 5)) / (Min * (TmFGA + 0.44 * TmFTA + TmTOV))
+
+    return PLAYER_METRICS.compute(df, metrics)
+
+
+# --- PLAYER METRIC REGISTRY ---
+# Each metric declares its input columns and dependencies; see calculate_derived_stats.
+PLAYER_METRICS = Registry("players", round_func=round_half_up)
+
+# 1. Percentages
+@PLAYER_METRICS.register("FG%", inputs=["FGM", "FGA"], round_to=1)
+def _fg_pct(df):
+    return pct(df["FGM"], df["FGA"])
+
+@PLAYER_METRICS.register("2P%", inputs=["2PM", "2PA"], round_to=1)
+def _2p_pct(df):
+    return pct(df["2PM"], df["2PA"])
+
+@PLAYER_METRICS.register("3P%", inputs=["3PM", "3PA"], round_to=1)
+def _3p_pct(df):
+    return pct(df["3PM"], df["3PA"])
+
+@PLAYER_METRICS.register("FT%", inputs=["FTM", "FTA"], round_to=1)
+def _ft_pct(df):
+    return pct(df["FTM"], df["FTA"])
+
+@PLAYER_METRICS.register("eFG%", inputs=["FGM", "3PM", "FGA"], round_to=1)
+def _efg_pct(df):
+    return pct(df["FGM"] + 0.5 * df["3PM"], df["FGA"])
+
+@PLAYER_METRICS.register("TS%", inputs=["PTS", "FGA", "FTA"], round_to=1)
+def _ts_pct(df):
+    return pct(df["PTS"], 2 * (df["FGA"] + 0.44 * df["FTA"]))
+
+# 2. Efficiency (NBA)
+@PLAYER_METRICS.register("Eff", inputs=["PTS", "REB", "AST", "STL", "BLK", "FGA", "FGM", "FTA", "FTM", "TOV"])
+def _eff(df):
+    missed_fg = df["FGA"] - df["FGM"]
+    missed_ft = df["FTA"] - df["FTM"]
+    return (df["PTS"] + df["REB"] + df["AST"] + df["STL"] + df["BLK"]) - (missed_fg + missed_ft + df["TOV"])
+
+@PLAYER_METRICS.register("PPoss", inputs=["FGA", "FTA", "TOV"])
+def _pposs(df):
+    return df["FGA"] + 0.44 * df["FTA"] + df["TOV"]
+
+@PLAYER_METRICS.register("TSA", inputs=["FGA", "FTA"])
+def _tsa(df):
+    return df["FGA"] + 0.44 * df["FTA"]
+
+# 4. Advanced Metrics
+@PLAYER_METRICS.register("_TmMin", inputs=["GP", "MIN_CALC", "Team"])
+def _tm_min(df):
     # _TmMin should be the total team minutes across all games/periods
     # For tournament stats: GP × minutes_per_period
     # Need to infer period type from the data since we don't have explicit period info here
-    
     if "GP" in df.columns and "MIN_CALC" in df.columns:
         # Infer period type from average minutes per game
         avg_min_per_game = df["MIN_CALC"] / df["GP"]
@@ -249,61 +285,79 @@ def calculate_derived_stats(df):
             # Likely quarter stats (median player plays <4 min per quarter)
             minutes_per_period = 50   # 5 players × 10 min
         
-        df["_TmMin"] = df["GP"] * minutes_per_period
-    elif "Team" in df.columns and not df.empty:
+        return df["GP"] * minutes_per_period
+    elif "Team" in df.columns:
         # Fallback: try to infer from player minutes
         # This is less accurate but better than nothing
-        team_mins = df.groupby("Team")["MIN_CALC"].transform("sum")
-        df["_TmMin"] = team_mins
-    else:
-        # Last resort fallback
-        df["_TmMin"] = 200
-    
-    tm_min = df["_TmMin"]
+        return df.groupby("Team", observed=True)["MIN_CALC"].transform("sum")
+    # Last resort fallback
+    return pd.Series(200, index=df.index)
+
+# USG% = 100 * ((FGA + 0.44 * FTA + TOV) * (TmMin / 5)) / (Min * (TmFGA + 0.44 * TmFTA + TmTOV))
+@PLAYER_METRICS.register("USG%", inputs=["FGA", "FTA", "TOV", "MIN_CALC", "TmFGA", "TmFTA", "TmTOV"],
+                         deps=["_TmMin"], round_to=1)
+def _usg_pct(df):
     p_poss = df["FGA"] + 0.44 * df["FTA"] + df["TOV"]
-    
-    # Safe denominators
     safe_min = df["MIN_CALC"].clip(lower=0.1)
-    safe_tm_poss = df["TmPoss"].clip(lower=1.0)
-    safe_opp_poss = df["OppPoss"].clip(lower=1.0)
-    
-    # USG% calculation
     # For tournament stats, use TmFGA/TmFTA/TmTOV instead of TmPoss
     # TmPoss is a context value (possessions while player on court), not total team possessions
     tm_poss_for_usg = df["TmFGA"] + 0.44 * df["TmFTA"] + df["TmTOV"]
     safe_tm_poss_usg = tm_poss_for_usg.clip(lower=1.0)
     
-    usg_num = p_poss * (tm_min / 5)
+    usg_num = p_poss * (df["_TmMin"] / 5)
     usg_den = safe_min * safe_tm_poss_usg
-    df["USG%"] = (100 * usg_num / usg_den).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    df["USG%"] = df["USG%"].clip(0, 100.0)
-    
-    # AST% = 100 * AST / (((Min / (TmMin / 5)) * TmFGM) - FGM)
+    return (100 * usg_num / usg_den).replace([np.inf, -np.inf], 0.0).fillna(0.0).clip(0, 100.0)
+
+# AST% = 100 * AST / (((Min / (TmMin / 5)) * TmFGM) - FGM)
+@PLAYER_METRICS.register("AST%", inputs=["AST", "MIN_CALC", "TmFGM", "FGM"], deps=["_TmMin"], round_to=1)
+def _ast_pct(df):
     # Standard AST% can be noisy. We'll floor the denominator at 1.0.
     # For period stats, this can be unreliable, so we add extra safety
-    ast_den = ((safe_min / (tm_min / 5)) * df["TmFGM"]) - df["FGM"]
+    safe_min = df["MIN_CALC"].clip(lower=0.1)
+    ast_den = ((safe_min / (df["_TmMin"] / 5)) * df["TmFGM"]) - df["FGM"]
     # Only calculate AST% if denominator is reasonable (at least 2 FGM by teammates)
-    df["AST%"] = 0.0
+    ast_pct = pd.Series(0.0, index=df.index)
     valid_ast = ast_den >= 2.0
-    df.loc[valid_ast, "AST%"] = (100 * df.loc[valid_ast, "AST"] / ast_den[valid_ast]).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    df["AST%"] = df["AST%"].clip(0, 100.0)
-    
-    df["OFFRTG"] = (df["OffPTS"] / safe_tm_poss * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0).clip(upper=300.0)
-    df["DEFRTG"] = (df["DefPTS"] / safe_opp_poss * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0).clip(upper=300.0)
-    df["NETRTG"] = df["OFFRTG"] - df["DEFRTG"]
-    df["+/-"] = df["OffPTS"] - df["DefPTS"]
-    
-    # 6. Ratios
-    # Use floor of 1.0 for TOV to avoid '30.0' ratio for 3 assists (3/0.1). 
-    # This treats 0 TOV as 1 TOV for ratio purposes, which is a standard safeguard.
-    df["AST/TO"] = (df["AST"] / df["TOV"].clip(lower=1.0)).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    
-    # --- COMPLEX METRICS ---
-    # FIC (Floor Impact Counter)
-    df["FIC"] = (df["PTS"] + df["OREB"] + 0.75 * df["DREB"] + df["AST"] + df["STL"] + df["BLK"] - 
-                 0.75 * df["FGA"] - 0.375 * df["FTA"] - df["TOV"] - 0.5 * df["PF"])
+    ast_pct[valid_ast] = (100 * df.loc[valid_ast, "AST"] / ast_den[valid_ast]).replace([np.inf, -np.inf], 0.0).fillna(0.0)
+    return ast_pct.clip(0, 100.0)
+
+@PLAYER_METRICS.register("OFFRTG", inputs=["OffPTS", "TmPoss"], round_to=1)
+def _offrtg(df):
+    return pct(df["OffPTS"], df["TmPoss"].clip(lower=1.0)).clip(upper=300.0)
 
-    # PIE (Player Impact Estimate)
+@PLAYER_METRICS.register("DEFRTG", inputs=["DefPTS", "OppPoss"], round_to=1)
+def _defrtg(df):
+    return pct(df["DefPTS"], df["OppPoss"].clip(lower=1.0)).clip(upper=300.0)
+
+@PLAYER_METRICS.register("NETRTG", deps=["OFFRTG", "DEFRTG"], round_to=1)
+def _netrtg(df):
+    return df["OFFRTG"] - df["DEFRTG"]
+
+@PLAYER_METRICS.register("+/-", inputs=["OffPTS", "DefPTS"])
+def _plus_minus(df):
+    return df["OffPTS"] - df["DefPTS"]
+
+# 6. Ratios
+# Use floor of 1.0 for TOV to avoid '30.0' ratio for 3 assists (3/0.1). 
+# This treats 0 TOV as 1 TOV for ratio purposes, which is a standard safeguard.
+@PLAYER_METRICS.register("AST/TO", inputs=["AST", "TOV"], round_to=1)
+def _ast_to(df):
+    return (df["AST"] / df["TOV"].clip(lower=1.0)).replace([np.inf, -np.inf], 0.0).fillna(0.0)
+
+# --- COMPLEX METRICS ---
+# FIC (Floor Impact Counter)
+@PLAYER_METRICS.register("FIC", inputs=["PTS", "OREB", "DREB", "AST", "STL", "BLK", "FGA", "FTA", "TOV", "PF"])
+def _fic(df):
+    return (df["PTS"] + df["OREB"] + 0.75 * df["DREB"] + df["AST"] + df["STL"] + df["BLK"] - 
+            0.75 * df["FGA"] - 0.375 * df["FTA"] - df["TOV"] - 0.5 * df["PF"])
+
+# PIE (Player Impact Estimate)
+PIE_GAME_COLS = ["OffPTS", "DefPTS"] + [f"{side}{c}" for side in ("Tm", "Opp") for c in
+                                        ["FGM", "FTM", "FGA", "FTA", "DREB", "OREB", "AST", "STL", "BLK", "PF", "TOV"]]
+
+@PLAYER_METRICS.register("PIE", inputs=["PTS", "FGM", "FTM", "FGA", "FTA", "DREB", "OREB", "AST", "STL", "BLK",
+                                        "PF", "TOV"] + PIE_GAME_COLS, round_to=1)
+def _pie(df):
     pie_num = df["PTS"] + df["FGM"] + df["FTM"] - df["FGA"] - df["FTA"] + df["DREB"] + (0.5 * df["OREB"]) + \
               df["AST"] + df["STL"] + (0.5 * df["BLK"]) - df["PF"] - df["TOV"]
               
@@ -324,19 +378,22 @@ def calculate_derived_stats(df):
               gm_ast + gm_stl + (0.5 * gm_blk) - gm_pf - gm_tov
               
     # PIE Denominator protection: Floor at 20.0 to prevent division by near-zero in bad aggregates
-    df["PIE"] = (pie_num / pie_den.clip(lower=20.0) * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
-    df["PIE"] = df["PIE"].clip(-100, 100.0)
-    
-    # Game Score (GmScr)
-    df["GmScr"] = df["PTS"] + 0.4 * df["FGM"] - 0.7 * df["FGA"] - 0.4 * (df["FTA"] - df["FTM"]) + \
-                  0.7 * df["OREB"] + 0.3 * df["DREB"] + df["STL"] + 0.7 * df["AST"] + 0.7 * df["BLK"] - \
-                  0.4 * df["PF"] - df["TOV"]
-    
-    # Rounding
-    pct_cols = ["FG%", "2P%", "3P%", "FT%", "eFG%", "TS%", "USG%", "AST%", "OFFRTG", "DEFRTG", "NETRTG", "PIE", "GmScr", "AST/TO"]
-    df[pct_cols] = round_half_up(df[pct_cols], 1)
-    
-    return df
+    return (pie_num / pie_den.clip(lower=20.0) * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0).clip(-100, 100.0)
+
+# Game Score (GmScr)
+@PLAYER_METRICS.register("GmScr", inputs=["PTS", "FGM", "FGA", "FTA", "FTM", "OREB", "DREB", "STL", "AST",
+                                          "BLK", "PF", "TOV"], round_to=1)
+def _gmscr(df):
+    return df["PTS"] + 0.4 * df["FGM"] - 0.7 * df["FGA"] - 0.4 * (df["FTA"] - df["FTM"]) + \
+           0.7 * df["OREB"] + 0.3 * df["DREB"] + df["STL"] + 0.7 * df["AST"] + 0.7 * df["BLK"] - \
+           0.4 * df["PF"] - df["TOV"]
+
+# Metrics each hub view reads, for calculate_derived_stats(df, metrics=...)
+LEADERBOARD_METRICS = ["FG%", "3P%", "FT%", "eFG%", "PIE", "USG%", "GmScr", "FIC"]
+PROFILE_METRICS = ["FG%", "3P%", "FT%", "eFG%", "TS%", "PIE", "USG%", "AST%", "OFFRTG", "DEFRTG", "NETRTG",
+                   "AST/TO", "FIC"]
+COMPARISON_METRICS = ["FG%", "2P%", "3P%", "FT%", "eFG%", "TS%", "AST%", "AST/TO", "DEFRTG", "FIC", "GmScr",
+                      "PIE", "USG%", "Eff", "OFFRTG", "NETRTG", "+/-"]
 
 def calculate_derived_team_stats(df):
     """Vectorized calculation of advanced stats for TEAMS."""
@@ -595,9 +652,23 @@ def generate_match_narrative(match_data):
     except Exception as e:
         return ""
 
-def get_daily_stats(match_list, period="Full Game"):
-    """Flat-map all player performances from a list of matches with date context."""
+def get_daily_stats(match_list, period="Full Game", cube=None, compact=True):
+    """Flat-map all player performances from a list of matches with date context.
+
+    If a PeriodCube (src.core.period_cube) covering match_list is given, period
+    subsets are summed from it instead of merging PeriodStats dicts per call.
+    compact: categorical dimensions and downcast stats (see src.core.schema);
+    groupbys on the dimension columns need observed=True.
+    """
     if not match_list: return pd.DataFrame()
+
+    if cube is not None and period != "Full Game":
+        df = cube.daily_frame(period, match_list)
+        if df is not None:
+            if df.empty: return pd.DataFrame()
+            df = normalize_stats(df)
+            df = calculate_derived_stats(df)
+            return compact_frame(df) if compact else df
     
     records = []
     for m in match_list:
@@ -661,7 +732,25 @@ def get_daily_stats(match_list, period="Full Game"):
     df = pd.DataFrame(records)
     df = normalize_stats(df)
     df = calculate_derived_stats(df)
-    return df
+    return compact_frame(df) if compact else df
+
+def get_daily_stats_from_tables(tables, period="Full Game", compact=True, categories=None):
+    """Player performances from the columnar store (see src.core.columnar_store).
+
+    categories: {MatchID: Category} overriding the store's (e.g. the
+    categorized match list, so game_categorization.json changes apply
+    without rebuilding the store).
+    """
+    from src.core.columnar_store import player_game_frame
+
+    df = player_game_frame(tables, period=period)
+    if df.empty: return pd.DataFrame()
+    if categories:
+        df["Category"] = df["MatchID"].astype(str).map(categories).fillna(df["Category"])
+
+    df = normalize_stats(df)
+    df = calculate_derived_stats(df)
+    return compact_frame(df) if compact else df
 
 def combine_period_stats(period_list):
     """Combine stats from multiple periods (e.g., Q1+Q2 for 1st Half)."""
@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from src import analytics as ant
+from src.core.player_identity import get_identity_table
 
 
 @st.cache_data
@@ -20,6 +21,7 @@ def get_tournament_aggregates_v12(match_list):
             r = s.copy()
             r['Player'] = p
             r['MatchID'] = mid
+            r['Category'] = m.get('Category')
             p_recs.append(r)
             
         # Team Stats (Enriched with Tm/Opp context for Advanced Stats)
@@ -75,19 +77,26 @@ def get_tournament_aggregates_v12(match_list):
             
         df_p = ant.normalize_stats(df_p)
         
-        # Meta: Team, No (Take First)
-        meta = df_p.groupby('Player')[['Team', 'No']].first()
+        # Stable int player ID (name variants + team) instead of grouping on the name string
+        numeric_cols = df_p.select_dtypes(include=np.number).columns.drop('No', errors='ignore')
+        df_p["P_KEY"] = get_identity_table().assign(df_p)
+        
+        # Meta: Player, Team (first seen), No (most worn)
+        meta = df_p.groupby('P_KEY')[['Player', 'Team', 'No']].first()
+        no_counts = df_p.groupby(['P_KEY', 'No']).size().reset_index(name='n')
+        no_mode = no_counts.sort_values(['P_KEY', 'n'], ascending=[True, False], kind='stable')\
+                           .drop_duplicates('P_KEY').set_index('P_KEY')['No']
+        meta['No'] = no_mode.reindex(meta.index).fillna(meta['No'])
         
         # GP (Games Played)
-        gp = df_p.groupby('Player')['MatchID'].nunique()
+        gp = df_p.groupby('P_KEY')['MatchID'].nunique()
         gp.name = "GP"
         
         # Sum Numerics
-        numeric_cols = df_p.select_dtypes(include=np.number).columns
-        df_p_agg = df_p.groupby('Player')[numeric_cols].sum()
+        df_p_agg = df_p.groupby('P_KEY')[numeric_cols].sum()
         
         # Merge
-        df_final_p = pd.concat([df_p_agg, meta, gp], axis=1).reset_index()
+        df_final_p = pd.concat([meta, df_p_agg, gp], axis=1).reset_index()
     else:
         df_final_p = pd.DataFrame()
         
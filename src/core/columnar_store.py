@@ -0,0 +1,312 @@
+"""Columnar (Parquet/Arrow) storage for tournament match data.
+
+The build step streams data.json (one match at a time, see src.core.json_stream)
+into three typed tables:
+    matches       one row per match (MatchID, Category, Date, Team1, Team2, PTS1, PTS2)
+    player_stats  one row per player per match (full-game PlayerStats)
+    period_stats  one row per player per match per period (PeriodStats)
+
+Usage:
+    python -m src.core.columnar_store [data.json] [output_dir]
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+DEFAULT_STORE_DIR = os.path.join("data", "processed", "columnar")
+STORE_TABLES = ("matches", "player_stats", "period_stats")
+STREAM_BATCH = 500   # matches flattened per Parquet part when streaming
+
+# Columns that identify a row and must stay text
+ID_COLS = ["MatchID", "Player", "Team", "No", "Jersey", "Period"]
+
+# Rate stats are recalculated downstream, so they are not summed across periods
+# (nor is any other "%" column: FG%, 2P%, 3P%, FT%, ...)
+RATE_STATS = ["OFFRTG", "DEFRTG", "NETRTG", "USG%", "AST%", "OREB%", "DREB%", "REB%",
+              "TS%", "eFG%", "Eff", "GmScr", "PIE", "AST/TO"]
+
+HALF_PERIODS = {
+    "1st Half": ["Q1", "Q2"],
+    "2nd Half": ["Q3", "Q4"],
+}
+
+
+def unwrap_matches(data):
+    """Return the list of match dicts from any supported data.json layout."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        # Check for wrapped structure first
+        if "Matches" in data:
+            return data["Matches"]
+        if "matches" in data:
+            return data["matches"]
+        # Production structure: dict with match IDs as keys
+        return list(data.values())
+    return []
+
+
+def _match_row(m, category_map=None):
+    """Build the match-level record for one match."""
+    mid = str(m.get("MatchID", "Unknown"))
+    teams = m.get("Teams", {})
+    ts = m.get("TeamStats", {})
+    cat = m.get("Category", "Unknown")
+    # Same rule as the hub: only trust Men/Women overrides from the category map
+    if category_map and category_map.get(mid) in ["Men", "Women"]:
+        cat = category_map[mid]
+    return {
+        "MatchID": mid,
+        "Category": cat,
+        "Date": m.get("Metadata", {}).get("MatchDate", "Unknown"),
+        "Team1": teams.get("t1"),
+        "Team2": teams.get("t2"),
+        "PTS1": ts.get("t1", {}).get("PTS"),
+        "PTS2": ts.get("t2", {}).get("PTS"),
+    }
+
+
+def _player_rows(mid, stats_dict, period=None):
+    """Flatten a {player: stats} dict into records tagged with MatchID (and Period)."""
+    rows = []
+    for p_name, s in stats_dict.items():
+        row = s.copy()
+        row.setdefault("Player", p_name)
+        row["MatchID"] = mid
+        if period is not None:
+            row["Period"] = period
+        rows.append(row)
+    return rows
+
+
+def match_records(m, category_map=None):
+    """Flatten one match into (match_row, player_rows, period_rows)."""
+    match_row = _match_row(m, category_map)
+    mid = match_row["MatchID"]
+    player_rows = _player_rows(mid, m.get("PlayerStats", {}))
+    period_rows = []
+    for q, q_stats in m.get("PeriodStats", {}).items():
+        period_rows.extend(_player_rows(mid, q_stats, period=q))
+    return match_row, player_rows, period_rows
+
+
+def coerce_types(df):
+    """Make object columns Arrow-friendly: numeric where possible, text otherwise."""
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        if col in ID_COLS:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+            continue
+        converted = pd.to_numeric(df[col], errors="coerce")
+        if converted.notna().sum() == df[col].notna().sum():
+            df[col] = converted
+        else:
+            # Mixed content (e.g. "MM:SS" minutes) stays as text
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def flatten_matches(match_list, category_map=None):
+    """Flatten a list of match dicts into the three columnar tables."""
+    m_recs, p_recs, q_recs = [], [], []
+    for m in match_list:
+        match_row, player_rows, period_rows = match_records(m, category_map)
+        m_recs.append(match_row)
+        p_recs.extend(player_rows)
+        q_recs.extend(period_rows)
+
+    return {
+        "matches": coerce_types(pd.DataFrame(m_recs)),
+        "player_stats": coerce_types(pd.DataFrame(p_recs)),
+        "period_stats": coerce_types(pd.DataFrame(q_recs)),
+    }
+
+
+def write_tables(tables, out_dir=DEFAULT_STORE_DIR):
+    """Write tables to Parquet files, returning {table: path}."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for name in STORE_TABLES:
+        path = os.path.join(out_dir, f"{name}.parquet")
+        tables.get(name, pd.DataFrame()).to_parquet(path, index=False)
+        paths[name] = path
+    return paths
+
+
+def _unify_type(types):
+    """Arrow type a column takes across part files (text wins over numbers)."""
+    types = [t for t in types if not pa.types.is_null(t)]
+    if not types:
+        return pa.null()
+    if any(pa.types.is_string(t) or pa.types.is_large_string(t) for t in types):
+        return pa.string()
+    if all(t == types[0] for t in types):
+        return types[0]
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def _merge_parts(part_paths, out_path):
+    """Concatenate Parquet part files into out_path one part at a time, under a unified schema."""
+    if not part_paths:
+        pd.DataFrame().to_parquet(out_path, index=False)
+        return out_path
+    columns = {}
+    for path in part_paths:
+        for field in pq.read_schema(path):
+            columns.setdefault(field.name, []).append(field.type)
+    schema = pa.schema([(name, _unify_type(types)) for name, types in columns.items()])
+
+    tmp_path = f"{out_path}.tmp"
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for path in part_paths:
+            part = pq.read_table(path)
+            arrays = [part.column(f.name).cast(f.type) if f.name in part.column_names
+                      else pa.nulls(part.num_rows, f.type) for f in schema]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def stream_columnar_store(json_path, out_dir=DEFAULT_STORE_DIR, category_map=None, batch_size=STREAM_BATCH):
+    """
+    Build the Parquet tables without loading data.json whole: matches are decoded
+    one at a time (src.core.json_stream), flattened in batches and spilled to part
+    files, which are then merged per table. Peak memory is about one batch of
+    matches plus one part file, whatever the size of the archive.
+    """
+    from src.core.json_stream import iter_matches
+
+    os.makedirs(out_dir, exist_ok=True)
+    part_dir = tempfile.mkdtemp(prefix=".parts-", dir=out_dir)
+    parts = {name: [] for name in STORE_TABLES}
+
+    def spill(batch):
+        for name, df in flatten_matches(batch, category_map).items():
+            if df.empty:
+                continue
+            path = os.path.join(part_dir, f"{name}-{len(parts[name]):05d}.parquet")
+            df.to_parquet(path, index=False)
+            parts[name].append(path)
+
+    try:
+        batch = []
+        for m in iter_matches(json_path):
+            batch.append(m)
+            if len(batch) >= batch_size:
+                spill(batch)
+                batch = []
+        if batch:
+            spill(batch)
+        return {name: _merge_parts(parts[name], os.path.join(out_dir, f"{name}.parquet"))
+                for name in STORE_TABLES}
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+
+def build_columnar_store(json_path, out_dir=DEFAULT_STORE_DIR, category_map=None):
+    """Convert data.json into Parquet tables under out_dir (streamed, see stream_columnar_store)."""
+    return stream_columnar_store(json_path, out_dir, category_map)
+
+
+def store_is_fresh(json_path, store_dir=DEFAULT_STORE_DIR):
+    """True if every table exists and is newer than the source JSON."""
+    paths = [os.path.join(store_dir, f"{name}.parquet") for name in STORE_TABLES]
+    if not all(os.path.exists(p) for p in paths):
+        return False
+    if json_path and os.path.exists(json_path):
+        src_mtime = os.path.getmtime(json_path)
+        return all(os.path.getmtime(p) >= src_mtime for p in paths)
+    return True
+
+
+def is_rate_stat(col):
+    """True for stats that are recalculated rather than summed across periods."""
+    return col in RATE_STATS or col.endswith("%")
+
+
+@st.cache_data(show_spinner=False)
+def load_columnar_store(store_dir=DEFAULT_STORE_DIR):
+    """
+    Load the Parquet tables as typed DataFrames. Cached until cleared:
+    dm.load_match_tables() clears it whenever it rebuilds the store.
+    """
+    tables = {}
+    for name in STORE_TABLES:
+        path = os.path.join(store_dir, f"{name}.parquet")
+        tables[name] = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+    return tables
+
+
+def select_matches(tables, match_ids):
+    """The tables restricted to the given MatchIDs (all tables share the MatchID column)."""
+    ids = pd.Index([str(m) for m in match_ids])
+    return {name: df[df["MatchID"].astype(str).isin(ids)] if "MatchID" in df.columns else df
+            for name, df in tables.items()}
+
+
+def _sum_periods(df_q, periods):
+    """Sum counting stats over the given periods per (MatchID, Player)."""
+    df_q = df_q[df_q["Period"].isin(periods)]
+    if df_q.empty:
+        return df_q.drop(columns=["Period"])
+
+    keys = ["MatchID", "Player"]
+    num_cols = [c for c in df_q.select_dtypes(include=np.number).columns
+                if not is_rate_stat(c)]
+    first_cols = [c for c in df_q.columns if c not in num_cols and c not in keys and c != "Period"]
+
+    # Period order matters for "first" (Team/No come from the earliest period)
+    df_q = df_q.sort_values("Period", kind="stable")
+    grouped = df_q.groupby(keys, sort=False, observed=True)
+    out = grouped[num_cols].sum()
+    if first_cols:
+        out = out.join(grouped[first_cols].first())
+    return out.reset_index()
+
+
+def player_game_frame(tables, period="Full Game"):
+    """Player-game rows with match context, the columnar equivalent of get_daily_stats' flattening."""
+    if period == "Full Game":
+        df = tables.get("player_stats", pd.DataFrame())
+    else:
+        df_q = tables.get("period_stats", pd.DataFrame())
+        if df_q.empty or "Period" not in df_q.columns:
+            return pd.DataFrame()
+        if period in HALF_PERIODS:
+            df = _sum_periods(df_q, HALF_PERIODS[period])
+        else:
+            df = df_q[df_q["Period"] == period].drop(columns=["Period"])
+
+    if df.empty:
+        return pd.DataFrame()
+
+    matches = tables.get("matches", pd.DataFrame())
+    meta = matches[["MatchID", "Category", "Date", "Team1", "Team2"]]
+    df = df.drop(columns=[c for c in ["Category", "Date"] if c in df.columns])
+    df = df.merge(meta, on="MatchID", how="left")
+
+    df["Match"] = df["Team1"].astype(str) + " vs " + df["Team2"].astype(str)
+    df["Opponent"] = np.where(df["Team"] == df["Team1"], df["Team2"], df["Team1"])
+    df["Category"] = df["Category"].fillna("Unknown")
+    df["Date"] = df["Date"].fillna("Unknown")
+    return df.drop(columns=["Team1", "Team2"]).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    src_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "processed", "data.json")
+    out_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_STORE_DIR
+
+    print(f"Building columnar store from {src_path}...")
+    written = build_columnar_store(src_path, out_path)
+    for table, path in written.items():
+        print(f"  {table}: {path}")
@@ -0,0 +1,125 @@
+"""Registry of derived stats with dependency-ordered, memoized computation.
+
+Each metric declares the columns it reads (`inputs`), the metrics it builds on
+(`deps`) and a formula taking the frame and returning a Series. compute()
+resolves only the requested metrics plus their dependencies, in order, and
+records what it computed in df.attrs together with a fingerprint of the inputs,
+so calling it again on an already-derived frame is a no-op.
+
+    PLAYER_METRICS = Registry("players", round_func=round_half_up)
+
+    @PLAYER_METRICS.register("FG%", inputs=["FGM", "FGA"], round_to=1)
+    def _fg_pct(df):
+        return pct(df["FGM"], df["FGA"])
+"""
+import numpy as np
+import pandas as pd
+
+ATTRS_KEY = "derived_metrics"
+
+
+class Registry:
+    """A named set of metrics (players and teams keep separate registries)."""
+
+    def __init__(self, name, round_func=None):
+        self.name = name
+        self.round_func = round_func or (lambda s, places: s.round(places))
+        self.metrics = {}   # name -> {"inputs", "deps", "func", "round_to"}
+
+    def register(self, name, inputs=(), deps=(), round_to=None):
+        """Decorator registering `func(df) -> Series` as metric `name`."""
+        def wrap(func):
+            self.metrics[name] = {
+                "inputs": list(inputs),
+                "deps": list(deps),
+                "func": func,
+                "round_to": round_to,
+            }
+            return func
+        return wrap
+
+    def resolve(self, names=None):
+        """Requested metrics plus their dependencies, dependencies first."""
+        names = list(self.metrics) if names is None else [n for n in names if n in self.metrics]
+        order, visiting, done = [], set(), set()
+
+        def visit(n):
+            if n in done:
+                return
+            if n in visiting:
+                raise ValueError(f"Circular metric dependency at '{n}'")
+            visiting.add(n)
+            for d in self.metrics[n]["deps"]:
+                visit(d)
+            visiting.discard(n)
+            done.add(n)
+            order.append(n)
+
+        for n in names:
+            visit(n)
+        return order
+
+    def input_columns(self, order):
+        """Raw (non-metric) columns read by the given metrics."""
+        cols = []
+        for n in order:
+            for c in self.metrics[n]["inputs"]:
+                if c not in self.metrics and c not in cols:
+                    cols.append(c)
+        return cols
+
+    def compute(self, df, metrics=None, force=False):
+        """
+        Add the requested metrics (default: all) to df, skipping any that were
+        already computed on identical inputs. Returns df.
+        """
+        if df.empty:
+            return df
+        order = self.resolve(metrics)
+        # One token over every registered input, so partial and full requests share memo
+        token = fingerprint(df, self.input_columns(list(self.metrics)))
+
+        memo = df.attrs.get(ATTRS_KEY, {})
+        done = set(memo.get("metrics", ())) if not force and memo.get(self.name) == token else set()
+        todo = [n for n in order if n not in done or n not in df.columns]
+        if not todo:
+            return df
+
+        for n in todo:
+            df[n] = self.metrics[n]["func"](df)
+        # Rounding happens last so dependants see full precision within one pass
+        for n in todo:
+            places = self.metrics[n]["round_to"]
+            if places is not None:
+                df[n] = self.round_func(df[n], places)
+
+        df.attrs[ATTRS_KEY] = _Memo({self.name: token, "metrics": tuple(sorted(done | set(todo)))})
+        return df
+
+
+class _Memo(dict):
+    """
+    What compute() derived: {registry name: token, "metrics": sorted names}.
+    pandas deep-copies df.attrs on nearly every operation, so this (never
+    mutated) dict is shared by copies instead of being copied element-wise.
+    """
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __copy__(self):
+        return self
+
+
+def fingerprint(df, cols):
+    """Cheap content token for the given columns (row-order independent)."""
+    cols = [c for c in cols if c in df.columns]
+    if not cols:
+        return (len(df),)
+    hashed = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    return (len(df), tuple(cols), int(hashed.sum(dtype=np.uint64)))
+
+
+def pct(num, den):
+    """100 * num / den with inf/NaN mapped to 0."""
+    return (num / den * 100).replace([np.inf, -np.inf], 0.0).fillna(0.0)
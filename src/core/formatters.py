@@ -1,77 +1,68 @@
-"""Data formatting and styling utilities for display."""
+"""Data formatting and styling utilities for display.
+
+Highlighting is computed as whole-table boolean masks (one comparison per
+column) instead of per-cell Styler callbacks:
+
+- format_df() returns a Styler that tags exceptional cells with a CSS class,
+  for HTML output (Styler.to_html / st.markdown).
+- dataframe_config() returns a rounded frame plus st.dataframe column_config,
+  so interactive tables are formatted client-side without a Styler at all.
+- style_max() highlights column maxima for Styler tables fed to st.dataframe.
+"""
+import numpy as np
 import pandas as pd
+import streamlit as st
 
+# Cell at or above the threshold is "exceptional"
+EXCEPTIONAL_THRESHOLDS = {
+    # Count Stats
+    "Pts": 20, "PTS": 20, "REB": 10, "AST": 6, "STL": 4, "BLK": 3,
+    # Advanced / Composite
+    "PIE": 15, "GmScr": 15, "FIC": 15, "Eff": 20,
+    # Percentages
+    "FG%": 50.0, "2P%": 50.0, "3P%": 40.0, "FT%": 80.0,
+}
 
-def format_df(df, precision=0):
-    """Format dataframe values based on column types and apply styling.
-    
-    Args:
-        df: Pandas DataFrame to format
-        precision: Decimal places for count stats (0 for totals, 1 for averages)
-    
-    Returns:
-        Styled DataFrame with conditional formatting
-    """
+EXCEPTIONAL_CLASS = "exceptional"
+EXCEPTIONAL_CSS = "background-color: #1a472a; color: white; font-weight: bold"
+MAX_CSS = "background-color: rgba(255, 133, 51, 0.3); font-weight: bold"
+
+COUNT_COLS = ['Pts', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'OFF', 'DEF', 'PTS', 'TOV', 'PF', 'FD', '2CP', 'BLKR', '+/-', 'Eff', 'EFF', 'FIC', 'GmScr']
+
+
+def _column_groups(df):
+    """(percentage, ratio, count) column lists for a frame."""
+    pct_cols = [c for c in df.columns if '%' in c or c in ['TS%', 'eFG%', 'FG%', '2P%', '3P%', 'FT%', 'USG%', 'AST%', 'REB%', 'OREB%', 'DREB%', 'PIE']]
+    ratio_cols = [c for c in df.columns if 'Ratio' in c or 'RATIO' in c or c == 'AST/TO']
+    # Add Opponent cols
+    opp_cols = [c for c in df.columns if c.startswith('Opp') or c.startswith('Tm')]
+    return pct_cols, ratio_cols, COUNT_COLS + opp_cols
+
+
+def prepare_df(df, precision=0):
+    """Round / cast display columns; returns (df copy, {col: python format string})."""
     df = df.copy()
-    
+    pct_cols, ratio_cols, all_count = _column_groups(df)
+
     # Percentage columns
-    pct_cols = [c for c in df.columns if '%' in c or c in ['TS%', 'eFG%', 'FG%', '2P%', '3P%', 'FT%', 'USG%', 'AST%', 'REB%', 'OREB%', 'DREB%', 'PIE']]
     for c in pct_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors='coerce').round(1)
-    
+        df[c] = pd.to_numeric(df[c], errors='coerce').round(1)
+
     # Ratio columns
-    ratio_cols = [c for c in df.columns if 'Ratio' in c or 'RATIO' in c or c == 'AST/TO']
     for c in ratio_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors='coerce').round(2)
-    
+        df[c] = pd.to_numeric(df[c], errors='coerce').round(2)
+
     # Count stats
-    count_cols = ['Pts', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'OFF', 'DEF', 'PTS', 'TOV', 'PF', 'FD', '2CP', 'BLKR', '+/-', 'Eff', 'EFF', 'FIC', 'GmScr']
-    # Add Opponent cols
-    opp_cols = [c for c in df.columns if c.startswith('Opp') or c.startswith('Tm')]
-    all_count = count_cols + opp_cols
-    
     for c in all_count:
         if c in df.columns:
             if precision == 0:
                 df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0).astype(int)
             else:
                 df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0).round(precision)
-                
+
     if 'GP' in df.columns:
         df['GP'] = pd.to_numeric(df['GP'], errors='coerce').fillna(0).astype(int)
-            
-    # Conditional Formatting Logic
-    def highlight_exceptional(s):
-        is_high = pd.Series(data=False, index=s.index)
-        col = s.name
-        
-        # Thresholds
-        try:
-            # Count Stats
-            if col in ["Pts", "PTS"]: is_high = s >= 20
-            elif col in ["REB", "Reb", "REB%"]: is_high = s >= 10
-            elif col in ["AST"]: is_high = s >= 6
-            elif col in ["STL"]: is_high = s >= 4
-            elif col in ["BLK"]: is_high = s >= 3
-            
-            # Advanced / Composite
-            elif col in ["PIE"]: is_high = s >= 15
-            elif col in ["GmScr"]: is_high = s >= 15
-            elif col in ["FIC"]: is_high = s >= 15
-            elif col in ["Eff", "EFF"]: is_high = s >= 20
-            
-            # Percentages
-            elif col in ["FG%", "2P%"]: is_high = s >= 50.0
-            elif col in ["3P%"]: is_high = s >= 40.0
-            elif col in ["FT%"]: is_high = s >= 80.0
-            
-        except:
-            pass # Handle comparison errors
-        
-        return ['background-color: #1a472a; color: white; font-weight: bold' if v else '' for v in is_high]
-    
+
     # Create a format dictionary to avoid .0 on integers
     format_dict = {}
     for col in df.columns:
@@ -86,20 +77,92 @@ def format_df(df, precision=0):
                 format_dict[col] = f"{{:.{precision}f}}"
         elif pd.api.types.is_numeric_dtype(df[col]):
             format_dict[col] = f"{{:.{precision}f}}"
+    return df, format_dict
+
+
+def exceptional_mask(df, thresholds=None):
+    """Boolean frame (thresholded columns only) marking cells at or above their threshold."""
+    thresholds = EXCEPTIONAL_THRESHOLDS if thresholds is None else thresholds
+    cols = [c for c in thresholds if c in df.columns]
+    if not cols:
+        return pd.DataFrame(index=df.index)
+    values = df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    limits = np.array([thresholds[c] for c in cols], dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        return pd.DataFrame(values >= limits, index=df.index, columns=cols)
+
+
+def max_mask(df, cols):
+    """Boolean frame marking each column's maximum (ties included)."""
+    cols = [c for c in cols if c in df.columns]
+    if not cols:
+        return pd.DataFrame(index=df.index)
+    sub = df[cols]
+    return sub.eq(sub.max())
+
+
+def _css_frame(mask, css, value_df):
+    """Full-size CSS frame for Styler.apply(axis=None) from a (column subset) mask."""
+    styles = pd.DataFrame("", index=value_df.index, columns=value_df.columns)
+    if mask.shape[1]:
+        styles[mask.columns] = np.where(mask.to_numpy(), css, "")
+    return styles
+
+
+def format_df(df, precision=0):
+    """Format dataframe values based on column types and apply styling.
+
+    Args:
+        df: Pandas DataFrame to format
+        precision: Decimal places for count stats (0 for totals, 1 for averages)
+
+    Returns:
+        Styled DataFrame; exceptional cells carry the EXCEPTIONAL_CLASS CSS class
+    """
+    df, format_dict = prepare_df(df, precision)
 
-    # Styler Definition
+    # Styler Definition (alignment lives in the table styles, not in per-cell properties)
     styler = df.style.format(format_dict, na_rep="-")\
-                     .set_properties(**{'text-align': 'center', 'vertical-align': 'middle'})\
                      .set_table_styles([
                          {'selector': 'th', 'props': [('text-align', 'center'), ('vertical-align', 'middle'), ('font-weight', 'bold')]},
-                         {'selector': 'td', 'props': [('text-align', 'center'), ('vertical-align', 'middle')]}
+                         {'selector': 'td', 'props': [('text-align', 'center'), ('vertical-align', 'middle')]},
+                         {'selector': f'td.{EXCEPTIONAL_CLASS}', 'props': EXCEPTIONAL_CSS},
                      ])
 
-    # Apply Highlight
-    target_cols = ["Pts", "PTS", "REB", "AST", "STL", "BLK", "PIE", "GmScr", "FIC", "Eff", "FG%", "2P%", "3P%", "FT%"]
-    existing_cols = [c for c in target_cols if c in df.columns]
-    
-    if existing_cols:
-        styler.apply(highlight_exceptional, subset=existing_cols)
-        
+    # Apply Highlight (one class table instead of a per-column callback)
+    mask = exceptional_mask(df)
+    if mask.shape[1] and mask.to_numpy().any():
+        styler.set_td_classes(pd.DataFrame(np.where(mask.to_numpy(), EXCEPTIONAL_CLASS, ""),
+                                           index=mask.index, columns=mask.columns))
+
     return styler
+
+
+def style_max(df, cols, format_dict=None, css=MAX_CSS):
+    """Styler highlighting the maximum of each of `cols`, for st.dataframe tables."""
+    mask = max_mask(df, cols)
+    styler = df.style
+    if mask.shape[1]:
+        styler = styler.apply(lambda d: _css_frame(mask, css, d), axis=None)
+    return styler.format(format_dict or {}, na_rep="-")
+
+
+def _printf(fmt):
+    """'{:.1f}' -> '%.1f' (st.column_config number format)."""
+    return fmt.replace("{:", "%").replace("}", "")
+
+
+def dataframe_config(df, precision=0):
+    """
+    Lightweight path for st.dataframe: (rounded df, column_config).
+    Formatting happens client-side, so cost does not grow with the cell count.
+
+        view, config = dataframe_config(df_players, precision=1)
+        st.dataframe(view, column_config=config, hide_index=True)
+    """
+    df, format_dict = prepare_df(df, precision)
+    # Integer columns (Rank, GP, ...) never need decimals
+    config = {col: st.column_config.NumberColumn(
+                  col, format="%d" if pd.api.types.is_integer_dtype(df[col]) else _printf(fmt))
+              for col, fmt in format_dict.items()}
+    return df, config
@@ -0,0 +1,63 @@
+"""Finished-HTML fragment cache for the hub's table and leaderboard renderers.
+
+Keys are plain tuples of (fragment kind, data version, table spec, filters...),
+so switching tabs or re-running with the same selections returns the stored
+HTML instead of rebuilding it. Entries are evicted least-recently-used, and a
+new data version naturally stops old keys from being hit.
+"""
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered HTML strings (or small tuples/dicts of them)."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
+
+    def get_or_render(self, key, render):
+        """Cached fragment for key, calling render() to build it on a miss."""
+        if key is None:
+            return render()
+        value = self.get(key)
+        if value is None:
+            value = self.set(key, render())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def get_fragment_cache():
+    """Process-wide FragmentCache shared by all sessions."""
+    return FragmentCache()
@@ -0,0 +1,173 @@
+"""Incremental reloading of data.json keyed by file mtime and per-match content hash."""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from src.core import columnar_store as cs
+from src.core.player_identity import get_identity_table
+
+CATEGORIES = ("Men", "Women")
+
+
+def match_key(m, pos):
+    """Stable key for a match: its MatchID, or its position if the ID is missing."""
+    mid = m.get("MatchID")
+    return str(mid) if mid is not None else f"idx_{pos}"
+
+
+def category_overrides(category_map):
+    """{MatchID: "Men"/"Women"} from game_categorization.json (other values, e.g. stage lists, ignored)."""
+    return {str(k): v for k, v in (category_map or {}).items() if v in CATEGORIES}
+
+
+def apply_categories(matches, overrides):
+    """Matches with the overridden Category; changed matches are copies, the parsed dicts stay untouched."""
+    out = []
+    for m in matches:
+        cat = overrides.get(str(m.get("MatchID")))
+        if cat is not None and m.get("Category") != cat:
+            m = dict(m)
+            m["Category"] = cat
+        out.append(m)
+    return out
+
+
+class CategorizedMatches:
+    """
+    Loader mixin: the match list with the category map applied, rebuilt only
+    when the data or the map changes. The loader's matches are shared by every
+    session, so the map is applied to copies; removing an entry from the map
+    restores the category in data.json. data_version includes the map version.
+
+    Players are registered in the identity table from the categorized matches
+    (the division is part of the player key, and aggregation frames carry the
+    overridden Category): new / changed matches queued by refresh(), plus the
+    matches whose override changed.
+    """
+
+    def categorized(self, category_map):
+        overrides = category_overrides(category_map)
+        with self._lock:
+            moved = set()
+            old = getattr(self, "_cat_overrides", None)
+            if overrides != old:
+                old = old or {}
+                moved = {k for k in set(old) | set(overrides) if old.get(k) != overrides.get(k)}
+                self._cat_overrides = overrides
+                self._cat_version = getattr(self, "_cat_version", -1) + 1
+                self._categorized = None
+            if self._categorized is None or self._categorized[0] != self.version:
+                raw = self.matches
+                matches = apply_categories(raw, overrides)
+                pending = {id(m) for m in getattr(self, "_unregistered", [])}
+                self._register_players([c for m, c in zip(raw, matches)
+                                        if id(m) in pending or str(m.get("MatchID")) in moved])
+                self._unregistered = []
+                self._categorized = (self.version, matches)
+            return list(self._categorized[1])
+
+    def _queue_registration(self, matches):
+        """New / changed raw matches whose players are registered on the next categorized()."""
+        self._unregistered = getattr(self, "_unregistered", []) + list(matches)
+
+    def _register_players(self, matches):
+        """Give new players / name variants their stable IDs and persist the identity table."""
+        if not matches:
+            return
+        table = get_identity_table()
+        table.register_matches(matches)
+        try:
+            table.save()
+        except OSError:
+            pass  # Read-only deploys keep the IDs in memory
+
+    def _version_token(self):
+        """Content version plus category-map version."""
+        cat_version = getattr(self, "_cat_version", 0)
+        return f"{self.version}.{cat_version}" if cat_version else str(self.version)
+
+
+def match_hash(m):
+    """Content hash of one match dict (key order independent)."""
+    payload = json.dumps(m, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+
+class IncrementalMatchLoader(CategorizedMatches):
+    """
+    Keeps the parsed matches of one data.json in memory.
+
+    refresh() is cheap when the file is untouched (a single os.stat). When the
+    mtime/size changes, the file is re-parsed and every match is hashed; only
+    matches whose hash changed are swapped in (unchanged match dicts keep their
+    identity) and only those go through player registration. Downstream caches
+    are keyed on data_version, so they rebuild in full after a change.
+    """
+
+    def __init__(self, json_path, category_map=None):
+        self.json_path = json_path
+        self.category_map = category_map or {}
+        self.version = 0
+        self.last_updated = "N/A"
+        self._stat = None
+        self._matches = {}   # key -> match dict (file order)
+        self._hashes = {}    # key -> content hash
+        self._tables = None
+        self._lock = threading.Lock()
+
+    @property
+    def matches(self):
+        return list(self._matches.values())
+
+    @property
+    def data_version(self):
+        """Opaque token that changes whenever match content changes."""
+        return f"{os.path.basename(self.json_path or '')}:{self._version_token()}"
+
+    @property
+    def tables(self):
+        """Columnar tables (see src.core.columnar_store), flattened on first access per version."""
+        if self._tables is None:
+            self._tables = cs.flatten_matches(self.matches, self.category_map)
+        return self._tables
+
+    def _file_stat(self):
+        st_res = os.stat(self.json_path)
+        return (st_res.st_mtime_ns, st_res.st_size)
+
+    def refresh(self):
+        """Reload if the file changed. Returns the set of added/modified match IDs."""
+        with self._lock:
+            stat = self._file_stat()
+            if stat == self._stat:
+                return set()
+
+            with open(self.json_path, "r", encoding="utf-8-sig") as f:
+                data = json.load(f)
+            self._stat = stat
+
+            new_matches, new_hashes, changed = {}, {}, set()
+            for pos, m in enumerate(cs.unwrap_matches(data)):
+                key = match_key(m, pos)
+                h = match_hash(m)
+                if self._hashes.get(key) == h:
+                    # Unchanged: keep the existing object so downstream identity checks hold
+                    new_matches[key] = self._matches[key]
+                else:
+                    new_matches[key] = m
+                    changed.add(key)
+                new_hashes[key] = h
+
+            removed = set(self._matches) - set(new_matches)
+            if not changed and not removed:
+                return set()
+
+            self._queue_registration([new_matches[k] for k in changed])
+            self._matches = new_matches
+            self._hashes = new_hashes
+            self._tables = None
+            self.version += 1
+            self.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return changed
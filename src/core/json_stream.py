@@ -0,0 +1,160 @@
+"""Incremental reader for large data.json files.
+
+json.load() holds the whole object tree in memory before anything can be
+flattened. iter_matches() reads the file in chunks and decodes one top-level
+match at a time (json.JSONDecoder.raw_decode over a sliding buffer), so only
+the current match is alive as Python objects. It understands the same layouts
+as columnar_store.unwrap_matches:
+    {"<MatchID>": {...}, ...}          production layout
+    [{...}, ...]                        plain list
+    {"Matches": [{...}, ...], ...}      wrapped list ("matches" also accepted)
+As in unwrap_matches, once a wrapper key holds the match list every other
+top-level value (e.g. "Metadata") is ignored. Wrapper keys are found with a
+cheap text scan first: only when the file mentions one are the values read
+before the wrapper held back (and dropped when it turns up), so the
+production layout still streams one match at a time.
+"""
+import json
+import re
+
+CHUNK_SIZE = 1 << 20   # characters read per refill
+WRAPPER_KEYS = ("Matches", "matches")
+
+_WHITESPACE = " \t\r\n"
+_WRAPPER_RE = re.compile(r'"(?:%s)"\s*:' % "|".join(WRAPPER_KEYS))
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Character buffer over a text file that only keeps the unconsumed tail."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, at_least=0):
+        """Append the next chunk (dropping the consumed prefix); False at end of file."""
+        chunk = self.f.read(max(self.chunk_size, at_least))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character without consuming it ("" at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise json.JSONDecodeError(f"Expecting {ch!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value cut off by the chunk boundary: read more and retry (at least
+                # doubling the pending text, so a long value is not re-scanned per chunk)
+                if self._fill(len(self.buf) - self.pos):
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _iter_array(reader):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise json.JSONDecodeError("Expecting ',' or ']'", reader.buf, reader.pos - 1)
+
+
+def _iter_object(reader, maybe_wrapped=True):
+    """
+    Top-level object values: the wrapper list's items if a wrapper key holds a
+    list, else every value. maybe_wrapped=False (no wrapper key in the file)
+    streams values as they are read instead of holding them back.
+    """
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    pending = []
+    wrapped = False
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if not wrapped and key in WRAPPER_KEYS and reader.peek() == "[":
+            wrapped = True
+            pending = []
+            yield from _iter_array(reader)
+        else:
+            # Decoded even after the wrapper: the reader has to move past it
+            value = reader.value()
+            if not wrapped:
+                if maybe_wrapped:
+                    pending.append(value)
+                else:
+                    yield value
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "}":
+            break
+        if sep != ",":
+            raise json.JSONDecodeError("Expecting ',' or '}'", reader.buf, reader.pos - 1)
+    yield from pending
+
+
+def _mentions_wrapper(path, chunk_size=CHUNK_SIZE):
+    """True when the file text contains a "Matches": / "matches": key anywhere."""
+    tail = ""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return False
+            text = tail + chunk
+            if _WRAPPER_RE.search(text):
+                return True
+            tail = text[-32:]
+
+
+def iter_matches(path, chunk_size=CHUNK_SIZE):
+    """Yield the match dicts of a data.json file one at a time."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        reader = _Reader(f, chunk_size)
+        first = reader.peek()
+        if first == "[":
+            values = _iter_array(reader)
+        elif first == "{":
+            values = _iter_object(reader, _mentions_wrapper(path, chunk_size))
+        else:
+            raise json.JSONDecodeError("Expecting '{' or '['", reader.buf, reader.pos)
+        for value in values:
+            if isinstance(value, dict):
+                yield value
@@ -0,0 +1,162 @@
+"""Precomputed leaderboard top-K index.
+
+Built once per data version. For every stat x category (All/Men/Women) x stage
+(All Games/Group Stage/Knockouts) it stores the row positions of the top K
+    - tournament aggregates per Stats Mode (Totals / Per Game / Per 36 Min),
+      with and without the minimum-games qualifier, and
+    - single-game performances (whole tournament and per date),
+so a leaderboard query is a dictionary lookup plus a K-row .iloc instead of a
+sort over the whole player frame.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import src.analytics as ant
+from src.metrics_engine import MetricsEngine
+
+CATEGORIES = ["All", "Men", "Women"]
+STAGES = ["All Games", "Group Stage", "Knockouts"]
+MODES = ["Totals", "Per Game", "Per 36 Min"]
+ALL_DATES = "Whole Tournament"
+MIN_GAMES = 3
+TOP_K = 10
+
+
+def _numeric_cols(df):
+    return [c for c in df.select_dtypes(include=np.number).columns
+            if c != "P_KEY" and not pd.api.types.is_bool_dtype(df[c])]
+
+
+def top_positions(df, masks, k=TOP_K, cols=None):
+    """
+    {(col, mask_key): positions of the k largest non-NaN values} for each column
+    and each boolean row mask. Ties keep frame order, like DataFrame.nlargest.
+    """
+    cols = _numeric_cols(df) if cols is None else cols
+    if df.empty or not cols:
+        return {}
+    values = df[cols].to_numpy(dtype=np.float64)
+    # One stable sort per column (NaN sorts last, so it is trimmed by `valid`)
+    order = np.argsort(-values, axis=0, kind="stable")
+    out = {}
+    for j, col in enumerate(cols):
+        col_order = order[:, j]
+        valid = ~np.isnan(values[col_order, j])
+        for mask_key, mask in masks.items():
+            out[(col, mask_key)] = col_order[valid & mask[col_order]][:k]
+    return out
+
+
+class LeaderboardIndex:
+    """Top-K leaderboards for a list of matches (full-game stats)."""
+
+    def __init__(self, match_list, stage_map=None, k=TOP_K, min_games=MIN_GAMES):
+        """
+        stage_map: {MatchID: "Group Stage" | "Knockouts"}; matches missing from it
+        only count towards "All Games".
+        """
+        self.k = k
+        self.min_games = min_games
+        self.frames = {}      # ("season", stage, mode) / ("game", stage) -> frame
+        self.top = {}         # (frame key, stat, category, qualifier/date) -> positions
+        self.stage_has = {}   # (stage, category) -> bool
+
+        stage_map = {str(mid): stage for mid, stage in (stage_map or {}).items()}
+        daily = ant.get_daily_stats(match_list, period="Full Game")
+        if daily.empty:
+            return
+        match_ids = daily["MatchID"].astype(str)
+
+        for stage in STAGES:
+            if stage == "All Games":
+                daily_s = daily
+            else:
+                daily_s = daily[match_ids.map(stage_map).eq(stage).to_numpy()]
+            for cat in CATEGORIES:
+                has = not daily_s.empty and (cat == "All" or bool((daily_s["Category"] == cat).any()))
+                self.stage_has[(stage, cat)] = has
+            if daily_s.empty:
+                continue
+
+            # Single-game performances
+            games = daily_s.reset_index(drop=True)
+            self._add(("game", stage), games, self._game_masks(games))
+
+            # Tournament aggregates per Stats Mode
+            players = MetricsEngine.aggregate_bundle(daily_s)["players"]
+            if players.empty:
+                continue
+            for mode in MODES:
+                frame = MetricsEngine.apply_stat_mode(players, mode, "Players").reset_index(drop=True)
+                self._add(("season", stage, mode), frame, self._season_masks(frame))
+
+    def _category_masks(self, df):
+        cats = df["Category"].to_numpy() if "Category" in df.columns else np.full(len(df), None)
+        return {cat: np.ones(len(df), dtype=bool) if cat == "All" else cats == cat for cat in CATEGORIES}
+
+    def _season_masks(self, df):
+        qualified = (pd.to_numeric(df["GP"], errors="coerce") >= self.min_games).to_numpy() \
+            if "GP" in df.columns else np.ones(len(df), dtype=bool)
+        masks = {}
+        for cat, cat_mask in self._category_masks(df).items():
+            masks[(cat, False)] = cat_mask
+            masks[(cat, True)] = cat_mask & qualified
+        return masks
+
+    def _game_masks(self, df):
+        dates = df["Date"].to_numpy() if "Date" in df.columns else np.full(len(df), None)
+        masks = {}
+        for cat, cat_mask in self._category_masks(df).items():
+            masks[(cat, ALL_DATES)] = cat_mask
+            for d in pd.unique(dates):
+                masks[(cat, d)] = cat_mask & (dates == d)
+        return masks
+
+    def _add(self, frame_key, frame, masks):
+        self.frames[frame_key] = frame
+        for (col, (cat, extra)), pos in top_positions(frame, masks, self.k).items():
+            self.top[(frame_key, col, cat, extra)] = pos
+
+    def _stage(self, stage, category):
+        # A stage without matches for the category falls back to all games (as the hub filters do)
+        return stage if self.stage_has.get((stage, category)) else "All Games"
+
+    def _lookup(self, frame_key, stat, category, extra, k):
+        frame = self.frames.get(frame_key)
+        pos = self.top.get((frame_key, stat, category, extra))
+        if frame is None or pos is None:
+            return pd.DataFrame()
+        return frame.iloc[pos[:k]]
+
+    def has_stage(self, stage, category="All"):
+        return bool(self.stage_has.get((stage, category)))
+
+    def season(self, stat, category="All", stage="All Games", mode="Totals", qualified=False, k=None):
+        """Top tournament rows for a stat (qualified: GP >= min_games)."""
+        stage = self._stage(stage, category)
+        return self._lookup(("season", stage, mode), stat, category, bool(qualified), k or self.k)
+
+    def single_game(self, stat, category="All", stage="All Games", date=None, k=None):
+        """Top single-game performances for a stat, optionally on one date."""
+        stage = self._stage(stage, category)
+        return self._lookup(("game", stage), stat, category, ALL_DATES if date in (None, ALL_DATES) else date,
+                            k or self.k)
+
+
+def index_token(data_version, match_list, stage_map=None):
+    """Cache token covering the data version, match categories and stage assignment."""
+    h = hashlib.md5()
+    for m in match_list:
+        h.update(f"{m.get('MatchID')}|{m.get('Category')};".encode())
+    for mid, stage in sorted((str(k), v) for k, v in (stage_map or {}).items()):
+        h.update(f"{mid}={stage};".encode())
+    return (data_version, h.hexdigest())
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_leaderboard_index(token, _match_list, _stage_map=None):
+    """Cached LeaderboardIndex for a token from index_token() (inputs are not hashed)."""
+    return LeaderboardIndex(_match_list, _stage_map)
@@ -0,0 +1,196 @@
+"""Manual score store: manual_scores.json cached by mtime, indexed by team pair and match ID.
+
+File format (unchanged): {"T1_VS_T2_GENDER": {"s1": int, "s2": int, "id": str}}
+where s1 is T1's score. Readers used to rebuild the "T1_VS_T2_GENDER" key by
+hand and retry with the teams swapped; ManualScoreStore.lookup() does both in
+one dict lookup on the order-independent (team pair, gender) key and returns
+the score oriented to the teams as asked.
+
+The parsed store is kept per path and only re-read when the file's mtime/size
+changes (the same stat check as the match loaders). Writers go through
+write_scores(), which validates the entries and replaces the file atomically,
+so a reader never sees a half-written JSON file.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from src.core.match_index import normalize_team, pair_key
+
+MANUAL_SCORES_PATH = os.path.join("data", "processed", "manual_scores.json")
+STAGING_PATH = r"h:\VIBE CODE\ind basketball\2staging\data\processed\manual_scores.json"
+KEY_SEP = "_VS_"
+
+_cache = {}   # path -> (stat, ManualScoreStore)
+_lock = threading.Lock()
+
+
+def resolve_path(path=None):
+    """The manual scores file: relative path for cloud, staging fallback for local."""
+    if path:
+        return path
+    if not os.path.exists(MANUAL_SCORES_PATH) and os.path.exists(STAGING_PATH):
+        return STAGING_PATH
+    return MANUAL_SCORES_PATH
+
+
+def score_key(t1, t2, gender):
+    """File key for a score stored in t1/t2 order ("KERALA_VS_GOA_MEN")."""
+    return f"{normalize_team(t1)}{KEY_SEP}{normalize_team(t2)}_{str(gender).strip().upper()}"
+
+
+def parse_key(key):
+    """(T1, T2, GENDER) of a file key, or None when it is not "T1_VS_T2_GENDER"."""
+    teams, sep, gender = str(key).rpartition("_")
+    t1, vs, t2 = teams.partition(KEY_SEP)
+    if not (sep and vs and t1.strip() and t2.strip() and gender.strip()):
+        return None
+    return t1.strip(), t2.strip(), gender.strip()
+
+
+def _int_score(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+def validate_entry(key, entry):
+    """Reason the entry is invalid, or None."""
+    if parse_key(key) is None:
+        return "key is not T1_VS_T2_GENDER"
+    if not isinstance(entry, dict):
+        return "entry is not an object"
+    for col in ("s1", "s2"):
+        score = _int_score(entry.get(col))
+        if score is None or score < 0:
+            return f"{col} is not a non-negative integer: {entry.get(col)!r}"
+    return None
+
+
+class ManualScoreStore:
+    """Valid manual scores plus O(1) lookups by (team pair, gender) and by match ID."""
+
+    def __init__(self, scores=None, path=None):
+        self.path = path
+        self.scores = {}     # file key -> entry (valid entries only)
+        self.invalid = {}    # file key -> reason
+        self.by_pair = {}    # pair_key -> [(T1, entry), ...] in file order
+        self.by_id = {}      # str(entry "id") -> file key
+        self._pair_keys = {}  # pair_key -> [file key, ...] in file order
+        for key, entry in (scores or {}).items():
+            reason = validate_entry(key, entry)
+            if reason:
+                self.invalid[key] = reason
+                continue
+            self.scores[key] = entry
+            t1, t2, gender = parse_key(key)
+            self.by_pair.setdefault(pair_key(t1, t2, gender), []).append((normalize_team(t1), entry))
+            self._pair_keys.setdefault(pair_key(t1, t2, gender), []).append(key)
+            if entry.get("id") not in (None, ""):
+                self.by_id.setdefault(str(entry["id"]), key)
+        self.version = hashlib.md5(json.dumps(self.scores, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+    def __len__(self):
+        return len(self.scores)
+
+    def to_dict(self):
+        """The valid entries as the manual_scores.json dict (a copy)."""
+        return dict(self.scores)
+
+    def lookup(self, t1, t2, gender):
+        """
+        {"s1", "s2", "id"} oriented to t1/t2 (s1 = t1's score), or None.
+        A key stored in t1/t2 order wins over one stored the other way round.
+        """
+        entries = self.by_pair.get(pair_key(t1, t2, gender))
+        if not entries:
+            return None
+        first = normalize_team(t1)
+        for stored_t1, entry in entries:
+            if stored_t1 == first:
+                return {"s1": _int_score(entry["s1"]), "s2": _int_score(entry["s2"]), "id": entry.get("id")}
+        entry = entries[0][1]
+        return {"s1": _int_score(entry["s2"]), "s2": _int_score(entry["s1"]), "id": entry.get("id")}
+
+    def stored_key(self, t1, t2, gender):
+        """
+        File key lookup() reads for these teams (the t1/t2-order key if stored,
+        else the first one stored the other way round), or None.
+        """
+        keys = self._pair_keys.get(pair_key(t1, t2, gender))
+        if not keys:
+            return None
+        first = normalize_team(t1)
+        for key in keys:
+            if normalize_team(parse_key(key)[0]) == first:
+                return key
+        return keys[0]
+
+    def get(self, match_id):
+        """(T1, T2, GENDER, entry) for a schedule / image match ID, or None."""
+        key = self.by_id.get(str(match_id))
+        if key is None:
+            return None
+        return parse_key(key) + (self.scores[key],)
+
+
+def _stat(path):
+    try:
+        st_res = os.stat(path)
+    except OSError:
+        return None
+    return (st_res.st_mtime_ns, st_res.st_size)
+
+
+def read_scores(path=None):
+    """Raw file contents ({} when missing or unreadable); not cached, for writers."""
+    path = resolve_path(path)
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def load_store(path=None):
+    """ManualScoreStore for the file, re-parsed only when its mtime/size changed."""
+    path = resolve_path(path)
+    stat = _stat(path)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == stat:
+            return cached[1]
+    store = ManualScoreStore(read_scores(path) if stat else {}, path)
+    with _lock:
+        _cache[path] = (stat, store)
+    return store
+
+
+def write_scores(scores, path=None, validate=True):
+    """
+    Validate and write the whole scores dict atomically (temp file + os.replace).
+    Raises ValueError listing the invalid entries when validate is set.
+    """
+    path = resolve_path(path)
+    if validate:
+        bad = {k: r for k, r in ((k, validate_entry(k, v)) for k, v in scores.items()) if r}
+        if bad:
+            raise ValueError("invalid manual scores: " + "; ".join(f"{k}: {r}" for k, r in sorted(bad.items())))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(scores, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    with _lock:
+        _cache.pop(path, None)
+    return path
@@ -0,0 +1,100 @@
+"""Prebuilt lookups over the match list (by MatchID, Genius ID, team pair and date)."""
+import pandas as pd
+import streamlit as st
+
+
+def normalize_team(name):
+    """Canonical team key: stripped, upper case."""
+    return str(name).strip().upper()
+
+
+def normalize_gender(gender):
+    """Canonical division key: stripped, title case (Men/Women)."""
+    return str(gender).strip().title()
+
+
+def pair_key(t1, t2, gender):
+    """Order-independent (team pair, gender) key."""
+    a, b = sorted((normalize_team(t1), normalize_team(t2)))
+    return (a, b, normalize_gender(gender))
+
+
+def normalize_match_id(value):
+    """MatchIDs arrive as str, int or float ("2797383.0"); map them all to "2797383"."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    s = str(value).strip()
+    if not s or s.lower() == "nan":
+        return None
+    try:
+        f = float(s)
+        if f.is_integer():
+            return str(int(f))
+    except ValueError:
+        pass
+    return s
+
+
+def match_date(m):
+    """Calendar part of a match's MatchDate ("2026-01-04 10:00" -> "2026-01-04")."""
+    raw = str(m.get("Metadata", {}).get("MatchDate", "Unknown"))
+    return raw.split(" ")[0] if " " in raw else raw
+
+
+class MatchIndex:
+    """
+    O(1) match lookups, built once per data version.
+    For a repeated team pair (group game + knockout rematch) the pair lookup
+    returns the first match in data order, same as the old linear scan.
+    """
+
+    def __init__(self, match_list):
+        self.matches = list(match_list)
+        self.by_id = {}
+        self.by_pair = {}
+        self.by_date = {}
+
+        for m in self.matches:
+            mid = normalize_match_id(m.get("MatchID"))
+            if mid is not None:
+                self.by_id.setdefault(mid, m)
+
+            teams = m.get("Teams", {})
+            if teams.get("t1") is not None and teams.get("t2") is not None:
+                key = pair_key(teams["t1"], teams["t2"], m.get("Category", ""))
+                self.by_pair.setdefault(key, m)
+
+            self.by_date.setdefault(match_date(m), []).append(m)
+
+    def __len__(self):
+        return len(self.matches)
+
+    def get(self, match_id):
+        """Match by MatchID (str/int/float accepted)."""
+        return self.by_id.get(normalize_match_id(match_id))
+
+    def get_by_genius_id(self, genius_id):
+        """Match by the schedule's 'Genius Match ID' (the scraped MatchID)."""
+        return self.get(genius_id)
+
+    def find(self, t1, t2, gender):
+        """Match between two teams in a division, in either home/away order."""
+        return self.by_pair.get(pair_key(t1, t2, gender))
+
+    def on_date(self, date):
+        """All matches on a calendar date."""
+        return self.by_date.get(str(date), [])
+
+    def for_schedule_row(self, row):
+        """Detailed-stats match for a compiled_schedule.csv row, or None."""
+        genius_id = row.get("Genius Match ID") if hasattr(row, "get") else None
+        m = self.get_by_genius_id(genius_id) if genius_id is not None else None
+        if m is not None:
+            return m
+        return self.find(row["Team A"], row["Team B"], row["Gender"])
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_match_index(data_version, _match_list):
+    """Cached MatchIndex for a data version (the match list itself is not hashed)."""
+    return MatchIndex(_match_list)
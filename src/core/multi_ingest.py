@@ -0,0 +1,258 @@
+"""Multi-file ingestion: a directory of tournament JSON files in a process pool.
+
+Each file (one tournament / season, any data.json layout) is parsed and
+flattened into the columnar tables (src.core.columnar_store) in its own worker
+process; the parent concatenates the per-file tables and match lists. Load
+time scales with the number of cores, and a file that fails to parse is
+reported in `errors` instead of failing the batch.
+
+Matches are tagged with a "Tournament" field (the file name without
+extension) unless they already carry one. A MatchID that appears in more than
+one file is kept from the first file (in sorted path order) and reported.
+
+Usage:
+    python -m src.core.multi_ingest DATA_DIR [--workers N] [--out STORE_DIR]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from src.core import columnar_store as cs
+from src.core.incremental_loader import CategorizedMatches
+
+DEFAULT_TOURNAMENT_DIR = os.path.join("data", "tournaments")
+
+
+def tournament_files(data_dir):
+    """Sorted *.json paths under data_dir (recursive)."""
+    paths = []
+    for root, _, files in os.walk(data_dir):
+        paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(".json"))
+    return sorted(paths)
+
+
+def tournament_name(path, data_dir=None):
+    """Tournament label of a file: its path relative to data_dir, without extension."""
+    rel = os.path.relpath(path, data_dir) if data_dir else os.path.basename(path)
+    return os.path.splitext(rel)[0].replace(os.sep, "/")
+
+
+def _file_stat(path):
+    st_res = os.stat(path)
+    return (st_res.st_mtime_ns, st_res.st_size)
+
+
+def ingest_file(path, tournament=None, category_map=None):
+    """
+    Parse and flatten one file (runs in a worker process).
+    Returns {"path", "matches", "tables", "error", "seconds"}; parse errors are
+    returned in "error" rather than raised.
+    """
+    t0 = time.perf_counter()
+    result = {"path": path, "matches": [], "tables": None, "error": None}
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        matches = [m for m in cs.unwrap_matches(data) if isinstance(m, dict)]
+        if not matches:
+            raise ValueError("no match records found")
+        tournament = tournament or tournament_name(path)
+        for m in matches:
+            m.setdefault("Tournament", tournament)
+        tables = cs.flatten_matches(matches, category_map)
+        if not tables["matches"].empty:
+            tables["matches"]["Tournament"] = [m["Tournament"] for m in matches]
+        result["matches"] = matches
+        result["tables"] = tables
+    except Exception as e:  # One bad file must not take down the batch
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - t0
+    return result
+
+
+def _run_pool(jobs, category_map=None, workers=None):
+    """Run ingest_file over (path, tournament) jobs; returns {path: result}."""
+    workers = workers or os.cpu_count() or 1
+    results = {}
+    if workers <= 1 or len(jobs) <= 1:
+        for path, tournament in jobs:
+            results[path] = ingest_file(path, tournament, category_map)
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(ingest_file, path, tournament, category_map): path
+                   for path, tournament in jobs}
+        for fut in as_completed(futures):
+            path = futures[fut]
+            try:
+                results[path] = fut.result()
+            except Exception as e:  # Worker crash (e.g. BrokenProcessPool)
+                results[path] = {"path": path, "matches": [], "tables": None,
+                                 "error": f"{type(e).__name__}: {e}", "seconds": None}
+    return results
+
+
+def combine(results, paths):
+    """
+    Concatenate per-file results (in `paths` order).
+    Returns (matches, tables, duplicates) where duplicates maps a MatchID to the
+    files that repeated it.
+    """
+    seen = {}
+    duplicates = {}
+    matches = []
+    parts = {name: [] for name in cs.STORE_TABLES}
+    for path in paths:
+        res = results.get(path)
+        if not res or res["error"]:
+            continue
+        dup_ids = set()
+        for m in res["matches"]:
+            mid = str(m.get("MatchID", "Unknown"))
+            if mid in seen and seen[mid] != path:
+                dup_ids.add(mid)
+                duplicates.setdefault(mid, [seen[mid]]).append(path)
+                continue
+            seen[mid] = path
+            matches.append(m)
+        for name in cs.STORE_TABLES:
+            df = res["tables"].get(name)
+            if df is None or df.empty:
+                continue
+            if dup_ids and "MatchID" in df.columns:
+                df = df[~df["MatchID"].isin(dup_ids)]
+            parts[name].append(df)
+
+    tables = {}
+    for name, dfs in parts.items():
+        # Re-coerce: a column numeric in one file and text in another comes back as object
+        tables[name] = cs.coerce_types(pd.concat(dfs, ignore_index=True)) if dfs else pd.DataFrame()
+    return matches, tables, duplicates
+
+
+class MultiFileLoader(CategorizedMatches):
+    """
+    Keeps the matches of a directory of tournament files in memory.
+
+    Same interface as IncrementalMatchLoader (refresh / matches / tables /
+    data_version). refresh() stats every file and re-ingests
+    only the files whose mtime/size changed, in a process pool.
+    """
+
+    def __init__(self, data_dir, category_map=None, workers=None):
+        self.json_path = data_dir
+        self.data_dir = data_dir
+        self.category_map = category_map or {}
+        self.workers = workers
+        self.version = 0
+        self.last_updated = "N/A"
+        self.errors = {}        # path -> error message
+        self.duplicates = {}    # MatchID -> [paths]
+        self.timings = {}       # path -> seconds of the last ingest
+        self._stats = {}        # path -> (mtime_ns, size)
+        self._results = {}      # path -> ingest_file result
+        self._matches = []
+        self._tables = None
+        self._lock = threading.Lock()
+
+    @property
+    def matches(self):
+        return list(self._matches)
+
+    @property
+    def data_version(self):
+        """Opaque token that changes whenever match content changes."""
+        return f"{os.path.basename(os.path.normpath(self.data_dir))}:{self._version_token()}"
+
+    @property
+    def tables(self):
+        """Columnar tables concatenated over every file."""
+        if self._tables is None:
+            self._matches, self._tables, self.duplicates = combine(self._results, sorted(self._results))
+        return self._tables
+
+    def refresh(self):
+        """Re-ingest added/modified files. Returns the set of match IDs they contain."""
+        with self._lock:
+            paths = tournament_files(self.data_dir)
+            stats = {}
+            for p in paths:
+                try:
+                    stats[p] = _file_stat(p)
+                except OSError:
+                    continue
+            stale = [p for p in stats if self._stats.get(p) != stats[p]]
+            removed = set(self._stats) - set(stats)
+            if not stale and not removed:
+                return set()
+
+            fresh = _run_pool([(p, tournament_name(p, self.data_dir)) for p in stale],
+                              self.category_map, self.workers)
+            for p in removed:
+                self._results.pop(p, None)
+                self.errors.pop(p, None)
+                self.timings.pop(p, None)
+            for p, res in fresh.items():
+                self._results[p] = res
+                self.timings[p] = res["seconds"]
+                if res["error"]:
+                    self.errors[p] = res["error"]
+                else:
+                    self.errors.pop(p, None)
+            self._stats = stats
+
+            self._matches, self._tables, self.duplicates = combine(self._results, sorted(self._results))
+            changed = {str(m.get("MatchID")) for p in stale for m in fresh[p]["matches"]}
+            self._queue_registration([m for p in stale for m in fresh[p]["matches"]])
+            self.version += 1
+            self.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return changed
+
+    def report(self):
+        """One row per file: tournament, matches, seconds, error."""
+        rows = []
+        for p in sorted(self._results):
+            res = self._results[p]
+            rows.append({
+                "Tournament": tournament_name(p, self.data_dir),
+                "Matches": len(res["matches"]),
+                "Seconds": round(res["seconds"], 3) if res["seconds"] is not None else None,
+                "Error": res["error"] or "",
+            })
+        return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest a directory of tournament JSON files")
+    parser.add_argument("data_dir", nargs="?", default=DEFAULT_TOURNAMENT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", help="write the combined columnar store to this directory")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    loader = MultiFileLoader(args.data_dir, workers=args.workers)
+    loader.refresh()
+    wall = time.perf_counter() - t0
+
+    with pd.option_context("display.max_rows", None, "display.width", 120):
+        print(loader.report().to_string(index=False))
+    print(f"\n{len(loader.matches)} matches from {len(loader.timings)} files in {wall:.2f}s "
+          f"(workers={args.workers or os.cpu_count()})")
+    for mid, paths in sorted(loader.duplicates.items()):
+        print(f"  duplicate MatchID {mid}: kept {paths[0]}, skipped {', '.join(paths[1:])}")
+    if loader.errors:
+        print(f"  {len(loader.errors)} file(s) failed", file=sys.stderr)
+    if args.out:
+        for table, path in cs.write_tables(loader.tables, args.out).items():
+            print(f"  {table}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Precomputed player x match x period stat cube.
+
+PeriodStats are flattened once per data version into a dense array
+    cube[row, period, stat]      row = (match, player), stat = counting stat
+so any set of periods (halves, a custom quarter selection, overtimes) is a
+single numpy sum over the period axis instead of re-merging stat dicts.
+
+Whole-number stats are stored as float32 (exact at these magnitudes), while
+fractional ones (decimal minutes) stay float64, as in src.core.schema.
+Identity fields are kept once per row. Other text fields (the per-period "Mins")
+are stored as int32 codes into a small vocabulary per column.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.core.columnar_store import HALF_PERIODS, RATE_STATS
+
+REGULATION_PERIODS = ["Q1", "Q2", "Q3", "Q4"]
+
+# Never summed across periods (identity fields)
+FIRST_ONLY = ["Player", "Team", "No", "Jersey"]
+
+
+def period_sort_key(name):
+    """Q1..Q4 first, then overtimes (OT1, OT2, ...), then anything else."""
+    if name in REGULATION_PERIODS:
+        return (0, REGULATION_PERIODS.index(name), name)
+    digits = re.findall(r"\d+", str(name))
+    return (1, int(digits[0]) if digits else 0, str(name))
+
+
+def resolve_periods(period):
+    """Period label ("1st Half", "Q3", ...) or list of periods -> list of period names."""
+    if isinstance(period, (list, tuple, set)):
+        return sorted(period, key=period_sort_key)
+    if period in HALF_PERIODS:
+        return list(HALF_PERIODS[period])
+    if period == "Full Game":
+        return None
+    return [period]
+
+
+def is_summable(col):
+    """Counting stats are summed; rates are recalculated downstream."""
+    return col not in FIRST_ONLY and not col.endswith("%") and col not in RATE_STATS
+
+
+class PeriodCube:
+    """Player x match x period counting stats for a list of matches."""
+
+    def __init__(self, match_list):
+        periods = set()
+        for m in match_list:
+            periods.update(m.get("PeriodStats", {}).keys())
+        self.periods = sorted(periods, key=period_sort_key)
+        self.period_pos = {p: i for i, p in enumerate(self.periods)}
+
+        # Match-level context, one entry per match
+        self.match_ids = []
+        self.match_pos = {}
+        dates, cats, t1s, t2s = [], [], [], []
+
+        row_pos = {}
+        row_match, row_player = [], []
+        rec_rows, rec_periods, records = [], [], []
+
+        for mi, m in enumerate(match_list):
+            mid = m.get("MatchID", "Unknown")
+            self.match_ids.append(mid)
+            self.match_pos.setdefault(str(mid), mi)
+            teams = m.get("Teams", {})
+            dates.append(m.get("Metadata", {}).get("MatchDate", "Unknown"))
+            cats.append(m.get("Category", "Unknown"))
+            t1s.append(teams.get("t1"))
+            t2s.append(teams.get("t2"))
+
+            for q in sorted(m.get("PeriodStats", {}), key=period_sort_key):
+                for p_name, s in m["PeriodStats"][q].items():
+                    key = (mi, p_name)
+                    if key not in row_pos:
+                        row_pos[key] = len(row_match)
+                        row_match.append(mi)
+                        row_player.append(p_name)
+                    rec_rows.append(row_pos[key])
+                    rec_periods.append(self.period_pos[q])
+                    records.append(s)
+
+        self.match_meta = pd.DataFrame({"Date": dates, "Category": cats, "Team1": t1s, "Team2": t2s})
+        self.row_match = np.asarray(row_match, dtype=np.int64)
+        self.row_player = np.asarray(row_player, dtype=object)
+
+        n_rows, n_periods = len(row_match), len(self.periods)
+        df = pd.DataFrame.from_records(records) if records else pd.DataFrame()
+        rec_rows = np.asarray(rec_rows, dtype=np.int64)
+        rec_periods = np.asarray(rec_periods, dtype=np.int64)
+
+        self.stat_cols = [c for c in df.columns
+                          if is_summable(c) and pd.api.types.is_numeric_dtype(df[c])
+                          and not pd.api.types.is_bool_dtype(df[c])]
+        self.other_cols = [c for c in df.columns if c not in self.stat_cols]
+
+        self.present = np.zeros((n_rows, n_periods), dtype=bool)
+        self.present[rec_rows, rec_periods] = True
+
+        values = df[self.stat_cols].fillna(0).to_numpy(dtype=np.float64) if self.stat_cols \
+            else np.zeros((len(rec_rows), 0))
+        # Whole-number stats (float32, exact) are handed back as ints, like the source dicts;
+        # fractional ones (decimal minutes) keep float64
+        whole = (values % 1 == 0).all(axis=0)
+        self.int_cols = [c for c, w in zip(self.stat_cols, whole) if w]
+        self.frac_cols = [c for c, w in zip(self.stat_cols, whole) if not w]
+        self.cube = np.zeros((n_rows, n_periods, int(whole.sum())), dtype=np.float32)
+        self.cube[rec_rows, rec_periods, :] = values[:, whole]
+        self.frac_cube = np.zeros((n_rows, n_periods, int((~whole).sum())), dtype=np.float64)
+        self.frac_cube[rec_rows, rec_periods, :] = values[:, ~whole]
+
+        # Identity fields from each row's first record (its earliest period)
+        self.id_cols = [c for c in self.other_cols if c in FIRST_ONLY]
+        first_rec = np.unique(rec_rows, return_index=True)[1]
+        self.ids = df[self.id_cols].to_numpy(dtype=object)[first_rec] if self.id_cols \
+            else np.empty((n_rows, 0), dtype=object)
+        # Per-period text as codes; code -1 (no value) indexes the trailing None
+        self.text_cols = [c for c in self.other_cols if c not in FIRST_ONLY]
+        self.text_codes = np.full((n_rows, n_periods, len(self.text_cols)), -1, dtype=np.int32)
+        self.text_values = []
+        for j, c in enumerate(self.text_cols):
+            codes, uniques = pd.factorize(df[c])
+            self.text_codes[rec_rows, rec_periods, j] = codes
+            self.text_values.append(np.append(np.asarray(uniques, dtype=object), None))
+
+    @property
+    def nbytes(self):
+        return (self.cube.nbytes + self.frac_cube.nbytes + self.present.nbytes + self.ids.nbytes
+                + self.text_codes.nbytes + sum(v.nbytes for v in self.text_values))
+
+    def periods_for(self, match_id):
+        """Periods with any player data for one match, in game order."""
+        mi = self.match_pos.get(str(match_id))
+        if mi is None:
+            return []
+        rows = self.row_match == mi
+        return [p for i, p in enumerate(self.periods) if self.present[rows, i].any()]
+
+    def _rows(self, p_idx, match_ids=None):
+        rows = self.present[:, p_idx].any(axis=1)
+        if match_ids is not None:
+            wanted = np.zeros(len(self.match_ids), dtype=bool)
+            wanted[[self.match_pos[str(mid)] for mid in match_ids if str(mid) in self.match_pos]] = True
+            rows &= wanted[self.row_match]
+        return np.flatnonzero(rows)
+
+    def player_frame(self, periods, match_ids=None):
+        """
+        One row per (match, player) with counting stats summed over `periods`.
+        Identity fields come from the player's earliest period in the match, other
+        text columns from the earliest selected one.
+        """
+        return self._player_frame(periods, match_ids).drop(columns=["_match"], errors="ignore")
+
+    def _player_frame(self, periods, match_ids=None):
+        p_idx = [self.period_pos[p] for p in resolve_periods(periods) or [] if p in self.period_pos]
+        if not p_idx or not len(self.row_match):
+            return pd.DataFrame()
+        rows = self._rows(p_idx, match_ids)
+        if not len(rows):
+            return pd.DataFrame()
+
+        p_idx = np.asarray(p_idx)
+        present = self.present[np.ix_(rows, p_idx)]
+        first_p = p_idx[present.argmax(axis=1)]
+
+        ids = self.ids[rows]
+        codes = self.text_codes[rows, first_p, :]
+        sums = self.cube[np.ix_(rows, p_idx)].sum(axis=1).astype(np.int64)
+        frac_sums = self.frac_cube[np.ix_(rows, p_idx)].sum(axis=1)
+        cols = {c: ids[:, j] for j, c in enumerate(self.id_cols)}
+        cols.update({c: self.text_values[j][codes[:, j]] for j, c in enumerate(self.text_cols)})
+        cols.update({c: sums[:, j] for j, c in enumerate(self.int_cols)})
+        cols.update({c: frac_sums[:, j] for j, c in enumerate(self.frac_cols)})
+        df = pd.DataFrame(cols, columns=self.other_cols + self.stat_cols)
+
+        if "Player" in df.columns:
+            df["Player"] = df["Player"].where(df["Player"].notna(), self.row_player[rows])
+        else:
+            df["Player"] = self.row_player[rows]
+        df["_match"] = self.row_match[rows]
+        return df
+
+    def daily_frame(self, period, match_list=None):
+        """
+        Player-game rows with match context for a period, like analytics.get_daily_stats.
+        Returns None when match_list contains matches the cube was not built from.
+        """
+        match_ids = None
+        if match_list is not None:
+            match_ids = [m.get("MatchID", "Unknown") for m in match_list]
+            if any(str(mid) not in self.match_pos for mid in match_ids):
+                return None
+
+        df = self._player_frame(period, match_ids)
+        if df.empty:
+            return df
+
+        match_rows = df.pop("_match").to_numpy()
+        meta = self.match_meta.iloc[match_rows].reset_index(drop=True)
+        team = df["Team"] if "Team" in df.columns else pd.Series(None, index=df.index, dtype=object)
+        df["Date"] = meta["Date"].to_numpy()
+        df["Category"] = meta["Category"].to_numpy()
+        df["Match"] = (meta["Team1"].astype(str) + " vs " + meta["Team2"].astype(str)).to_numpy()
+        df["Opponent"] = np.where(team.to_numpy() == meta["Team1"].to_numpy(),
+                                  meta["Team2"].to_numpy(), meta["Team1"].to_numpy())
+        df["MatchID"] = np.asarray(self.match_ids, dtype=object)[match_rows]
+        return df
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_period_cube(data_version, _match_list):
+    """Cached PeriodCube for a data version (the match list itself is not hashed)."""
+    return PeriodCube(_match_list)
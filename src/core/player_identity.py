@@ -0,0 +1,267 @@
+"""Persistent player identity table: (name variant, division, team, jersey) -> stable int ID.
+
+Players are registered during ingestion, from the categorized matches the hub
+aggregates (CategorizedMatches.categorized in src.core.incremental_loader), and
+the table is saved next to the data as JSON, so IDs stay the same across
+reloads. Aggregations group on the int ID instead of a "Player_Team" string;
+assign() only looks IDs up and never adds players to the table.
+Names are compared by a key that ignores case, accents, punctuation, word
+order and common abbreviations ("Mohd" / "Mohammed"); only an exact key match
+reuses an ID. An unknown spelling on the same team and jersey as a similarly
+spelled player ("Amit Kumar" / "Ankit Kumar") gets its own ID and is put on
+the review list instead of being merged - two names that played for the same
+team in the same match are never even suggested. Men's and women's sides often
+share a team name, so the division (match Category) is part of the key.
+"""
+import json
+import os
+import threading
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.core.match_index import normalize_gender, normalize_team
+from src.core.player_search import normalize, phonetic, trigrams
+
+DEFAULT_PATH = os.path.join("data", "processed", "player_ids.json")
+SCHEMA_VERSION = 2
+# Minimum trigram (Dice) similarity for a same-team, same-jersey name to be put up for review
+VARIANT_SIMILARITY = 0.6
+
+_NAME_ALIASES = {"mohd": "mohammed", "md": "mohammed", "muhammad": "mohammed", "mohammad": "mohammed",
+                 "muhammed": "mohammed"}
+
+
+@lru_cache(maxsize=65536)
+def name_key(name):
+    """Variant-insensitive name key ("Mohd. Shafeeq" == "shafeeq mohammed")."""
+    return " ".join(sorted(_NAME_ALIASES.get(w, w) for w in normalize(name).split()))
+
+
+def jersey_key(no):
+    """Jersey as text without float artefacts or leading zeros ("07", 7.0 -> "7"); None if missing."""
+    if no is None or (isinstance(no, float) and pd.isna(no)):
+        return None
+    s = str(no).strip()
+    if not s or s.lower() in ("nan", "none"):
+        return None
+    try:
+        f = float(s)
+        if f.is_integer():
+            return str(int(f))
+    except ValueError:
+        pass
+    return s
+
+
+def _similarity(a, b):
+    ga, gb = trigrams(phonetic(a)), trigrams(phonetic(b))
+    return 2 * len(ga & gb) / (len(ga) + len(gb)) if ga and gb else 0.0
+
+
+class PlayerIdentityTable:
+    """Thread-safe mapping of player name variants (per team) to stable integer IDs."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.players = {}        # id -> {"name", "team", "category", "variants": [...], "jerseys": [...]}
+        self._by_key = {}        # (category, team key, name key) -> id
+        self._by_jersey = {}     # (category, team key, jersey) -> [id, ...]
+        self.review = {}         # id -> [similar ids on the same team and jersey] (possible variants)
+        self._apart = set()      # {(id, id)} seen on the same team in one match: never variants
+        self._next_id = 1
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.players)
+
+    # --- persistence ---
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """Table from a saved JSON file (empty if the file is missing or unreadable)."""
+        table = cls(path)
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                return table
+            for rec in payload.get("players", []):
+                pid = int(rec["id"])
+                variants = rec.get("variants", [])
+                if payload.get("version", 1) < 2:
+                    # v1 merged similar spellings on the same jersey; keep only exact-key
+                    # variants, the others get their own ID when next seen
+                    kept = [v for v in variants if name_key(v) == name_key(rec["name"])]
+                    table._dirty |= len(kept) != len(variants)
+                    variants = kept
+                table._add(pid, rec["name"], rec.get("team"), rec.get("category"),
+                           variants, rec.get("jerseys", []))
+            for rec in payload.get("review", []):
+                table.review[int(rec["id"])] = [int(c) for c in rec["candidates"]]
+            table._apart = {tuple(pair) for pair in payload.get("apart", [])}
+            table._next_id = max([table._next_id, *(pid + 1 for pid in table.players)])
+        return table
+
+    def save(self, path=None, force=False):
+        """Write the table as JSON (atomically); skipped when nothing changed. Returns the path or None."""
+        path = path or self.path
+        if not path or not (self._dirty or force):
+            return None
+        with self._lock:
+            payload = {
+                "version": SCHEMA_VERSION,
+                "players": [{"id": pid, "name": p["name"], "team": p["team"], "category": p["category"],
+                             "variants": p["variants"], "jerseys": p["jerseys"]}
+                            for pid, p in sorted(self.players.items())],
+                "review": [{"id": pid, "candidates": c} for pid, c in sorted(self.review.items()) if c],
+                "apart": sorted(list(pair) for pair in self._apart),
+            }
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=1, ensure_ascii=False)
+            os.replace(tmp, path)
+            self._dirty = False
+        return path
+
+    # --- resolution ---
+    def _add(self, pid, name, team, category=None, variants=(), jerseys=()):
+        side = self._key(name, team, category)[:2]
+        self.players[pid] = {"name": name, "team": team, "category": category,
+                             "variants": list(variants) or [name], "jerseys": list(jerseys)}
+        for v in self.players[pid]["variants"]:
+            self._by_key.setdefault((*side, name_key(v)), pid)
+        for no in self.players[pid]["jerseys"]:
+            self._by_jersey.setdefault((*side, no), []).append(pid)
+
+    def _note(self, pid, name, side, jersey):
+        p = self.players[pid]
+        if name not in p["variants"]:
+            p["variants"].append(name)
+            self._by_key.setdefault((*side, name_key(name)), pid)
+            self._dirty = True
+        if jersey is not None and jersey not in p["jerseys"]:
+            p["jerseys"].append(jersey)
+            self._by_jersey.setdefault((*side, jersey), []).append(pid)
+            self._dirty = True
+
+    @staticmethod
+    def _key(name, team, category=None):
+        """(division, team, name) lookup key; missing parts stay None."""
+        return (normalize_gender(category) if category is not None else None,
+                normalize_team(team) if team is not None else None,
+                name_key(name))
+
+    def resolve(self, name, team=None, jersey=None, category=None):
+        """Stable ID for a player line (exact name key only), registering a new player if needed."""
+        name = str(name)
+        key = self._key(name, team, category)
+        side = key[:2]
+        jersey = jersey_key(jersey)
+        with self._lock:
+            pid = self._by_key.get(key)
+            if pid is None:
+                pid = self._next_id
+                self._next_id += 1
+                self._add(pid, name, team, category)
+                self._dirty = True
+                if jersey is not None:
+                    # Possible spelling variant: same team and jersey, similar name -> review, not merge
+                    similar = [c for c in self._by_jersey.get((*side, jersey), [])
+                               if _similarity(name, self.players[c]["name"]) >= VARIANT_SIMILARITY]
+                    if similar:
+                        self.review[pid] = similar
+            self._note(pid, name, side, jersey)
+            return pid
+
+    def _mark_apart(self, pids):
+        """IDs that played for the same team in one match are different players."""
+        pids = sorted(set(pids))
+        for i, a in enumerate(pids):
+            for b in pids[i + 1:]:
+                if (a, b) not in self._apart:
+                    self._apart.add((a, b))
+                    self._dirty = True
+        for pid in pids:
+            cands = self.review.get(pid)
+            if cands:
+                self.review[pid] = [c for c in cands if tuple(sorted((pid, c))) not in self._apart]
+
+    def review_candidates(self):
+        """[(id, name, [(candidate id, name), ...])] for the possible variants left to review."""
+        return [(pid, self.name(pid), [(c, self.name(c)) for c in cands])
+                for pid, cands in sorted(self.review.items()) if cands]
+
+    def register_matches(self, match_list):
+        """Resolve every player line (PlayerStats and PeriodStats) of the matches; returns the count of new IDs."""
+        before = len(self.players)
+        for m in match_list:
+            seen = set()
+            category = m.get("Category")
+            lines = list((m.get("PlayerStats") or {}).items())
+            for players in (m.get("PeriodStats") or {}).values():
+                lines.extend(players.items())
+            by_team = {}
+            for p_name, s in lines:
+                s = s if isinstance(s, dict) else {}
+                name = s.get("Player", p_name)
+                team = s.get("Team")
+                if (name, team) in seen:
+                    continue
+                seen.add((name, team))
+                by_team.setdefault(team, []).append(self.resolve(name, team, s.get("No"), category))
+            with self._lock:
+                for pids in by_team.values():
+                    self._mark_apart(pids)
+        return len(self.players) - before
+
+    def assign(self, df, name_col="Player", team_col="Team", no_col="No", category_col="Category"):
+        """
+        int32 ID per row of a player frame (each distinct name/team/division looked up once).
+        Players that were never registered get negative IDs local to this call:
+        a grouping key for the frame, not stored and not stable across calls.
+        """
+        if df.empty:
+            return np.empty(0, dtype=np.int32)
+        cols = [c for c in (name_col, team_col, category_col) if c in df.columns]
+        # Factorize each column, then combine the codes into one int key per row
+        combined = np.zeros(len(df), dtype=np.int64)
+        levels = []
+        for col in cols:
+            col_codes, col_uniques = pd.factorize(df[col], use_na_sentinel=False)
+            combined = combined * (len(col_uniques) + 1) + col_codes
+            levels.append((col_codes, col_uniques))
+        codes, uniques = pd.factorize(combined)
+        first_rows = np.empty(len(uniques), dtype=np.int64)
+        first_rows[codes[::-1]] = np.arange(len(df) - 1, -1, -1)
+        ids = np.empty(len(uniques), dtype=np.int32)
+        unregistered = {}   # lookup key -> transient negative ID
+        with self._lock:
+            for j, i in enumerate(first_rows):
+                row = {col: u[c[i]] for col, (c, u) in zip(cols, levels)}
+                key = self._key(str(row[name_col]), row.get(team_col), row.get(category_col))
+                pid = self._by_key.get(key)
+                if pid is None:
+                    pid = unregistered.setdefault(key, -(len(unregistered) + 1))
+                ids[j] = pid
+        return ids[codes]
+
+    # --- lookups ---
+    def name(self, pid):
+        """Display name of an ID (first spelling seen)."""
+        p = self.players.get(int(pid))
+        return p["name"] if p else None
+
+    def jerseys(self, pid):
+        """Jersey numbers recorded for an ID, in the order first seen."""
+        p = self.players.get(int(pid))
+        return list(p["jerseys"]) if p else []
+
+
+@st.cache_resource(show_spinner=False)
+def get_identity_table(path=DEFAULT_PATH):
+    """Process-wide identity table backed by `path`."""
+    return PlayerIdentityTable.load(path)
@@ -0,0 +1,147 @@
+"""Per-player match lookups and game logs.
+
+Built once per data version: an inverted index player -> [matches played] and
+the per-game stat line of every (player, match) pair, so a player profile reads
+only that player's games instead of scanning every match (and merging its
+PeriodStats quarters) on each rerun.
+"""
+import streamlit as st
+
+IDENTITY_KEYS = ("Team", "No", "Player")
+
+
+def quick_fic(s):
+    """FIC from a raw stat line (same weights as the hub game log)."""
+    return (
+        s.get('PTS', 0) +
+        s.get('OREB', 0) +
+        0.75 * s.get('DREB', 0) +
+        s.get('AST', 0) +
+        s.get('STL', 0) +
+        s.get('BLK', 0) -
+        0.75 * s.get('FGA', 0) -
+        0.375 * s.get('FTA', 0) -
+        s.get('TOV', 0) -
+        0.5 * s.get('PF', 0)
+    )
+
+
+def quick_gmscr(s):
+    """Game Score from a raw stat line."""
+    return (
+        s.get('PTS', 0) +
+        0.4 * s.get('FGM', 0) -
+        0.7 * s.get('FGA', 0) -
+        0.4 * (s.get('FTA', 0) - s.get('FTM', 0)) +
+        0.7 * s.get('OREB', 0) +
+        0.3 * s.get('DREB', 0) +
+        s.get('STL', 0) +
+        0.7 * s.get('AST', 0) +
+        0.7 * s.get('BLK', 0) -
+        0.4 * s.get('PF', 0) -
+        s.get('TOV', 0)
+    )
+
+
+def merge_periods(period_stats, player):
+    """One player's stat line summed over the PeriodStats quarters (None if absent)."""
+    combined = None
+    for players in period_stats.values():
+        if player not in players:
+            continue
+        combined = {} if combined is None else combined
+        for k, v in players[player].items():
+            if k in IDENTITY_KEYS:
+                combined[k] = v
+            elif isinstance(v, (int, float)) and not isinstance(v, bool):
+                combined[k] = combined.get(k, 0) + v
+    if combined is not None:
+        combined['FIC'] = quick_fic(combined)
+        combined['GmScr'] = quick_gmscr(combined)
+    return combined
+
+
+class PlayerGameIndex:
+    """Inverted index player name -> matches, plus each player's per-game stat line."""
+
+    def __init__(self, match_list):
+        self.by_player = {}   # name -> [match, ...] (data order)
+        self.lines = {}       # name -> [(match, stat line), ...] (data order)
+
+        for m in match_list:
+            names = {}
+            player_stats = m.get('PlayerStats', {}) or {}
+            for name, s in player_stats.items():
+                names.setdefault(name, s)
+                # get_daily_stats labels rows with the line's own "Player" field
+                alias = s.get('Player') if isinstance(s, dict) else None
+                if alias and alias != name:
+                    self._add_match(alias, m)
+            period_stats = m.get('PeriodStats', {}) or {}
+            period_names = {p for players in period_stats.values() for p in players}
+            for name in period_names - names.keys():
+                names[name] = merge_periods(period_stats, name)
+
+            for name, line in names.items():
+                self._add_match(name, m)
+                if line:
+                    self.lines.setdefault(name, []).append((m, line))
+
+    def _add_match(self, name, m):
+        played = self.by_player.setdefault(name, [])
+        if not played or played[-1] is not m:
+            played.append(m)
+
+    def players(self):
+        return list(self.by_player)
+
+    def matches(self, player, category=None):
+        """Matches the player appears in, optionally limited to one Category."""
+        played = self.by_player.get(player, [])
+        if category in (None, "All"):
+            return list(played)
+        return [m for m in played if m.get('Category') == category]
+
+    def game_log(self, player, player_team):
+        """Game-by-game rows (Date, Opponent, Result, ... GmScr) from the player's team's view."""
+        rows = []
+        for match, s in self.lines.get(player, []):
+            t1, t2 = match['Teams']['t1'], match['Teams']['t2']
+            opponent = t2 if t1 == player_team else t1
+
+            team_stats = match.get('TeamStats', {})
+            if 't1' in team_stats and 't2' in team_stats:
+                s1 = team_stats['t1'].get('PTS', 0)
+                s2 = team_stats['t2'].get('PTS', 0)
+                if t1 == player_team:
+                    result = "W" if s1 > s2 else "L"
+                    score = f"{s1}-{s2}"
+                else:
+                    result = "W" if s2 > s1 else "L"
+                    score = f"{s2}-{s1}"
+            else:
+                result = "-"
+                score = "-"
+
+            rows.append({
+                'Date': match.get('Metadata', {}).get('MatchDate', 'Unknown'),
+                'Opponent': opponent,
+                'Result': result,
+                'MIN': s.get('MIN_DEC', 0),
+                'Score': score,
+                'PTS': s.get('PTS', 0),
+                'REB': s.get('REB', 0),
+                'AST': s.get('AST', 0),
+                'FG': f"{int(s.get('FGM', 0))}/{int(s.get('FGA', 0))}",
+                '3P': f"{int(s.get('3PM', 0))}/{int(s.get('3PA', 0))}",
+                'FT': f"{int(s.get('FTM', 0))}/{int(s.get('FTA', 0))}",
+                'FIC': round(s.get('FIC', 0), 1),
+                'GmScr': round(s.get('GmScr', 0), 1)
+            })
+        return rows
+
+
+@st.cache_resource(show_spinner=False)
+def get_player_index(data_version, _match_list):
+    """Cached PlayerGameIndex for a data version (the match list itself is not hashed)."""
+    return PlayerGameIndex(_match_list)
@@ -0,0 +1,204 @@
+"""Player search index for the hub's player selectors.
+
+Built once per data version and category filter from the aggregated player
+frame. It keeps the sorted option lists (all players and per team), so
+selectors no longer sort the roster on every rerun, and answers ranked
+lookups by
+    - exact / prefix match on the full name or any word of it (bisect over a
+      sorted key list),
+    - transliteration-tolerant match ("Mohd"/"Mohammed", "Sharma"/"Sarma",
+      "Amritpal"/"Amrit Pal") through a phonetic key, and
+    - typo-tolerant match through a trigram inverted index (Dice similarity),
+plus team names, which bring up that team's players.
+"""
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+import numpy as np
+import streamlit as st
+
+DEFAULT_LIMIT = 20
+MIN_SIMILARITY = 0.35
+
+# Spelling variants that the same name takes when written in Latin script
+_ALIASES = {"mohd": "mohammed", "md": "mohammed", "muhammad": "mohammed", "mohammad": "mohammed",
+            "muhammed": "mohammed", "s": "singh"}
+_PHONETIC_RULES = [
+    ("ee", "i"), ("oo", "u"), ("ou", "u"), ("aa", "a"),
+    ("ph", "f"), ("sh", "s"), ("kh", "k"), ("gh", "g"), ("th", "t"), ("dh", "d"),
+    ("bh", "b"), ("ch", "c"), ("jh", "j"), ("ck", "k"),
+    ("w", "v"), ("z", "j"), ("q", "k"), ("x", "ks"), ("y", "i"),
+]
+_REPEATS = re.compile(r"(.)\1+")
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def base_name(label):
+    """Player name without a " (Team)" display suffix."""
+    label = str(label)
+    return label.split(" (")[0] if " (" in label else label
+
+
+def normalize(text):
+    """Lower case ASCII words: accents stripped, punctuation dropped."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def phonetic(text):
+    """Transliteration-insensitive key of a normalized string (word order and spaces kept)."""
+    words = []
+    for w in text.split():
+        w = _ALIASES.get(w, w)
+        for src, dst in _PHONETIC_RULES:
+            w = w.replace(src, dst)
+        words.append(_REPEATS.sub(r"\1", w))
+    return " ".join(words)
+
+
+def trigrams(key):
+    """Padded character trigrams of a key with spaces removed."""
+    s = f"  {key.replace(' ', '')} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class _PrefixList:
+    """Sorted (key -> player position) pairs; prefix and exact lookups are two bisects."""
+
+    def __init__(self, pairs):
+        pairs = sorted(set(pairs))
+        self.keys = [k for k, _ in pairs]
+        self.ids = np.array([i for _, i in pairs], dtype=np.int64)
+
+    def prefix(self, key):
+        lo = bisect_left(self.keys, key)
+        hi = bisect_left(self.keys, key + "\uffff", lo)
+        return self.ids[lo:hi]
+
+    def exact(self, key):
+        lo = bisect_left(self.keys, key)
+        hi = bisect_right(self.keys, key, lo)
+        return self.ids[lo:hi]
+
+
+class PlayerSearchIndex:
+    """Ranked player lookup over (player label, team) pairs."""
+
+    def __init__(self, players, teams=None):
+        """players: player labels (df['Player']); teams: matching team names (or None)."""
+        teams = list(teams) if teams is not None else [None] * len(players)
+        pairs = sorted({(str(p), t) for p, t in zip(players, teams) if p is not None and str(p) != "nan"},
+                       key=lambda x: (x[0], str(x[1])))
+
+        self.labels = sorted({p for p, _ in pairs})
+        pos = {p: i for i, p in enumerate(self.labels)}
+        self.by_team = defaultdict(list)   # team -> sorted labels
+        self.team_of = {}                   # label -> first team
+        for p, t in pairs:
+            if t is not None:
+                if not self.by_team[t] or self.by_team[t][-1] != p:
+                    self.by_team[t].append(p)
+                self.team_of.setdefault(p, t)
+        self.teams = sorted(self.by_team, key=str)
+        self.raw = {p: base_name(p) for p in self.labels}
+
+        self._norm = [normalize(self.raw[p]) for p in self.labels]
+        self._phon = [phonetic(n) for n in self._norm]
+        self._team_norm = [normalize(t) for t in self.teams]
+        self._team_ids = {t: np.array([pos[p] for p in self.by_team[t]], dtype=np.int64) for t in self.teams}
+
+        # Prefix lists: full name (with / without spaces), single words, and their phonetic forms
+        self._full = _PrefixList((k, i) for i, n in enumerate(self._norm) for k in (n, n.replace(" ", "")))
+        self._words = _PrefixList((w, i) for i, n in enumerate(self._norm) for w in n.split())
+        self._phon_full = _PrefixList((k, i) for i, ph in enumerate(self._phon) for k in (ph, ph.replace(" ", "")))
+        self._phon_words = _PrefixList((w, i) for i, ph in enumerate(self._phon) for w in ph.split())
+
+        # Trigram inverted index over the phonetic keys
+        grams = defaultdict(list)
+        counts = []
+        for i, ph in enumerate(self._phon):
+            g_set = trigrams(ph)
+            counts.append(len(g_set))
+            for g in g_set:
+                grams[g].append(i)
+        self._grams = {g: np.array(ids, dtype=np.int64) for g, ids in grams.items()}
+        self._gram_count = np.array(counts, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def options(self, team=None):
+        """Sorted player labels, optionally for one team ("All Teams" / None = everyone)."""
+        if team in (None, "All Teams"):
+            return list(self.labels)
+        return list(self.by_team.get(team, []))
+
+    def raw_name(self, label):
+        """Data lookup name for a selector label."""
+        return self.raw.get(label) or base_name(label)
+
+    def _scores(self, query):
+        """Score per player position (0 = no match)."""
+        scores = np.zeros(len(self.labels))
+        q_norm = normalize(query)
+        if not q_norm or not self.labels:
+            return scores
+        q_phon = phonetic(q_norm)
+
+        def bump(ids, score):
+            if len(ids):
+                scores[ids] = np.maximum(scores[ids], score)
+
+        # Typo tolerance: Dice similarity over shared phonetic trigrams
+        if len(q_phon.replace(" ", "")) >= 3:
+            q_grams = trigrams(q_phon)
+            postings = [self._grams[g] for g in q_grams if g in self._grams]
+            if postings:
+                shared = np.bincount(np.concatenate(postings), minlength=len(self.labels))
+                sim = 2 * shared / (len(q_grams) + self._gram_count)
+                hit = np.flatnonzero(sim >= MIN_SIMILARITY)
+                bump(hit, 60 * sim[hit])
+
+        # Team names bring up their rosters below direct name matches
+        if len(q_norm) >= 2:
+            for team, t_norm in zip(self.teams, self._team_norm):
+                if q_norm in t_norm:
+                    bump(self._team_ids[team], 40 if t_norm.startswith(q_norm) else 30)
+
+        for key in {q_phon, q_phon.replace(" ", "")}:
+            bump(self._phon_words.prefix(key), 70)
+            bump(self._phon_full.prefix(key), 70)
+            bump(self._phon_full.exact(key), 75)
+        bump(self._words.prefix(q_norm), 80)
+        for key in {q_norm, q_norm.replace(" ", "")}:
+            bump(self._full.prefix(key), 90)
+            bump(self._full.exact(key), 100)
+        return scores
+
+    def search(self, query, team=None, limit=DEFAULT_LIMIT):
+        """Ranked player labels for a query (best first), optionally within one team."""
+        scores = self._scores(query)
+        if team not in (None, "All Teams"):
+            allowed = np.zeros(len(scores), dtype=bool)
+            allowed[self._team_ids.get(team, np.empty(0, dtype=np.int64))] = True
+            scores[~allowed] = 0
+        hits = np.flatnonzero(scores)
+        # Labels are sorted, so ties fall back to alphabetical order via the position
+        order = hits[np.lexsort((hits, -scores[hits]))][:limit]
+        return [self.labels[i] for i in order]
+
+    def filter_options(self, query, team=None, limit=DEFAULT_LIMIT):
+        """Selector options for a search box: ranked hits, or every option when the query is empty."""
+        if not str(query or "").strip():
+            return self.options(team)
+        return self.search(query, team=team, limit=limit)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_player_search(data_version, category, _players_df):
+    """Cached PlayerSearchIndex for a data version and category filter (the frame is not hashed)."""
+    teams = _players_df["Team"] if "Team" in _players_df.columns else None
+    return PlayerSearchIndex(_players_df["Player"], teams)
@@ -0,0 +1,239 @@
+"""Power rankings with one snapshot per match day.
+
+Score per team (same formula the hub used):
+    base   = 60 * win% + 20 + 20 * clip(PD per game / 50, -1, 1)
+    bonus  = clip(10 * clip(NetRtg / 30, -1, 1) + 10 * (PIE - 50) / 20, -15, 15)
+             (teams with detailed stats only)
+Standings come from the group-stage schedule (src.core.standings) and the
+advanced stats from the team aggregates, joined in one merge on (team,
+division). There is a snapshot for every schedule Day with a result, from the
+games and detailed matches up to that day; Trend is the change in rank since
+the previous snapshot (positive = climbed).
+
+The hub reads the latest snapshot from a PowerRankings built once per data /
+schedule / manual-score version (get_power_rankings).
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import src.analytics as ant
+from src.core.match_index import normalize_gender, normalize_match_id, normalize_team
+from src.core.standings import rank_standings, schedule_games, standings_from_games
+from src.metrics_engine import MetricsEngine
+
+# Knockout rounds are left out of the group standings
+KNOCKOUT_GROUPS = ["PQF", "Quarterfinal", "Semifinal", "Final", "LKO Final", "QF", "SF"]
+# Schedule sub-groups that are not real groups
+EXCLUDED_GROUPS = ["A1", "B1", "A2", "B2"]
+
+# (Team, Division) -> Group, regardless of what the schedule says (A1 -> A, etc.)
+MASTER_GROUPS = [
+    ("Tamil Nadu", "Men", "A"), ("Karnataka", "Men", "A"), ("Services", "Men", "A"), ("Rajasthan", "Men", "A"), ("Gujarat", "Men", "A"),
+    ("Punjab", "Men", "B"), ("Indian Railways", "Men", "B"), ("Delhi", "Men", "B"), ("Uttar Pradesh", "Men", "B"), ("Chandigarh", "Men", "B"),
+    ("Kerala", "Men", "C"), ("Jammu & Kashmir", "Men", "C"), ("Jharkhand", "Men", "C"), ("West Bengal", "Men", "C"),
+    ("Madhya Pradesh", "Men", "D"), ("Goa", "Men", "D"), ("Maharashtra", "Men", "D"), ("Uttarakhand", "Men", "D"),
+    ("Haryana", "Men", "E"), ("Chhattisgarh", "Men", "E"), ("Meghalaya", "Men", "E"), ("Tripura", "Men", "E"),
+    ("Himachal Pradesh", "Men", "F"), ("Bihar", "Men", "F"), ("Mizoram", "Men", "F"), ("Telangana", "Men", "F"),
+    ("Andaman & Nicobar", "Men", "G"), ("Assam", "Men", "G"), ("Nagaland", "Men", "G"), ("Sikkim", "Men", "G"),
+    ("Andhra Pradesh", "Men", "H"), ("Arunachal Pradesh", "Men", "H"), ("Odisha", "Men", "H"), ("Puducherry", "Men", "H"),
+    # WOMEN
+    ("Indian Railways", "Women", "A"), ("Delhi", "Women", "A"), ("Chhattisgarh", "Women", "A"), ("Maharashtra", "Women", "A"), ("Karnataka", "Women", "A"),
+    ("Kerala", "Women", "B"), ("Tamil Nadu", "Women", "B"), ("Madhya Pradesh", "Women", "B"), ("Gujarat", "Women", "B"), ("West Bengal", "Women", "B"),
+    ("Punjab", "Women", "C"), ("Goa", "Women", "C"), ("Haryana", "Women", "C"), ("Tripura", "Women", "C"), ("Uttarakhand", "Women", "C"),
+    ("Uttar Pradesh", "Women", "D"), ("Chandigarh", "Women", "D"), ("Jammu & Kashmir", "Women", "D"), ("Telangana", "Women", "D"),
+    ("Rajasthan", "Women", "E"), ("Bihar", "Women", "E"), ("Jharkhand", "Women", "E"), ("Sikkim", "Women", "E"),
+    ("Himachal Pradesh", "Women", "F"), ("Arunachal Pradesh", "Women", "F"), ("Manipur", "Women", "F"), ("Puducherry", "Women", "F"),
+    ("Andhra Pradesh", "Women", "G"), ("Assam", "Women", "G"), ("Meghalaya", "Women", "G"), ("Odisha", "Women", "G"),
+]
+MASTER_MAP = {(t, g): grp for t, g, grp in MASTER_GROUPS}
+
+RANKING_COLS = ["Team", "Category", "Group", "Record", "GP", "W", "L", "Diff", "PD", "PF", "PA", "PTS",
+                "Score", "HasStats", "Trend"]
+
+
+def group_stage(schedule_df):
+    """Schedule rows of the group stage (knockout rounds dropped)."""
+    if schedule_df is None or schedule_df.empty or "Group" not in schedule_df.columns:
+        return schedule_df if schedule_df is not None else pd.DataFrame()
+    return schedule_df[~schedule_df["Group"].isin(KNOCKOUT_GROUPS)]
+
+
+def _adv_columns(df_adv):
+    """(team key, division key, NetRtg, PIE) per team from the team aggregates."""
+    cols = ["_key", "_gender", "NetRtg", "PIE"]
+    if df_adv is None or df_adv.empty or "Team" not in df_adv.columns:
+        return pd.DataFrame(columns=cols)
+    adv = pd.DataFrame({
+        "_key": df_adv["Team"].map(normalize_team),
+        "_gender": df_adv["Category"].map(normalize_gender) if "Category" in df_adv.columns else "",
+        # Missing metrics count as neutral (0 net rating, 50 PIE)
+        "NetRtg": pd.to_numeric(df_adv["NetRtg"], errors="coerce").fillna(0) if "NetRtg" in df_adv.columns else 0.0,
+        "PIE": pd.to_numeric(df_adv["PIE"], errors="coerce").fillna(50) if "PIE" in df_adv.columns else 50.0,
+    })
+    return adv.drop_duplicates(["_key", "_gender"])
+
+
+def score_standings(standings, df_adv, games):
+    """Ranked power-rankings table (RANKING_COLS + ranking columns) from standings and team aggregates."""
+    if standings.empty:
+        return pd.DataFrame(columns=RANKING_COLS + ["Rank"])
+
+    df = standings.copy()
+    df["_key"] = df["Team"].map(normalize_team)
+    df["_gender"] = df["Gender"].map(normalize_gender)
+    df = df.merge(_adv_columns(df_adv), on=["_key", "_gender"], how="left", indicator="_adv")
+    has_stats = (df["_adv"] == "both").to_numpy()
+
+    gp = df["GP"].to_numpy(dtype=float)
+    played = gp > 0
+    win_pct = np.divide(df["W"].to_numpy(dtype=float), gp, out=np.zeros_like(gp), where=played)
+    pd_norm = np.divide(df["PD"].to_numpy(dtype=float), gp, out=np.zeros_like(gp), where=played)
+    base_score = win_pct * 60 + 20 + np.clip(pd_norm / 50.0, -1.0, 1.0) * 20
+
+    net_score = np.clip(df["NetRtg"].to_numpy(dtype=float) / 30.0, -1.0, 1.0) * 10
+    pie_score = (df["PIE"].to_numpy(dtype=float) - 50) / 20 * 10
+    adv_bonus = np.where(has_stats, np.clip(net_score + pie_score, -15, 15), 0.0)
+
+    title = df["Team"].astype(str).str.title()
+    group = [MASTER_MAP.get((t, g), MASTER_MAP.get((raw, g), grp))
+             for t, raw, g, grp in zip(title, df["Team"], df["Gender"], df["Group"])]
+
+    out = pd.DataFrame({
+        "Team": title,
+        "Category": df["Gender"],
+        "Group": group,
+        "Record": df["W"].astype(str) + "-" + df["L"].astype(str),
+        "GP": df["GP"], "W": df["W"], "L": df["L"],
+        "Diff": df["PD"], "PD": df["PD"], "PF": df["PF"], "PA": df["PA"], "PTS": df["PTS"],
+        "Score": np.round(base_score + adv_bonus, 1),
+        "HasStats": has_stats,
+        "Trend": 0,
+    })
+
+    # Teams of the master map without a scheduled game yet
+    present = set(zip(out["Team"].str.strip().str.title(), out["Category"]))
+    missing = [(t, g, grp) for (t, g), grp in MASTER_MAP.items() if (t.strip().title(), g) not in present]
+    if missing:
+        zeros = pd.DataFrame([{"Team": t, "Category": g, "Group": grp, "Record": "0-0",
+                               "GP": 0, "W": 0, "L": 0, "Diff": 0, "PD": 0, "PF": 0, "PA": 0, "PTS": 0,
+                               "Score": 0.0, "HasStats": False, "Trend": 0} for t, g, grp in missing])
+        out = pd.concat([out, zeros], ignore_index=True)
+
+    out = out[~out["Team"].str.contains("W/O", regex=False) & ~out["Group"].isin(EXCLUDED_GROUPS)]
+    if out.empty:
+        return out.assign(Rank=[])
+
+    # Group ranks with tiebreakers (H2H among teams level on PTS, then group PD)
+    out = rank_standings(out.reset_index(drop=True), games, gender_col="Category")
+    out = out.sort_values(["Category", "Score"], ascending=[True, False])
+    out["Rank"] = out.groupby("Category").cumcount() + 1
+    return out
+
+
+def _match_days(schedule_df, match_index):
+    """MatchID -> schedule Day for detailed matches found on the schedule."""
+    days = {}
+    if schedule_df is None or schedule_df.empty or "Day" not in schedule_df.columns:
+        return days
+    for row in schedule_df[schedule_df["Team A"].notna()].to_dict("records"):
+        m = match_index.for_schedule_row(row)
+        if m is not None and pd.notna(row["Day"]):
+            days.setdefault(normalize_match_id(m.get("MatchID")), row["Day"])
+    return days
+
+
+class PowerRankings:
+    """
+    Power-rankings snapshots per schedule Day, built once per data version.
+    Snapshots are computed on first use and kept; the latest one (what the
+    hub shows) only needs itself and the day before for its Trend.
+    """
+
+    def __init__(self, schedule_df, manual_scores, match_index, version=None):
+        self.version = version
+        sched = schedule_df if schedule_df is not None else pd.DataFrame()
+        group_sched = group_stage(sched)
+        self._games = schedule_games(group_sched, manual_scores, match_index)
+        # Team aggregates need the player-game frame; it is built once and sliced per day
+        match_list = match_index.matches
+        self._daily = ant.get_daily_stats(match_list, period="Full Game") if match_list else pd.DataFrame()
+        self._match_days = _match_days(sched, match_index)
+        self._ranked = {}   # day -> ranked table without Trend
+        self._snapshots = {}
+
+        self.days = []
+        self._game_days = None
+        if "Day" in group_sched.columns and not self._games.empty:
+            # schedule_games keeps one row per schedule row (in order), so Day lines up with it
+            self._game_days = group_sched.loc[group_sched["Team A"].notna(), "Day"].to_numpy()
+            scored = (self._games["S1"].notna() & self._games["S2"].notna()).to_numpy()
+            self.days = sorted({d for d, s in zip(self._game_days, scored) if s and pd.notna(d)})
+        if not self.days:
+            # No Day column or nothing played yet: a single snapshot over everything
+            self.days = [None]
+
+    def _ranked_table(self, day):
+        """Ranked table from the games and detailed matches up to `day` (None = everything)."""
+        if day in self._ranked:
+            return self._ranked[day]
+        games, daily = self._games, self._daily
+        if day is not None:
+            games = games[(self._game_days <= day) | pd.isna(self._game_days)]
+            if day != self.days[-1] and not daily.empty:
+                # Detailed matches not on the schedule only count in the latest snapshot
+                ids = {mid for mid, d in self._match_days.items() if d <= day}
+                daily = daily[daily["MatchID"].astype(str).isin(ids)]
+        table = score_standings(standings_from_games(games), MetricsEngine.aggregate_teams(daily), games)
+        self._ranked[day] = table
+        return table
+
+    def snapshot(self, day):
+        """Rankings after `day` with Trend = previous day's rank - current rank (0 if new)."""
+        if day in self._snapshots:
+            return self._snapshots[day]
+        snap = self._ranked_table(day).copy()
+        pos = self.days.index(day)
+        if pos > 0 and not snap.empty:
+            prev = self._ranked_table(self.days[pos - 1])
+            before = prev.set_index(["Team", "Category"])["Rank"]
+            old_rank = before.reindex(pd.MultiIndex.from_frame(snap[["Team", "Category"]])).to_numpy(dtype=float)
+            snap["Trend"] = np.where(np.isnan(old_rank), 0, np.nan_to_num(old_rank) - snap["Rank"]).astype(int)
+        self._snapshots[day] = snap
+        return snap
+
+    def latest(self):
+        """The current rankings table (the last snapshot)."""
+        return self.snapshot(self.days[-1])
+
+    def history(self, team=None, category=None):
+        """Long table Day / Team / Category / Rank / Score / Trend over every snapshot."""
+        cols = ["Day", "Team", "Category", "Rank", "Score", "Trend"]
+        frames = [self.snapshot(day).assign(Day=day)[cols] for day in self.days]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=cols)
+        hist = pd.concat(frames, ignore_index=True)
+        if team is not None:
+            hist = hist[hist["Team"] == team]
+        if category is not None:
+            hist = hist[hist["Category"] == category]
+        return hist
+
+
+def inputs_token(schedule_df, manual_scores):
+    """Short hash of the schedule rows and manual scores (the non-match inputs of the rankings)."""
+    h = hashlib.md5()
+    if schedule_df is not None and not schedule_df.empty:
+        h.update(pd.util.hash_pandas_object(schedule_df, index=False).to_numpy().tobytes())
+    h.update(json.dumps(manual_scores or {}, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()[:12]
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_power_rankings(data_version, inputs_version, _schedule_df, _manual_scores, _match_index):
+    """Cached PowerRankings for a data version and schedule / manual-score version."""
+    return PowerRankings(_schedule_df, _manual_scores, _match_index, version=(data_version, inputs_version))
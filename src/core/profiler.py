@@ -0,0 +1,261 @@
+"""Opt-in per-rerun profiling for the Streamlit hub.
+
+Enable the timing panel with the ?profile=1 query parameter or the
+HUB_PROFILE=1 environment variable. When enabled, instrument() wraps loader /
+MetricsEngine / analytics / renderer functions with timers and render_panel()
+shows the per-rerun breakdown.
+
+Anything with a cost beyond the rerun needs the server-side env var:
+tracemalloc peaks (process-wide) are only tracked with HUB_PROFILE set, and
+Chrome trace-event JSON files (open in Perfetto, speedscope or
+chrome://tracing for a flame chart) are only written with HUB_PROFILE=trace,
+or HUB_PROFILE set plus ?profile=trace. Only the newest TRACE_KEEP trace
+files are kept.
+
+When profiling is off the wrappers are plain pass-throughs.
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+ENV_FLAG = "HUB_PROFILE"
+TRACE_DIR = os.environ.get("HUB_PROFILE_DIR", "profiles")
+TRACE_KEEP = int(os.environ.get("HUB_PROFILE_KEEP", "20"))
+TRACE_PREFIX = "hub_"
+
+_local = threading.local()
+
+
+def _query_flag():
+    try:
+        return str(st.query_params.get("profile", "")).lower()
+    except Exception:
+        return ""
+
+
+def _env_flag():
+    env = os.environ.get(ENV_FLAG, "").lower()
+    return "" if env in ("0", "false", "no") else env
+
+
+def profiling_enabled():
+    """True when HUB_PROFILE is set (not 0/false) or ?profile=... is in the URL."""
+    return bool(_env_flag()) or _query_flag() not in ("", "0", "false")
+
+
+def memory_tracking_enabled():
+    """tracemalloc is process-wide, so only the server env var turns it on."""
+    return bool(_env_flag())
+
+
+def trace_requested():
+    """Trace files need HUB_PROFILE=trace, or HUB_PROFILE set plus ?profile=trace."""
+    env = _env_flag()
+    return env == "trace" or (bool(env) and _query_flag() == "trace")
+
+
+class RerunProfile:
+    """Timing / memory records of one script rerun."""
+
+    def __init__(self, label="rerun", track_memory=False):
+        self.label = label
+        self.track_memory = track_memory
+        self.events = []   # {"name", "start", "dur", "peak_mb", "depth"}
+        self._stack = []
+        self._t0 = time.perf_counter()
+        self._own_tracemalloc = track_memory and not tracemalloc.is_tracing()
+        if self._own_tracemalloc:
+            tracemalloc.start()
+
+    def _mem(self):
+        return tracemalloc.get_traced_memory() if self.track_memory and tracemalloc.is_tracing() else (0, 0)
+
+    def begin(self, name):
+        cur, peak = self._mem()
+        if self._stack:
+            parent = self._stack[-1]
+            parent["max_mem"] = max(parent["max_mem"], peak)
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._stack.append({"name": name, "t": time.perf_counter(), "mem0": cur, "max_mem": cur})
+
+    def end(self):
+        if not self._stack:
+            return
+        frame = self._stack.pop()
+        _, peak = self._mem()
+        frame["max_mem"] = max(frame["max_mem"], peak)
+        if self._stack:
+            self._stack[-1]["max_mem"] = max(self._stack[-1]["max_mem"], frame["max_mem"])
+        self.events.append({
+            "name": frame["name"],
+            "start": frame["t"] - self._t0,
+            "dur": time.perf_counter() - frame["t"],
+            "peak_mb": (frame["max_mem"] - frame["mem0"]) / 1e6,
+            "depth": len(self._stack),
+        })
+
+    @contextmanager
+    def stage(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def finish(self):
+        """Close open stages and stop tracemalloc if this profile started it."""
+        while self._stack:
+            self.end()
+        self.total = time.perf_counter() - self._t0
+        if self._own_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def summary(self):
+        """Per-name totals: calls, total/max ms, peak MB (sorted by total time)."""
+        if not self.events:
+            return pd.DataFrame(columns=["Stage", "Calls", "Total ms", "Max ms", "Peak MB"])
+        df = pd.DataFrame(self.events)
+        out = df.groupby("name").agg(Calls=("dur", "size"), total=("dur", "sum"),
+                                     longest=("dur", "max"), peak=("peak_mb", "max"))
+        out = out.sort_values("total", ascending=False).reset_index()
+        out["total"] = (out["total"] * 1000).round(1)
+        out["longest"] = (out["longest"] * 1000).round(1)
+        out["peak"] = out["peak"].round(2)
+        if not self.track_memory:
+            out = out.drop(columns="peak")
+        return out.rename(columns={"name": "Stage", "total": "Total ms", "longest": "Max ms", "peak": "Peak MB"})
+
+    def trace_events(self):
+        """Chrome trace-event ("X" complete events, microseconds)."""
+        return {
+            "traceEvents": [{
+                "name": e["name"], "ph": "X", "pid": 1, "tid": 1,
+                "ts": round(e["start"] * 1e6, 1), "dur": round(e["dur"] * 1e6, 1),
+                "args": {"peak_mb": round(e["peak_mb"], 3)},
+            } for e in sorted(self.events, key=lambda e: (e["start"], e["depth"]))],
+            "displayTimeUnit": "ms",
+            "otherData": {"label": self.label},
+        }
+
+
+def current():
+    """The active RerunProfile for this script thread, or None."""
+    return getattr(_local, "profile", None)
+
+
+def start_rerun(label="rerun"):
+    """Begin profiling this rerun if enabled; returns the profile or None."""
+    _local.profile = RerunProfile(label, track_memory=memory_tracking_enabled()) if profiling_enabled() else None
+    return _local.profile
+
+
+@contextmanager
+def stage(name):
+    """Time a block when profiling is active (no-op otherwise)."""
+    prof = current()
+    if prof is None:
+        yield
+        return
+    with prof.stage(name):
+        yield
+
+
+def begin(name):
+    prof = current()
+    if prof is not None:
+        prof.begin(name)
+
+
+def end():
+    prof = current()
+    if prof is not None:
+        prof.end()
+
+
+def _wrap(func, name):
+    if getattr(func, "__profiled__", False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        prof = current()
+        if prof is None:
+            return func(*args, **kwargs)
+        with prof.stage(name):
+            return func(*args, **kwargs)
+
+    wrapper.__profiled__ = True
+    # Keep st.cache_data helpers (e.g. .clear()) reachable through the wrapper
+    for attr in ("clear",):
+        if hasattr(func, attr):
+            setattr(wrapper, attr, getattr(func, attr))
+    return wrapper
+
+
+def instrument(target, names=None, prefix=None):
+    """
+    Wrap public functions of a module (or static methods of a class) with timers.
+    Safe to call on every rerun: already-wrapped functions are left alone.
+    """
+    prefix = prefix or getattr(target, "__name__", str(target)).split(".")[-1]
+    is_class = inspect.isclass(target)
+    if names is None:
+        names = [n for n in vars(target) if not n.startswith("_")]
+
+    for n in names:
+        raw = vars(target).get(n)
+        if raw is None:
+            continue
+        if is_class:
+            if not isinstance(raw, staticmethod):
+                continue
+            fn = raw.__func__
+            if not getattr(fn, "__profiled__", False):
+                setattr(target, n, staticmethod(_wrap(fn, f"{prefix}.{n}")))
+        elif callable(raw) and not inspect.isclass(raw) and getattr(raw, "__module__", None) == target.__name__:
+            setattr(target, n, _wrap(raw, f"{prefix}.{n}"))
+
+
+def prune_traces(out_dir=TRACE_DIR, keep=TRACE_KEEP):
+    """Delete all but the newest `keep` trace files in out_dir."""
+    try:
+        names = sorted(n for n in os.listdir(out_dir) if n.startswith(TRACE_PREFIX) and n.endswith(".json"))
+    except OSError:
+        return
+    for name in names[:max(len(names) - keep, 0)]:
+        try:
+            os.remove(os.path.join(out_dir, name))
+        except OSError:
+            pass
+
+
+def write_trace(prof, out_dir=TRACE_DIR, keep=TRACE_KEEP):
+    """Write the rerun as a Chrome trace JSON (keeping the newest `keep` files); returns the path."""
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{TRACE_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(prof.trace_events(), f)
+    prune_traces(out_dir, keep)
+    return path
+
+
+def render_panel(prof):
+    """Finish the rerun profile and show the breakdown (plus trace file if requested)."""
+    if prof is None:
+        return
+    prof.finish()
+    trace_path = write_trace(prof) if trace_requested() else None
+    with st.expander(f"⏱ Profile: {prof.total * 1000:.0f} ms this rerun", expanded=True):
+        st.dataframe(prof.summary(), hide_index=True, use_container_width=True)
+        if trace_path:
+            st.caption(f"Trace written to {trace_path} (open in Perfetto / speedscope).")
@@ -0,0 +1,147 @@
+"""Compact dtypes for the player-game frame.
+
+get_daily_stats() builds one row per player per match. Left to pandas, every
+dimension (Player, Team, Category, Match, Opponent, Date, MatchID, No, and
+the "MM:SS" Mins text) is an object column of Python strings and every stat
+is float64. compact_frame() stores
+    - dimensions as categoricals (string categories),
+    - counting stats as int16 / int32 when every value is a whole number, and
+    - the remaining numeric columns (rates, composites) as float32, except the
+      decimal minutes, which stay float64: they are summed into tournament
+      totals, where float32 error moves "MM:15" sums off the .x5 rounding
+      boundary (23.25 -> 23.2),
+which makes the frame several times smaller and lets groupbys on the
+dimensions work on category codes. Groupbys over categorical keys must pass
+observed=True (otherwise every category combination becomes a group).
+
+Memory report for a data file:
+    python -m src.core.schema [data.json]
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+DIMENSION_COLS = ["Player", "Team", "Category", "Match", "Opponent", "Date", "MatchID", "No", "Jersey", "Period",
+                  "Mins"]  # "MM:SS" minutes text: few distinct values, never summed
+
+COUNT_STATS = ["PTS", "FGM", "FGA", "2PM", "2PA", "3PM", "3PA", "FTM", "FTA", "OREB", "DREB", "REB",
+               "AST", "STL", "BLK", "TOV", "PF", "FD", "BLKR", "2CP", "+/-", "GP", "OffPTS", "DefPTS"]
+# Team / opponent totals merged onto player rows count the same things
+COUNT_PREFIXES = ("Tm", "Opp")
+# Summed decimal minutes, kept float64 (see module docstring)
+EXACT_FLOAT_COLS = ["MIN_DEC", "MIN_CALC", "MIN"]
+
+
+def is_count_col(col):
+    if col in COUNT_STATS:
+        return True
+    return any(col.startswith(p) and col[len(p):] in COUNT_STATS for p in COUNT_PREFIXES)
+
+
+def _int_dtype(values):
+    """Smallest of int16 / int32 holding the whole-number values, or None."""
+    if len(values) == 0 or np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+        return None
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return None
+
+
+def as_category(series):
+    """Categorical with string categories (missing values stay missing)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cats = series.cat.categories
+        if cats.dtype == object and all(isinstance(c, str) for c in cats):
+            return series
+        return series.cat.rename_categories([str(c) for c in cats])
+    return series.where(series.isna(), series.astype(str)).astype("category")
+
+
+def compact_frame(df, dimensions=None):
+    """Copy of df with categorical dimensions, int16/int32 counts and float32 floats (minutes stay float64)."""
+    if df.empty:
+        return df
+    dimensions = DIMENSION_COLS if dimensions is None else dimensions
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in dimensions and (s.dtype == object or isinstance(s.dtype, pd.CategoricalDtype)):
+            s = as_category(s)
+        elif pd.api.types.is_bool_dtype(s) or not pd.api.types.is_numeric_dtype(s):
+            pass
+        elif is_count_col(col):
+            values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+            dtype = _int_dtype(values)
+            s = s.astype(dtype) if dtype is not None else s.astype(np.float32)
+        elif pd.api.types.is_float_dtype(s) and s.dtype != np.float32 and col not in EXACT_FLOAT_COLS:
+            s = s.astype(np.float32)
+        out[col] = s
+    compact = pd.DataFrame(out, index=df.index)
+    compact.attrs = df.attrs
+    return compact
+
+
+def plain_frame(df):
+    """Categorical columns back to object (for small result frames handed to display code)."""
+    cat_cols = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    if not cat_cols:
+        return df
+    df = df.copy()
+    for col in cat_cols:
+        df[col] = df[col].astype(object)
+    return df
+
+
+def frame_memory(df):
+    """Deep memory in bytes per column."""
+    return df.memory_usage(deep=True, index=False)
+
+
+def memory_report(before, after):
+    """
+    Per-column memory (MB) and dtypes before and after compaction, with a TOTAL row.
+    The ratio column is before / after.
+    """
+    mb_before = frame_memory(before) / 1e6
+    mb_after = frame_memory(after).reindex(mb_before.index) / 1e6
+    report = pd.DataFrame({
+        "Column": mb_before.index,
+        "Dtype Before": [str(before[c].dtype) for c in mb_before.index],
+        "Dtype After": [str(after[c].dtype) if c in after.columns else "-" for c in mb_before.index],
+        "MB Before": mb_before.to_numpy(),
+        "MB After": mb_after.to_numpy(),
+    })
+    total = pd.DataFrame([{"Column": "TOTAL", "Dtype Before": "", "Dtype After": "",
+                           "MB Before": mb_before.sum(), "MB After": mb_after.sum()}])
+    report = pd.concat([report.sort_values("MB Before", ascending=False), total], ignore_index=True)
+    report["Ratio"] = (report["MB Before"] / report["MB After"].replace(0, np.nan)).round(2)
+    report[["MB Before", "MB After"]] = report[["MB Before", "MB After"]].round(3)
+    return report
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    import src.analytics as ant
+    from src.core.columnar_store import unwrap_matches
+
+    path = argv[0] if argv else os.path.join("data", "processed", "data.json")
+    with open(path, "r", encoding="utf-8-sig") as f:
+        matches = unwrap_matches(json.load(f))
+    wide = ant.get_daily_stats(matches, period="Full Game", compact=False)
+    compact = compact_frame(wide)
+    report = memory_report(wide, compact)
+    with pd.option_context("display.max_rows", None, "display.width", 120):
+        print(report.to_string(index=False))
+    total = report.iloc[-1]
+    print(f"\n{len(wide)} player-game rows: {total['MB Before']:.2f} MB -> {total['MB After']:.2f} MB "
+          f"(x{total['Ratio']:.1f} smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Stage classification index: MatchID -> stage, round, group and category.
+
+The hub used to classify matches in every tab that had a Stage filter, each
+with its own loop over raw_data and its own rules (game_categorization.json in
+Tournament Stats, the schedule's Group column in Top Performances). The index
+resolves every match once per data / input version, in this order:
+    1. game_categorization.json "league_stage" / "knockouts" lists
+       (plus the IDs the hub always treated as league games)
+    2. the schedule row with the same Genius Match ID: a group letter is
+       "Group Stage", a knockout or placing round is "Knockouts"
+    3. otherwise unclassified (the match only counts towards "All Games")
+Round and Group come from the schedule row when there is one.
+
+Stage filters are then a boolean mask over a MatchID column (columnar match
+table, daily stats) or a set lookup over a match list.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.core.match_index import normalize_match_id
+
+STAGES = ["All Games", "Group Stage", "Knockouts"]
+# Schedule rounds that are knockout games; "Placing ..." rounds are knockouts too
+KNOCKOUT_ROUNDS = ["Quarterfinal", "Semifinal", "Final", "PQF", "QF", "SF"]
+# Rounds that belong to neither stage
+UNSTAGED_ROUNDS = ["LKO Final"]
+# Categorization gaps the hub has always treated as league games (e.g. Services-Karnataka)
+EXTRA_LEAGUE_IDS = ["31", "2797633"]
+COLUMNS = ["MatchID", "Stage", "Round", "Group", "Category"]
+
+
+def round_stage(round_name):
+    """Stage of a schedule Group/round value, or None when it belongs to neither."""
+    r = str(round_name).strip()
+    if not r or r.lower() == "nan" or r in UNSTAGED_ROUNDS:
+        return None
+    if r in KNOCKOUT_ROUNDS or r.startswith("Placing"):
+        return "Knockouts"
+    return "Group Stage"
+
+
+def _schedule_rounds(schedule_df):
+    """{normalized Genius Match ID: schedule Group value}."""
+    if schedule_df is None or schedule_df.empty or "Genius Match ID" not in schedule_df.columns:
+        return {}
+    ids = schedule_df["Genius Match ID"].map(normalize_match_id)
+    groups = schedule_df["Group"] if "Group" in schedule_df.columns else pd.Series("", index=schedule_df.index)
+    rounds = {}
+    for mid, grp in zip(ids, groups):
+        if mid is not None:
+            rounds.setdefault(mid, "" if pd.isna(grp) else str(grp).strip())
+    return rounds
+
+
+class StageIndex:
+    """Stage / round / group / category per MatchID, built once per data version."""
+
+    def __init__(self, match_list, cat_map=None, schedule_df=None):
+        cat_map = cat_map or {}
+        league_ids = {str(m) for m in cat_map.get("league_stage", [])} | set(EXTRA_LEAGUE_IDS)
+        knockout_ids = {str(m) for m in cat_map.get("knockouts", [])}
+        rounds = _schedule_rounds(schedule_df)
+
+        rows = []
+        for m in match_list:
+            mid = normalize_match_id(m.get("MatchID"))
+            if mid is None:
+                continue
+            rnd = rounds.get(mid)
+            if mid in league_ids:
+                stage = "Group Stage"
+            elif mid in knockout_ids:
+                stage = "Knockouts"
+            else:
+                stage = round_stage(rnd) if rnd is not None else None
+            group = rnd if rnd and len(rnd) == 1 and rnd.isalpha() else None
+            category = cat_map.get(mid) if cat_map.get(mid) in ("Men", "Women") else m.get("Category")
+            rows.append((mid, stage, rnd or None, group, category))
+
+        self.frame = pd.DataFrame(rows, columns=COLUMNS).drop_duplicates("MatchID").set_index("MatchID")
+        stages = self.frame["Stage"]
+        self._ids = {stage: set(stages.index[stages.eq(stage)]) for stage in STAGES[1:]}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def stage_of(self, match_id):
+        """"Group Stage" / "Knockouts" / None for a MatchID (str/int/float accepted)."""
+        mid = normalize_match_id(match_id)
+        return self.frame["Stage"].get(mid) if mid is not None else None
+
+    def stage_map(self):
+        """{MatchID: stage} for the classified matches (LeaderboardIndex input)."""
+        return self.frame["Stage"].dropna().to_dict()
+
+    def ids(self, stage):
+        """MatchIDs in a stage ("All Games" = every indexed match)."""
+        if stage == "All Games":
+            return set(self.frame.index)
+        return self._ids.get(stage, set())
+
+    def has(self, stage):
+        """True when at least one match is in the stage."""
+        return bool(self.ids(stage))
+
+    def mask(self, match_ids, stage):
+        """Boolean mask over a MatchID column (columnar match table, daily stats)."""
+        match_ids = pd.Series(match_ids)
+        if stage == "All Games":
+            return np.ones(len(match_ids), dtype=bool)
+        return match_ids.map(normalize_match_id).isin(self.ids(stage)).to_numpy()
+
+    def filter(self, match_list, stage):
+        """Matches of a match list that are in the stage."""
+        if stage == "All Games":
+            return list(match_list)
+        keep = self.mask([m.get("MatchID") for m in match_list], stage)
+        return [m for m, k in zip(match_list, keep) if k]
+
+
+def stage_token(cat_map, schedule_df):
+    """Short hash of the categorization map and the schedule's ID / Group columns."""
+    h = hashlib.md5(json.dumps(cat_map or {}, sort_keys=True, default=str).encode("utf-8"))
+    if schedule_df is not None and not schedule_df.empty:
+        cols = [c for c in ("Genius Match ID", "Group") if c in schedule_df.columns]
+        h.update(pd.util.hash_pandas_object(schedule_df[cols].astype(str), index=False).to_numpy().tobytes())
+    return h.hexdigest()[:12]
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_stage_index(data_version, inputs_version, _match_list, _cat_map=None, _schedule_df=None):
+    """Cached StageIndex for a data version and categorization / schedule version."""
+    return StageIndex(_match_list, _cat_map, _schedule_df)
@@ -0,0 +1,250 @@
+"""Vectorized group standings from the schedule, detailed-stat scores and manual scores.
+
+Pipeline:
+    schedule_games()   schedule rows + resolved scores (one row per scored game)
+    compute_standings() GP/W/L/PF/PA/PD/PTS per (Team, Gender) via groupby
+    rank_standings()   group ranks with FIBA-style tiebreakers
+"""
+import numpy as np
+import pandas as pd
+
+from src.core.match_index import normalize_match_id
+
+# Classification points: a loss (played) still earns 1
+WIN_PTS = 2
+LOSS_PTS = 1
+
+STANDING_COLS = ["Team", "Gender", "Group", "GP", "W", "L", "PF", "PA", "PD", "PTS"]
+
+# Order applied inside a group once PTS are level
+TIEBREAKERS = ["PTS", "H2H_W", "H2H_PD", "GRP_PD", "PD", "PF"]
+
+
+def _norm_team(s):
+    return s.astype(str).str.strip().str.upper()
+
+
+def _norm_gender(s):
+    return s.astype(str).str.strip().str.title()
+
+
+def _pair_keys(t1, t2, gender):
+    """Order-independent "A|B|Gender" keys, matching src.core.match_index.pair_key."""
+    lo = np.where(t1 <= t2, t1, t2)
+    hi = np.where(t1 <= t2, t2, t1)
+    return pd.Series(lo, index=t1.index) + "|" + pd.Series(hi, index=t1.index) + "|" + gender
+
+
+def match_score_frame(match_index):
+    """One row per detailed-stats match: MatchID, PairKey, T1, T2, S1, S2."""
+    cached = getattr(match_index, "_score_frame", None)
+    if cached is not None:
+        return cached
+
+    recs = []
+    for m in match_index.matches:
+        teams = m.get("Teams", {})
+        ts = m.get("TeamStats", {})
+        recs.append({
+            "MatchID": normalize_match_id(m.get("MatchID")),
+            "T1": teams.get("t1"),
+            "T2": teams.get("t2"),
+            "MGender": m.get("Category", ""),
+            "S1": ts.get("t1", {}).get("PTS"),
+            "S2": ts.get("t2", {}).get("PTS"),
+        })
+    df = pd.DataFrame(recs, columns=["MatchID", "T1", "T2", "MGender", "S1", "S2"])
+    df["T1"] = _norm_team(df["T1"])
+    df["T2"] = _norm_team(df["T2"])
+    df["PairKey"] = _pair_keys(df["T1"], df["T2"], _norm_gender(df["MGender"]))
+    df["S1"] = pd.to_numeric(df["S1"], errors="coerce")
+    df["S2"] = pd.to_numeric(df["S2"], errors="coerce")
+    df = df.drop(columns=["MGender"])
+
+    match_index._score_frame = df
+    return df
+
+
+def manual_score_frame(manual_scores):
+    """manual_scores.json as a frame indexed by its "T1_VS_T2_GENDER" key."""
+    entries = {k: v for k, v in (manual_scores or {}).items() if v}
+    if not entries:
+        return pd.DataFrame(columns=["s1", "s2"], dtype=float)
+    df = pd.DataFrame.from_dict(entries, orient="index")
+    for col in ("s1", "s2"):
+        df[col] = pd.to_numeric(df[col], errors="coerce") if col in df.columns else np.nan
+    return df[["s1", "s2"]]
+
+
+def _oriented(sched, found):
+    """Detailed scores aligned to the schedule's Team A/Team B order."""
+    swap = (found["T1"] == sched["Team2"]) & (found["T2"] == sched["Team1"])
+    s1 = found["S1"].where(~swap, found["S2"])
+    s2 = found["S2"].where(~swap, found["S1"])
+    return s1, s2
+
+
+def schedule_games(schedule_df, manual_scores, match_index):
+    """
+    Normalized schedule rows with resolved scores.
+
+    Score precedence per row: detailed stats by Genius Match ID, detailed stats by
+    (team pair, gender), manual score (forward key), manual score (reverse key).
+    Returns every schedule row with Team1/Team2/Gender/Group/S1/S2; S1/S2 are NaN
+    for unplayed games.
+    """
+    cols = ["MatchKey", "Team1", "Team2", "Gender", "Group", "S1", "S2"]
+    if schedule_df is None or schedule_df.empty:
+        return pd.DataFrame(columns=cols)
+
+    sch = schedule_df[schedule_df["Team A"].notna()]
+    games = pd.DataFrame({
+        "MatchKey": sch["Match ID"] if "Match ID" in sch.columns else pd.Series(np.nan, index=sch.index),
+        "Team1": _norm_team(sch["Team A"]),
+        "Team2": _norm_team(sch["Team B"]),
+        "Gender": _norm_gender(sch["Gender"]),
+        "Group": sch["Group"] if "Group" in sch.columns else pd.Series(np.nan, index=sch.index),
+    }, index=sch.index)
+    games["S1"] = np.nan
+    games["S2"] = np.nan
+    if games.empty:
+        return games.reset_index(drop=True)
+
+    # A/B. Detailed stats: Genius ID first, then team pair
+    scores = match_score_frame(match_index)
+    if not scores.empty:
+        if "Genius Match ID" in sch.columns:
+            by_id = scores.dropna(subset=["MatchID"]).drop_duplicates("MatchID").set_index("MatchID")
+            gids = sch["Genius Match ID"].map(normalize_match_id)
+            found = by_id.reindex(gids.values).set_axis(games.index)
+            s1, s2 = _oriented(games, found)
+            games["S1"], games["S2"] = s1, s2
+
+        by_pair = scores.drop_duplicates("PairKey").set_index("PairKey")
+        keys = _pair_keys(games["Team1"], games["Team2"], games["Gender"])
+        found = by_pair.reindex(keys.values).set_axis(games.index)
+        s1, s2 = _oriented(games, found)
+        missing = games["S1"].isna() | games["S2"].isna()
+        games.loc[missing, "S1"] = s1[missing]
+        games.loc[missing, "S2"] = s2[missing]
+
+    # C/D. Manual scores (keys use upper-case gender)
+    manual = manual_score_frame(manual_scores)
+    if not manual.empty:
+        g_upper = games["Gender"].str.upper()
+        fwd = manual.reindex((games["Team1"] + "_VS_" + games["Team2"] + "_" + g_upper).values).set_axis(games.index)
+        rev = manual.reindex((games["Team2"] + "_VS_" + games["Team1"] + "_" + g_upper).values).set_axis(games.index)
+        for col, f_col, r_col in (("S1", "s1", "s2"), ("S2", "s2", "s1")):
+            games[col] = games[col].fillna(fwd[f_col].where(fwd[["s1", "s2"]].notna().all(axis=1)))
+            games[col] = games[col].fillna(rev[r_col].where(rev[["s1", "s2"]].notna().all(axis=1)))
+
+    return games.reset_index(drop=True)[cols]
+
+
+def scored_games(games):
+    """Played games only, one per schedule Match ID (unkeyed rows are kept as-is)."""
+    played = games[games["S1"].notna() & games["S2"].notna()]
+    dedupe_key = played["MatchKey"].astype(object).where(played["MatchKey"].notna(),
+                                                         "__row_" + played.index.astype(str))
+    return played[~dedupe_key.duplicated()]
+
+
+def team_results(games):
+    """Long format: one row per team per scored game (Team, Opp, Gender, PF, PA, Won)."""
+    played = scored_games(games)
+    home = pd.DataFrame({"Team": played["Team1"], "Opp": played["Team2"], "Gender": played["Gender"],
+                         "PF": played["S1"], "PA": played["S2"]})
+    away = pd.DataFrame({"Team": played["Team2"], "Opp": played["Team1"], "Gender": played["Gender"],
+                         "PF": played["S2"], "PA": played["S1"]})
+    long = pd.concat([home, away], ignore_index=True)
+    long["Won"] = long["PF"] > long["PA"]
+    return long
+
+
+def schedule_teams(games):
+    """Every (Team, Gender) on the schedule, in first-appearance order, with its first Group."""
+    n = len(games)
+    both = pd.DataFrame({
+        "Team": np.concatenate([games["Team1"].values, games["Team2"].values]),
+        "Gender": np.concatenate([games["Gender"].values, games["Gender"].values]),
+        "Group": np.concatenate([games["Group"].values, games["Group"].values]),
+        "_order": np.concatenate([np.arange(n) * 2, np.arange(n) * 2 + 1]),
+    })
+    both = both.sort_values("_order", kind="stable")
+    return both.drop_duplicates(["Team", "Gender"]).drop(columns="_order").reset_index(drop=True)
+
+
+def standings_from_games(games):
+    """GP/W/L/PF/PA/PD/PTS for every scheduled team from a schedule_games() frame."""
+    if games.empty:
+        return pd.DataFrame(columns=STANDING_COLS)
+
+    long = team_results(games)
+    agg = long.groupby(["Team", "Gender"], sort=False).agg(
+        GP=("Won", "size"), W=("Won", "sum"), PF=("PF", "sum"), PA=("PA", "sum"))
+
+    out = schedule_teams(games).merge(agg.reset_index(), on=["Team", "Gender"], how="left")
+    for col in ["GP", "W", "PF", "PA"]:
+        out[col] = out[col].fillna(0)
+    out["L"] = out["GP"] - out["W"]
+    out["PD"] = out["PF"] - out["PA"]
+    out["PTS"] = out["W"] * WIN_PTS + out["L"] * LOSS_PTS
+    for col in ["GP", "W", "L", "PTS"]:
+        out[col] = out[col].astype(int)
+    for col in ["PF", "PA", "PD"]:
+        if (out[col] % 1 == 0).all():
+            out[col] = out[col].astype(int)
+    return out[STANDING_COLS]
+
+
+def compute_standings(schedule_df, manual_scores, match_index):
+    """Standings DataFrame (STANDING_COLS) for the given schedule rows."""
+    return standings_from_games(schedule_games(schedule_df, manual_scores, match_index))
+
+
+def rank_standings(standings, games, gender_col="Gender", group_col="Group"):
+    """
+    Sort standings within each (gender, group) and add tiebreak columns + GroupRank.
+
+    H2H_W / H2H_PD only count games between teams level on PTS in the same group;
+    GRP_PD only counts games against teams of the same group.
+    """
+    if standings.empty:
+        return standings.assign(H2H_W=[], H2H_PD=[], GRP_PD=[], GroupRank=[])
+
+    df = standings.copy()
+    df["_key"] = _norm_team(df["Team"])
+    df["_gender"] = _norm_gender(df[gender_col])
+
+    long = team_results(games) if not games.empty else pd.DataFrame(
+        columns=["Team", "Opp", "Gender", "PF", "PA", "Won"])
+    ref = df[["_key", "_gender", group_col, "PTS"]].drop_duplicates(["_key", "_gender"])
+    long = long.merge(ref.rename(columns={"_key": "Team", "_gender": "Gender",
+                                          group_col: "GrpT", "PTS": "PtsT"}),
+                      on=["Team", "Gender"], how="inner")
+    long = long.merge(ref.rename(columns={"_key": "Opp", "_gender": "Gender",
+                                          group_col: "GrpO", "PTS": "PtsO"}),
+                      on=["Opp", "Gender"], how="inner")
+
+    same_grp = long["GrpT"] == long["GrpO"]
+    tied = same_grp & (long["PtsT"] == long["PtsO"])
+    long["_pd"] = long["PF"] - long["PA"]
+    long["_grp_pd"] = long["_pd"].where(same_grp, 0)
+    long["_h2h_w"] = (long["Won"] & tied).astype(int)
+    long["_h2h_pd"] = long["_pd"].where(tied, 0)
+
+    tb = long.groupby(["Team", "Gender"]).agg(
+        H2H_W=("_h2h_w", "sum"), H2H_PD=("_h2h_pd", "sum"), GRP_PD=("_grp_pd", "sum"))
+    tb.index = tb.index.set_names(["_key", "_gender"])
+    df = df.drop(columns=[c for c in ["H2H_W", "H2H_PD", "GRP_PD", "GroupRank"] if c in df.columns])
+    df = df.merge(tb.reset_index(), on=["_key", "_gender"], how="left")
+    for col in ["H2H_W", "H2H_PD", "GRP_PD"]:
+        df[col] = df[col].fillna(0)
+        if (df[col] % 1 == 0).all():
+            df[col] = df[col].astype(int)
+
+    order = [gender_col, group_col] + TIEBREAKERS + ["_key"]
+    df = df.sort_values(order, ascending=[True, True] + [False] * len(TIEBREAKERS) + [True],
+                        kind="stable", na_position="last")
+    df["GroupRank"] = df.groupby([gender_col, group_col], dropna=False).cumcount() + 1
+    return df.drop(columns=["_key", "_gender"]).reset_index(drop=True)
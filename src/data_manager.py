@@ -2,52 +2,111 @@
 import streamlit as st
 import json
 import pandas as pd
-from datetime import datetime
 import os
 
-@st.cache_data(show_spinner=False, ttl=60)
+TOURNAMENTS_DIR = "data/tournaments"
+
+def resolve_data_path():
+    """
+    Return the data source: the tournaments directory when it holds JSON files
+    (multi-file mode), else the data.json path (relative for cloud, staging
+    fallback for local), or None.
+    """
+    if os.path.isdir(TOURNAMENTS_DIR):
+        from src.core.multi_ingest import tournament_files
+        if tournament_files(TOURNAMENTS_DIR):
+            return TOURNAMENTS_DIR
+    relative_path = "data/processed/data.json"
+    staging_path = r"h:\VIBE CODE\ind basketball\2staging\data\processed\data.json"
+    if os.path.exists(relative_path):
+        return relative_path
+    if os.path.exists(staging_path):
+        return staging_path
+    return None
+
+@st.cache_resource(show_spinner=False)
+def get_match_loader(json_path):
+    """
+    One loader per data source, shared across reruns and sessions: incremental
+    for a data.json file, a process-pool multi-file loader for a directory.
+    """
+    if os.path.isdir(json_path):
+        from src.core.multi_ingest import MultiFileLoader
+        return MultiFileLoader(json_path)
+    from src.core.incremental_loader import IncrementalMatchLoader
+    return IncrementalMatchLoader(json_path)
+
 def load_data(json_path=None):
-    """Load the main JSON data. Trust data.json as source of truth."""
+    """
+    Load the main JSON data. Trust data.json as source of truth.
+    Re-parses only when the file's mtime/size changes; unchanged matches keep
+    their identity (see src.core.incremental_loader). A directory of tournament
+    files is ingested in a process pool (see src.core.multi_ingest).
+    Categories from game_categorization.json are applied to copies of the
+    matches (the loader's dicts are shared by every session).
+    """
     try:
         # Use relative path for cloud deployment, fallback to absolute for local
-        if json_path:
-            actual_path = json_path
-        else:
-            # Try relative path first (for Streamlit Cloud)
-            relative_path = "data/processed/data.json"
-            # Fallback to staging absolute path for local development
-            staging_path = r"h:\VIBE CODE\ind basketball\2staging\data\processed\data.json"
-            
-            if os.path.exists(relative_path):
-                actual_path = relative_path
-            elif os.path.exists(staging_path):
-                actual_path = staging_path
-            else:
-                raise FileNotFoundError(f"data.json not found at {relative_path} or {staging_path}")
-
-        with open(actual_path, "r", encoding='utf-8-sig') as f:
-            data = json.load(f)
-            
-        # Placeholder for total_games and last_updated
-        if isinstance(data, dict):
-            # Check for wrapped structure first
-            if "Matches" in data:
-                total_games = len(data["Matches"])
-            elif "matches" in data:
-                total_games = len(data["matches"])
-            else:
-                # Assume dict keys are match IDs (production structure)
-                total_games = len(data)
-        else:
-            # Plain list structure
-            total_games = len(data)
-            
-        last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return data, total_games, last_updated
+        actual_path = json_path or resolve_data_path()
+        if not actual_path or not os.path.exists(actual_path):
+            raise FileNotFoundError("data.json not found at data/processed/data.json, data/tournaments or staging path")
+
+        loader = get_match_loader(actual_path)
+        loader.refresh()
+        data = loader.categorized(load_category_map())
+        # Multi-file mode: a malformed file is skipped, not fatal
+        for path, err in getattr(loader, "errors", {}).items():
+            st.warning(f"Skipped {os.path.basename(path)}: {err}")
+        return data, len(data), loader.last_updated
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return [], 0, "N/A"
 
+def get_data_version(json_path=None):
+    """Token that changes whenever match content in data.json (or the category map applied to it) changes."""
+    actual_path = json_path or resolve_data_path()
+    if not actual_path:
+        return "none"
+    return get_match_loader(actual_path).data_version
+
+def load_match_tables(store_dir=None, rebuild=True):
+    """
+    Load the columnar match store (matches / player_stats / period_stats).
+    If the store is missing or older than data.json it is rebuilt first
+    (set rebuild=False to return None instead).
+    The hub reads it through get_match_tables(), without rebuilding.
+    """
+    from src.core import columnar_store as cs
+
+    store_dir = store_dir or cs.DEFAULT_STORE_DIR
+    json_path = resolve_data_path()
+    if json_path and os.path.isdir(json_path):
+        # Multi-file mode keeps the concatenated tables in memory
+        loader = get_match_loader(json_path)
+        loader.refresh()
+        return loader.tables
+    try:
+        if not cs.store_is_fresh(json_path, store_dir):
+            if not rebuild or not json_path:
+                return None
+            cs.build_columnar_store(json_path, store_dir, category_map=load_category_map())
+            cs.load_columnar_store.clear()
+        return cs.load_columnar_store(store_dir)
+    except Exception as e:
+        st.error(f"Error loading columnar store: {e}")
+        return None
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_match_tables(data_version):
+    """
+    Columnar tables for the hub's tournament aggregations, loaded once per data
+    version: the Parquet store when it is fresh (build it with
+    `python -m src.core.columnar_store` after updating data.json), the
+    in-memory tables in multi-file mode, else None (aggregate the match dicts).
+    Shared, not copied: callers must not modify the frames.
+    """
+    return load_match_tables(rebuild=False)
+
 @st.cache_data  
 def load_category_map():
     """Load category map"""
@@ -78,30 +137,35 @@ def load_logos():
         return {}
 
 def load_manual_scores():
-    try:
-        path = "data/processed/manual_scores.json"
-        if not os.path.exists(path):
-            path = r"h:\VIBE CODE\ind basketball\2staging\data\processed\manual_scores.json"
-            
-        with open(path, "r") as f:
-            return json.load(f)
-    except:
-        return {}
+    """manual_scores.json as a dict (valid entries; re-read only when the file changes)."""
+    return get_manual_score_store().to_dict()
+
+def get_manual_score_store():
+    """Cached ManualScoreStore: lookups by (team pair, gender) / match ID (see src.core.manual_scores)."""
+    from src.core.manual_scores import load_store
+    return load_store()
+
+def resolve_schedule_path():
+    """compiled_schedule.csv: relative path for cloud, staging fallback for local development, or None."""
+    relative_path = "compiled_schedule.csv"
+    staging_path = r"h:\VIBE CODE\ind basketball\2staging\compiled_schedule.csv"
+    if os.path.exists(relative_path):
+        return relative_path
+    if os.path.exists(staging_path):
+        return staging_path
+    return None
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _read_schedule(path, mtime_ns, size):
+    return pd.read_csv(path)
 
 def load_schedule():
-    """Load the compiled schedule CSV"""
+    """Load the compiled schedule CSV (parsed once per file mtime/size; callers get a copy)"""
     try:
-        # Try relative path first (for Streamlit Cloud)
-        relative_path = "compiled_schedule.csv"
-        # Fallback to staging absolute path for local development
-        staging_path = r"h:\VIBE CODE\ind basketball\2staging\compiled_schedule.csv"
-        
-        if os.path.exists(relative_path):
-            df = pd.read_csv(relative_path)
-        elif os.path.exists(staging_path):
-            df = pd.read_csv(staging_path)
-        else:
+        path = resolve_schedule_path()
+        if path is None:
             return pd.DataFrame()
-        return df
+        st_res = os.stat(path)
+        return _read_schedule(path, st_res.st_mtime_ns, st_res.st_size)
     except:
         return pd.DataFrame()
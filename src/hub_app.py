@@ -27,144 +27,50 @@ except Exception as e:
     st.error(f"Critical Startup Error: {e}")
 
 # Imports AFTER page config to prevent "set_page_config not first" errors
+# Chart libraries (plotly) are imported inside the tabs that draw charts, so a
+# cold start only pays for what the Home tab needs (see src/utils/import_budget.py)
 import pandas as pd
-import json
-import altair as alt
-import plotly.graph_objects as go
-import numpy as np
 try:
-    import re
-    import importlib
     import src.analytics as ant
-    import src.ui.social_generator as sg
     import src.data_manager as dm
     from src.metrics_engine import MetricsEngine
+    from src.core.match_index import get_match_index
+    from src.core.period_cube import get_period_cube
+    from src.core.fragment_cache import get_fragment_cache
+    from src.core.player_index import get_player_index
+    from src.core.player_search import get_player_search
+    from src.core.formatters import dataframe_config, style_max
+    from src.core.leaderboard_index import get_leaderboard_index, index_token
+    from src.core.standings import compute_standings
+    from src.core.power_rankings import get_power_rankings, inputs_token
+    from src.core.stage_index import get_stage_index, stage_token
     import src.ui.enhanced_components as ec
+    import src.ui.schedule_table as sched_ui
+    import src.core.profiler as profiler
     from datetime import datetime
 except ImportError as e:
     st.error(f"Failed to import modules: {e}")
     st.stop()
 
+# --- PROFILING (opt-in: ?profile=1 or HUB_PROFILE=1; memory and trace files need HUB_PROFILE) ---
+prof = profiler.start_rerun()
+if prof is not None:
+    for _target in (dm, ant, MetricsEngine, ec):
+        profiler.instrument(_target)
+
 # --- INJECT ENHANCED CSS ---
 if 'ec' in locals():
     ec.inject_custom_css()
 
 # Data Loading functions moved to src.data_manager
 
-def get_match_obj(row, raw_data_list):
-    t1_s = str(row['Team A']).strip().upper()
-    t2_s = str(row['Team B']).strip().upper()
-    cat_s = row['Gender']
-    
-    for m_data in raw_data_list:
-        t1_d = str(m_data['Teams']['t1']).strip().upper()
-        t2_d = str(m_data['Teams']['t2']).strip().upper()
-        cat_d = m_data.get('Category', '')
-        
-        if cat_d == cat_s:
-            if (t1_s == t1_d and t2_s == t2_d) or (t1_s == t2_d and t2_s == t1_d):
-                return m_data
-    return None
-
-def calculate_unified_standings(schedule_df, manual_scores, raw_data_list):
-    # Initialize Teams
-    teams = {} # Key: "TeamName_Gender", Value: {GP, W, L, PF, PA, Gender, Group}
-    
-    # 1. Initialize from Schedule (to ensure all teams exist)
-    for _, row in schedule_df.iterrows():
-        if pd.isna(row['Team A']): continue
-        t1 = str(row['Team A']).strip().upper()
-        t2 = str(row['Team B']).strip().upper()
-        gender = str(row['Gender']).strip().title() # Normalize to Title Case (Men/Women)
-        grp = row['Group']
-        
-        for t in [t1, t2]:
-            key = f"{t}_{gender}"
-            if key not in teams:
-                teams[key] = {
-                    "Team": t,
-                    "Gender": gender,
-                    "Group": grp,
-                    "GP": 0, "W": 0, "L": 0, 
-                    "PF": 0, "PA": 0, "PD": 0, "PTS": 0
-                }
-    
-    # 2. Process Matches
-    processed_matches = set()
-    
-    for idx, row in schedule_df.iterrows():
-        if pd.isna(row['Team A']): continue
-        
-        mid = row['Match ID']
-        if mid in processed_matches: continue
-        
-        t1 = str(row['Team A']).strip().upper()
-        t2 = str(row['Team B']).strip().upper()
-        gender = str(row['Gender']).strip().title()
-        
-        # Keys for Stats
-        k_t1 = f"{t1}_{gender}"
-        k_t2 = f"{t2}_{gender}"
-
-        # Check for Score
-        s1, s2 = None, None
-        
-        # A. Check Detailed Stats
-        m_found = get_match_obj(row, raw_data_list)
-        if m_found:
-            s1 = m_found['TeamStats']['t1']['PTS']
-            s2 = m_found['TeamStats']['t2']['PTS']
-        else:
-            # B. Check Manual Scores
-            # Manual Scores keys use UPPER gender
-            g_upper = gender.upper()
-            
-            # Try Forward Key
-            k1 = f"{t1}_VS_{t2}_{g_upper}"
-            if manual_scores.get(k1):
-                s1 = manual_scores[k1]['s1']
-                s2 = manual_scores[k1]['s2']
-            else:
-                # Try Reverse Key
-                k2 = f"{t2}_VS_{t1}_{g_upper}"
-                if manual_scores.get(k2):
-                    s1 = manual_scores[k2]['s2']
-                    s2 = manual_scores[k2]['s1']
-        
-        if s1 is not None and s2 is not None:
-            # Update Stats
-            processed_matches.add(mid)
-            
-            # Team 1
-            if k_t1 in teams:
-                teams[k_t1]['GP'] += 1
-                teams[k_t1]['PF'] += s1
-                teams[k_t1]['PA'] += s2
-                if s1 > s2: 
-                    teams[k_t1]['W'] += 1
-                    teams[k_t1]['PTS'] += 2
-                else: 
-                    teams[k_t1]['L'] += 1
-                    teams[k_t1]['PTS'] += 1
-            
-            # Team 2
-            if k_t2 in teams:
-                teams[k_t2]['GP'] += 1
-                teams[k_t2]['PF'] += s2
-                teams[k_t2]['PA'] += s1
-                if s2 > s1: 
-                    teams[k_t2]['W'] += 1
-                    teams[k_t2]['PTS'] += 2
-                else: 
-                    teams[k_t2]['L'] += 1
-                    teams[k_t2]['PTS'] += 1
-                    
-        # Update PD
-        for t_key in [k_t1, k_t2]:
-             if t_key in teams:
-                 teams[t_key]['PD'] = teams[t_key]['PF'] - teams[t_key]['PA']
+def get_match_obj(row, match_index):
+    # O(1): Genius Match ID first, then (team pair, gender) -- see src.core.match_index
+    return match_index.for_schedule_row(row)
 
-    return list(teams.values())
+def calculate_unified_standings(schedule_df, manual_scores, match_index):
+    # Vectorized: scores resolved by merges, W/L/PF/PA/PD/PTS by groupby (src.core.standings)
+    return compute_standings(schedule_df, manual_scores, match_index)
 
 def get_mvp_simple(m):
     # Find player with max GmScr
@@ -182,7 +88,7 @@ def render_match_row(row, m_found, idx, key_prefix="sch"):
         return
 
     logos = dm.load_logos()
-    manual_scores = dm.load_manual_scores()
+    score_store = dm.get_manual_score_store()
     match_id = str(m_found['MatchID']) if m_found else None
     
     # Extract Team Details
@@ -191,17 +97,8 @@ def render_match_row(row, m_found, idx, key_prefix="sch"):
     t2_logo = logos.get(t2_name, "")
     
     # Check manual scores if not found in scraped data
-    m_score = None
-    if not m_found:
-        m_key = f"{t1_name.upper()}_VS_{t2_name.upper()}_{row['Gender'].upper()}"
-        m_score = manual_scores.get(m_key)
-        # Try reverse key too
-        if not m_score:
-            m_key_rev = f"{t2_name.upper()}_VS_{t1_name.upper()}_{row['Gender'].upper()}"
-            m_score = manual_scores.get(m_key_rev)
-            if m_score:
-                # Swap scores if reversed
-                m_score = {'s1': m_score['s2'], 's2': m_score['s1'], 'id': m_score['id']}
+    # (either key order, oriented to Team A / Team B)
+    m_score = score_store.lookup(t1_name, t2_name, row['Gender']) if not m_found else None
 
     # TV Scoreboard Style
     with st.container():
@@ -273,166 +170,13 @@ def render_match_row(row, m_found, idx, key_prefix="sch"):
                     st.session_state.jump_to_match = match_id
                     st.rerun()
 
-def render_schedule_table(filtered_sch, raw_data_all, key_prefix="sch"):
-    if filtered_sch.empty:
-        st.info("No matches match the selected filters.")
-        return
-
-    import textwrap
-    
-    # Custom CSS for the grid-based table
-    st.markdown("""
-    <style>
-    .sch-row {
-        background: rgba(255,255,255,0.03); 
-        border-bottom: 1px solid rgba(255,255,255,0.05);
-        padding: 10px 0;
-        transition: background 0.2s;
-    }
-    .sch-row:hover {
-        background: rgba(255,255,255,0.06);
-    }
-    .sch-header {
-        background: rgba(255,133,51,0.08);
-        border-bottom: 2px solid var(--tappa-orange);
-        padding: 10px 0;
-        font-weight: bold;
-        color: #888;
-        font-size: 0.75rem;
-        text-transform: uppercase;
-        letter-spacing: 0.1em;
-    }
-    .sch-cell {
-        display: flex;
-        align-items: center;
-        height: 100%;
-        padding-left: 10px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    # Header Row
-    c1, c2, c3, c4, c5, c6 = st.columns([0.5, 1.2, 2.5, 0.6, 1.2, 1])
-    
-    with c1: st.markdown("<div class='sch-header' style='padding-left:10px;'>ID</div>", unsafe_allow_html=True)
-    with c2: st.markdown("<div class='sch-header'>Time / Court</div>", unsafe_allow_html=True)
-    with c3: st.markdown("<div class='sch-header'>Matchup</div>", unsafe_allow_html=True)
-    with c4: st.markdown("<div class='sch-header'>Group</div>", unsafe_allow_html=True)
-    with c5: st.markdown("<div class='sch-header'>Result</div>", unsafe_allow_html=True)
-    with c6: st.markdown("<div class='sch-header'>Action</div>", unsafe_allow_html=True)
-    
-    manual_scores = dm.load_manual_scores()
-    
-    # Data Rows
-    for idx, row in filtered_sch.iterrows():
-        if pd.isna(row['Team A']):
-            continue
-            
-        m_found = get_match_obj(row, raw_data_all)
-        t1_name, t2_name = str(row['Team A']).strip(), str(row['Team B']).strip()
-        
-        # Time Logic
-        t_val = row['Time']
-        if pd.isna(t_val) or str(t_val).lower() == 'nan' or str(t_val).strip() == '':
-            t_val = "TBD"
-        
-        # Score Logic
-        score_text = "VS"
-        status_color = "#666"
-        status_text = "SCHEDULED"
-        
-        if m_found:
-            score_text = f"{m_found['TeamStats']['t1']['PTS']} - {m_found['TeamStats']['t2']['PTS']}"
-            status_text = "FINAL (STATS)"
-            status_color = "#4CAF50"
-        else:
-            m_key = f"{t1_name.upper()}_VS_{t2_name.upper()}_{row['Gender'].upper()}"
-            m_score = manual_scores.get(m_key)
-            if not m_score:
-                m_key_rev = f"{t2_name.upper()}_VS_{t1_name.upper()}_{row['Gender'].upper()}"
-                m_score = manual_scores.get(m_key_rev)
-                if m_score:
-                    score_text = f"{m_score['s2']} - {m_score['s1']}"
-                    status_text = "FINAL"
-                    status_color = "#FF9800"
-            else:
-                score_text = f"{m_score['s1']} - {m_score['s2']}"
-                status_text = "FINAL"
-                status_color = "#FF9800"
-        
-        # Row Container
-        with st.container():
-            c1, c2, c3, c4, c5, c6 = st.columns([0.5, 1.2, 2.5, 0.6, 1.2, 1])
-            
-            # ID
-            with c1: 
-                st.markdown(f"<div class='sch-cell' style='font-family:\"Outfit\"; font-weight:700; color:#555;'>{row['Match ID']}</div>", unsafe_allow_html=True)
-            
-            # Time/Court
-            with c2:
-                st.markdown(f"""
-                <div class='sch-cell' style='display:flex; flex-direction:column; align-items:flex-start; justify-content:center;'>
-                    <div style='font-size: 0.85rem; font-weight: 600;'>{t_val}</div>
-                    <div style='font-size: 0.65rem; color: #888;'>{row['Court']}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Matchup
-            with c3:
-                st.markdown(f"""
-                <div class='sch-cell' style='display:flex; flex-direction:column; align-items:flex-start; justify-content:center;'>
-                     <div style='display: flex; align-items: center; gap: 8px;'>
-                        <span style='font-weight: 700; font-size: 0.9rem; color: #fff;'>{t1_name}</span>
-                        <span style='color: #444; font-size: 0.65rem; font-weight: 900;'>VS</span>
-                        <span style='font-weight: 700; font-size: 0.9rem; color: #fff;'>{t2_name}</span>
-                    </div>
-                    <div style='font-size: 0.65rem; color: #666; text-transform: uppercase;'>{row['Gender']} Division</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Group
-            with c4:
-                st.markdown(f"<div class='sch-cell' style='color:#aaa; font-size:0.8rem;'>{row['Group']}</div>", unsafe_allow_html=True)
-            
-            # Result
-            with c5:
-                st.markdown(f"""
-                <div class='sch-cell' style='display:flex; flex-direction:column; align-items:flex-start; justify-content:center;'>
-                    <div style='font-family:\"Outfit\"; font-weight:900; color:var(--tappa-orange); font-size:1.1rem;'>{score_text}</div>
-                    <div style='font-size:0.6rem; color:{status_color}; font-weight:700;'>{status_text}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Action (Button)
-            with c6:
-                if m_found:
-                    st.markdown("<div style='height: 4px;'></div>", unsafe_allow_html=True) # Spacer
-                    if st.button("📊 Stats", key=f"{key_prefix}_btn_stats_{row['Match ID']}_{idx}", use_container_width=True):
-                        st.session_state.active_tab = "MATCH DASHBOARD"
-                        # Assuming m_found has 'MatchId' or similar from raw_data
-                        # raw_data matches usually have 'MatchId' at root or similar? 
-                        # Actually get_match_obj returns the FULL stats object. 
-                        # It should have 'MatchId' or we use the loop key?
-                        # Let's assume 'MatchId' exists in the object or use row['Match ID'] mapping if needed.
-                        # The existing code used `row['Match ID']` for jump_to_match primarily? 
-                        # No, previously it passed `match_id` variable which came from where?
-                        # Ah, the previous card implementation used `match_id` variable.
-                        # Let's check `get_match_obj` return structure if possible or just try to be safe.
-                        # Standard raw data usually has 'MatchId'.
-                        # If not, we can try to use the schedule ID but that needs mapping.
-                        # But `get_match_obj` returns the FULL stats object. 
-                        # To jump to it, we need the ID that the dashboard uses to look it up.
-                        # The dashboard uses `st.session_state.jump_to_match`.
-                        # Let's assume for now we pass the Schedule ID and the dashboard handles mapping?
-                        # Or we pass the ID from `m_found` if available.
-                        
-                        target_id = m_found.get('MatchId')
-                        st.session_state.jump_to_match = str(target_id) if target_id else str(row['Match ID'])
-                        st.rerun()
-                else:
-                    st.markdown("<div class='sch-cell' style='color:#444; font-size:0.7rem;'>-</div>", unsafe_allow_html=True)
-
-        st.markdown("<div style='border-bottom: 1px solid rgba(255,255,255,0.05);'></div>", unsafe_allow_html=True)
+def render_schedule_table(filtered_sch, match_index, key_prefix="sch", manual_scores=None):
+    # One cached HTML grid + a single "View Stats" control instead of st.columns per row
+    # (src.ui.schedule_table); the grid is keyed by data version + schedule rows / manual scores
+    if manual_scores is None:
+        manual_scores = dm.load_manual_scores()
+    cache_key = (data_version, inputs_token(filtered_sch, manual_scores))
+    sched_ui.render_schedule_table(filtered_sch, match_index, manual_scores, key_prefix=key_prefix, cache_key=cache_key)
 
 def style_rankings(df, title):
     if df.empty: return f"<div style='padding:10px;'>No {title} Data</div>"
@@ -444,6 +188,9 @@ def style_rankings(df, title):
     
     disp = df[cols].copy()
     disp.columns = ['#', 'Team', 'W', 'L', '+/-']
+    if 'Trend' in df.columns:
+        # Rank change since the previous match day
+        disp['Trend'] = [f"▲{t}" if t > 0 else (f"▼{-t}" if t < 0 else "–") for t in df['Trend']]
     st.dataframe(disp, hide_index=True, use_container_width=True)
 
 
@@ -451,206 +198,14 @@ def style_rankings(df, title):
 
 # Aggregation Logic moved to src.metrics_engine.py
 
-def calculate_power_rankings_v2(raw_data_list):
-    # 1. Get Unified Standings (Record, PD, etc. for ALL teams)
-    # Note: We need schedule_df and manual_scores here.
-    # Ideally, we should pass them in, but for backward compatibility, load them here if needed.
+def calculate_power_rankings_v2(raw_data_list=None):
+    # Latest snapshot of the precomputed power rankings (src.core.power_rankings): built once
+    # per data / schedule / manual-score version over all matches, Trend vs the previous match day
     df_sch = dm.load_schedule()
-    
-    # --- FILTER: GROUP STAGE ONLY ---
-    # User Request: "groupings have changed significantly we only need standing from the group stage"
-    if not df_sch.empty and 'Group' in df_sch.columns:
-        # Filter OUT Knockout Stages to keep all Group variations (A, A1, B, E, H, etc.)
-        # User defined exclusion is safer than inclusion if names vary
-        exclude_stages = ["PQF", "Quarterfinal", "Semifinal", "Final", "LKO Final", "QF", "SF"]
-        df_sch = df_sch[~df_sch['Group'].isin(exclude_stages)].copy()
-        
     manual_scores = dm.load_manual_scores()
-    unified_standings = calculate_unified_standings(df_sch, manual_scores, raw_data_list)
-    df_unified = pd.DataFrame(unified_standings)
-    
-    if df_unified.empty:
-        return pd.DataFrame()
-
-    # 2. Get Advanced Stats for teams that have them
-    # We want Team Stats here (NetRtg, etc)
-    _, df_adv = MetricsEngine.get_tournament_stats(raw_data_list, "Full Game", entity_type="Teams")
-    
-    # 3. Merge
-    # We want a master list of all teams.
-    # df_unified has: Team, Gender, Group, GP, W, L, PF, PA, PD, PTS
-    # df_adv has: Team, NetRtg, PIE, TS%, etc.
-    
-    # Init Rankings List
-    rankings = []
-    
-    # --- MASTER GROUP MAPPING (USER DEFINED) ---
-    # Forces teams into correct groups regardless of schedule data
-    # --- MASTER GROUP MAPPING (USER DEFINED) ---
-    # Forces teams into correct groups regardless of schedule data (A1->A, etc.)
-
-
-    for _, row in df_unified.iterrows():
-        team = row['Team']
-        gender = row['Gender']
-        
-        assigned_group = row['Group'] # Default
-
-        # Look up in master map
-        # Note: keys in team_group_map are just team names. 
-        # But some teams (Indian Railways) are in both genders.
-        # So we must verify gender match or use a tuple key strategy if we changed the dictionary.
-        # But previous step used Team Name as key.
-        # FIX: The previous dictionary has duplicate keys if written literally in python dict construction!
-        # "Indian Railways" appears twice. The second one overwrites the first.
-        # We MUST use (Team, Gender) as key or separate dictionaries.
-        
-        # Let's fix the dictionary structure right now to be (Team, Gender) -> Group
-        pass
-
-    # --- CORRECTED DICTIONARY ---
-    # We will use a lookup function instead of a single dict to handle the content we just wrote.
-    # Actually, simpler: define the mapping list and iterate, as intended in previous step
-    
-    # RE-DEFINING MAPPING LIST WITHIN THE LOOP IS INEFFICIENT.
-    # Let's define the list once outside.
-    
-    mapping_list = [
-            ("Tamil Nadu", "Men", "A"), ("Karnataka", "Men", "A"), ("Services", "Men", "A"), ("Rajasthan", "Men", "A"), ("Gujarat", "Men", "A"),
-            ("Punjab", "Men", "B"), ("Indian Railways", "Men", "B"), ("Delhi", "Men", "B"), ("Uttar Pradesh", "Men", "B"), ("Chandigarh", "Men", "B"),
-            ("Kerala", "Men", "C"), ("Jammu & Kashmir", "Men", "C"), ("Jharkhand", "Men", "C"), ("West Bengal", "Men", "C"),
-            ("Madhya Pradesh", "Men", "D"), ("Goa", "Men", "D"), ("Maharashtra", "Men", "D"), ("Uttarakhand", "Men", "D"),
-            ("Haryana", "Men", "E"), ("Chhattisgarh", "Men", "E"), ("Meghalaya", "Men", "E"), ("Tripura", "Men", "E"),
-            ("Himachal Pradesh", "Men", "F"), ("Bihar", "Men", "F"), ("Mizoram", "Men", "F"), ("Telangana", "Men", "F"),
-            ("Andaman & Nicobar", "Men", "G"), ("Assam", "Men", "G"), ("Nagaland", "Men", "G"), ("Sikkim", "Men", "G"),
-            ("Andhra Pradesh", "Men", "H"), ("Arunachal Pradesh", "Men", "H"), ("Odisha", "Men", "H"), ("Puducherry", "Men", "H"),
-            # WOMEN
-            ("Indian Railways", "Women", "A"), ("Delhi", "Women", "A"), ("Chhattisgarh", "Women", "A"), ("Maharashtra", "Women", "A"), ("Karnataka", "Women", "A"),
-            ("Kerala", "Women", "B"), ("Tamil Nadu", "Women", "B"), ("Madhya Pradesh", "Women", "B"), ("Gujarat", "Women", "B"), ("West Bengal", "Women", "B"),
-            ("Punjab", "Women", "C"), ("Goa", "Women", "C"), ("Haryana", "Women", "C"), ("Tripura", "Women", "C"), ("Uttarakhand", "Women", "C"),
-            ("Uttar Pradesh", "Women", "D"), ("Chandigarh", "Women", "D"), ("Jammu & Kashmir", "Women", "D"), ("Telangana", "Women", "D"),
-            ("Rajasthan", "Women", "E"), ("Bihar", "Women", "E"), ("Jharkhand", "Women", "E"), ("Sikkim", "Women", "E"),
-            ("Himachal Pradesh", "Women", "F"), ("Arunachal Pradesh", "Women", "F"), ("Manipur", "Women", "F"), ("Puducherry", "Women", "F"),
-            ("Andhra Pradesh", "Women", "G"), ("Assam", "Women", "G"), ("Meghalaya", "Women", "G"), ("Odisha", "Women", "G")
-    ]
-    
-    # Convert to Dict for O(1) lookup: (Team, Gender) -> Group
-    # Normalize team names to title case or upper case to match data? 
-    # Data seems to be Title Case.
-    master_map = {(t, g): grp for t, g, grp in mapping_list}
-
-    for _, row in df_unified.iterrows():
-        team = row['Team']
-        gender = row['Gender']
-        
-        assigned_group = row['Group'] # Default
-        
-        # Override
-        # Mapping keys are Title Case (e.g. "Tamil Nadu"), but data might be uppercase ("TAMIL NADU")
-        lookup_team = team.title() 
-        # Handle special cases if title() messes up (e.g. "Idco" vs "IDCO", or "Services" vs "SERVICES")
-        # Generally title() is safe for these state names.
-        # But "Uttar Pradesh" -> "Uttar Pradesh". "UTTAR PRADESH" -> "Uttar Pradesh".
-        
-        if (lookup_team, gender) in master_map:
-             assigned_group = master_map[(lookup_team, gender)]
-        # Fallback: try direct match in case dictionary has some uppercase
-        elif (team, gender) in master_map:
-             assigned_group = master_map[(team, gender)]
-        
-        # Base Metric (Win % + PD Factor)
-        win_pct = row['W'] / row['GP'] if row['GP'] > 0 else 0
-        pd_norm = row['PD'] / row['GP'] if row['GP'] > 0 else 0
-        # Normalize PD: assume max PD is ~50.
-        pd_score = min(max(pd_norm / 50.0, -1.0), 1.0) * 20 # +/- 20 points impact
-        
-        base_score = (win_pct * 60) + 20 + pd_score # 0-80 range approx
-        
-        # Advanced Metric Bonus
-        adv_bonus = 0
-        has_stats = False
-        
-        if not df_adv.empty and team in df_adv['Team'].values:
-            has_stats = True
-            adv_row = df_adv[df_adv['Team'] == team].iloc[0]
-            
-            # Net Rating (-30 to +30 range approx) -> +/- 10
-            net = adv_row.get('NetRtg', 0)
-            net_score = min(max(net / 30.0, -1.0), 1.0) * 10
-            
-            # PIE (0 to 20 range approx, avg 10) -> +/- 5
-            # Actually PIE is % (e.g. 50%).
-            pie = adv_row.get('PIE', 50)
-            pie_score = ((pie - 50) / 20) * 10 # +/- 10
-            
-            adv_bonus = net_score + pie_score
-            
-            # Sanity cap
-            adv_bonus = min(max(adv_bonus, -15), 15)
-        
-        final_score = base_score + adv_bonus
-        
-        rankings.append({
-            "Team": team.title(), # Normalize to Title Case
-            "Category": row.get('Gender', 'Unknown'),
-            "Group": assigned_group,
-            "Record": f"{row['W']}-{row['L']}",
-            "GP": row['GP'],
-            "W": row['W'],
-            "L": row['L'],
-            "Diff": row['PD'],
-            "PD": row['PD'],
-            "PF": row.get('PF', 0),
-            "PA": row.get('PA', 0),
-            "PTS": row.get('PTS', 0),
-            "Score": round(final_score, 1),
-            "HasStats": has_stats,
-            "Trend": 0 # Placeholder
-        })
-
-    # --- INJECT MISSING TEAMS FROM MAP ---
-    # Ensure all User-Defined teams appear even if they have 0 games
-    existing_teams = {(r['Team'].strip().title(), r['Category']) for r in rankings}
-    
-    for (team_name, team_gender), group_code in master_map.items():
-        if (team_name.strip().title(), team_gender) not in existing_teams:
-            # Add with 0 stats
-             rankings.append({
-                "Team": team_name, # Use proper title case name from valid map
-                "Category": team_gender,
-                "Group": group_code,
-                "Record": "0-0",
-                "GP": 0,
-                "W": 0,
-                "L": 0,
-                "Diff": 0,
-                "PD": 0,
-                "PF": 0,
-                "PA": 0,
-                "PTS": 0,
-                "Score": 0.0,
-                "HasStats": False,
-                "Trend": 0
-            })
-            
-    # Filter out "W/O" placeholders or invalid teams
-    rankings = [r for r in rankings if "W/O" not in r['Team'] and r['Group'] not in ["A1", "B1", "A2", "B2"]]
-
-        
-    df_rank = pd.DataFrame(rankings)
-    if not df_rank.empty:
-        # Group sort by Category then Score to get Rank per category
-        # But wait, usually we filter by category later.
-        # So Rank should ideally be calculated per category?
-        # The old function returned a dict by category.
-        # Now we return one DF.
-        # If we calculate rank globally, it mixes Men and Women.
-        # We should calculate Rank per Category.
-        
-        df_rank = df_rank.sort_values(['Category', 'Score'], ascending=[True, False])
-        df_rank['Rank'] = df_rank.groupby('Category').cumcount() + 1
-        
-    return df_rank
+    rankings = get_power_rankings(data_version, inputs_token(df_sch, manual_scores),
+                                  df_sch, manual_scores, match_index)
+    return rankings.latest().copy()
 
 
 # Load Data
@@ -683,118 +238,34 @@ if not raw_data:
 cat_map = dm.load_category_map()
 logos = dm.load_logos()
 
-# Inject Category into raw_data
-if raw_data and cat_map:
-    for m in raw_data:
-        mid = str(m.get("MatchID"))
-        # Only overwrite if value is a valid Category (to avoid "Knockout" issue)
-        if mid in cat_map and cat_map[mid] in ["Men", "Women"]:
-            m['Category'] = cat_map[mid]
+# Categories from cat_map are applied by dm.load_data (on copies: the loader's matches are shared)
 
 # Store unfiltered data for player profiles (so game log shows all matches)
 raw_data_all = raw_data.copy()
 
+def get_leaders():
+    """Top-K leaderboard index over all matches, built once per data version / stage assignment."""
+    return get_leaderboard_index(index_token(data_version, raw_data_all, stage_map), raw_data_all, stage_map)
+
+with profiler.stage("indexes"):
+    data_version = dm.get_data_version()
+    # Lookup index over all matches, rebuilt only when data.json content changes
+    match_index = get_match_index(data_version, raw_data_all)
+    # Player x match x period stats for halves / custom quarter sets
+    period_cube = get_period_cube(data_version, raw_data_all)
+    # Typed tables (fresh Parquet store / multi-file ingest) for the tournament aggregates, else None
+    match_tables = dm.get_match_tables(data_version)
+    # Player -> matches played and per-game stat lines for the profile game logs
+    player_index = get_player_index(data_version, raw_data_all)
+    # Finished HTML for box scores / leader boards, keyed by data version + selections
+    fragment_cache = get_fragment_cache()
+    # MatchID -> stage / round / group / category (game_categorization.json, then schedule Group)
+    df_sch_stages = dm.load_schedule()
+    stage_index = get_stage_index(data_version, stage_token(cat_map, df_sch_stages), raw_data_all, cat_map, df_sch_stages)
+    # MatchID -> "Group Stage" / "Knockouts" for the stage-filtered leader boards
+    stage_map = stage_index.stage_map()
 
 
-# --- HELPER: FORMATTING ---
-def format_df(df, precision=0):
-    """Format dataframe values based on column types and apply styling"""
-    df = df.copy()
-    
-    # Percentage columns
-    pct_cols = [c for c in df.columns if '%' in c or c in ['TS%', 'eFG%', 'FG%', '2P%', '3P%', 'FT%', 'USG%', 'AST%', 'REB%', 'OREB%', 'DREB%', 'PIE']]
-    for c in pct_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors='coerce').round(1)
-    
-    # Ratio columns
-    ratio_cols = [c for c in df.columns if 'Ratio' in c or 'RATIO' in c or c == 'AST/TO']
-    for c in ratio_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors='coerce').round(2)
-    
-    # Count stats
-    count_cols = ['Pts', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'OFF', 'DEF', 'PTS', 'TOV', 'PF', 'FD', '2CP', 'BLKR', '+/-', 'Eff', 'EFF', 'FIC', 'GmScr']
-    # Add Opponent cols
-    opp_cols = [c for c in df.columns if c.startswith('Opp') or c.startswith('Tm')]
-    all_count = count_cols + opp_cols
-    
-    for c in all_count:
-        if c in df.columns:
-            if precision == 0:
-                df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0).astype(int)
-            else:
-                df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0).round(precision)
-                
-    if 'GP' in df.columns:
-        df['GP'] = pd.to_numeric(df['GP'], errors='coerce').fillna(0).astype(int)
-            
-    # Conditional Formatting Logic
-    def highlight_exceptional(s):
-        is_high = pd.Series(data=False, index=s.index)
-        col = s.name
-        
-        # Thresholds
-        try:
-            # Count Stats
-            if col in ["Pts", "PTS"]: is_high = s >= 20
-            elif col in ["REB", "Reb", "REB%"]: is_high = s >= 10
-            elif col in ["AST"]: is_high = s >= 6
-            elif col in ["STL"]: is_high = s >= 4
-            elif col in ["BLK"]: is_high = s >= 3
-            
-            # Advanced / Composite
-            elif col in ["PIE"]: is_high = s >= 15
-            elif col in ["GmScr"]: is_high = s >= 15
-            elif col in ["FIC"]: is_high = s >= 15
-            elif col in ["Eff", "EFF"]: is_high = s >= 20
-            
-            # Percentages
-            elif col in ["FG%", "2P%"]: is_high = s >= 50.0
-            elif col in ["3P%"]: is_high = s >= 40.0
-            elif col in ["FT%"]: is_high = s >= 80.0
-            # elif col in ["eFG%", "EFG%"]: is_high = s >= 55.0 # Optional
-            # elif col in ["TS%"]: is_high = s >= 60.0 # Optional
-            
-        except:
-            pass # Handle comparison errors
-        
-        return ['background-color: #1a472a; color: white; font-weight: bold' if v else '' for v in is_high]
-    
-    # Create a format dictionary to avoid .0 on integers
-    format_dict = {}
-    for col in df.columns:
-        if col in pct_cols:
-            format_dict[col] = "{:.1f}"
-        elif col in ratio_cols:
-            format_dict[col] = "{:.2f}"
-        elif col in all_count or col == 'GP':
-            # Check if the column actually contains floats that should be integers
-            # This is important if precision was 0 during initial processing
-            if pd.api.types.is_integer_dtype(df[col]):
-                format_dict[col] = "{:.0f}"
-            else: # If it's float (e.g., precision was not 0), format with the specified precision
-                format_dict[col] = f"{{:.{precision}f}}"
-        elif pd.api.types.is_numeric_dtype(df[col]):
-            # Default for other numeric columns, e.g., MIN_CALC
-            format_dict[col] = f"{{:.{precision}f}}"
-
-    # Styler Definition
-    styler = df.style.format(format_dict, na_rep="-")\
-                     .set_properties(**{'text-align': 'center', 'vertical-align': 'middle'})\
-                     .set_table_styles([
-                         {'selector': 'th', 'props': [('text-align', 'center'), ('vertical-align', 'middle'), ('font-weight', 'bold')]},
-                         {'selector': 'td', 'props': [('text-align', 'center'), ('vertical-align', 'middle')]}
-                     ])
-
-    # Apply Highlight
-    target_cols = ["Pts", "PTS", "REB", "AST", "STL", "BLK", "PIE", "GmScr", "FIC", "Eff", "FG%", "2P%", "3P%", "FT%"]
-    existing_cols = [c for c in target_cols if c in df.columns]
-    
-    if existing_cols:
-        styler.apply(highlight_exceptional, subset=existing_cols)
-        
-    return styler
 
 # --- MAIN LAYOUT ---
 c_title = st.container()
@@ -975,6 +446,9 @@ if len(active_group_tabs) > 1:
 
 st.markdown("<div style='height: 10px; border-bottom: 1px solid rgba(255,255,255,0.03); margin-bottom: 30px;'></div>", unsafe_allow_html=True)
 
+# Everything below is attributed to the active tab in the profile panel
+profiler.begin(f"tab:{st.session_state.active_tab}")
+
 # --- HOME DASHBOARD ---
 if st.session_state.active_tab == "HOME":
     # 1. Headline Stats / Leaders
@@ -987,24 +461,23 @@ Tournament Overview
     
     # Calculate Data
 
-    rankings = calculate_power_rankings_v2(raw_data)
-    df_p, _ = MetricsEngine.get_tournament_stats(raw_data, period="Full Game", entity_type="Players")
+    rankings = calculate_power_rankings_v2()
+    leaders = get_leaders()
     
-    if not df_p.empty:
-        # Separate by Category
-        df_men = df_p[df_p['Category'] == 'Men']
-        df_women = df_p[df_p['Category'] == 'Women']
-
-        def get_top_stat(df, col):
-            return df.sort_values(by=col, ascending=False).head(3)
+    if leaders.frames:
+        def get_top_stat(category, col):
+            # Honour the header category filter (the index always holds both divisions)
+            if cat_filter not in ("All", category):
+                return pd.DataFrame(columns=["Player", "Team", col])
+            return leaders.season(col, category=category, k=3)
 
         # Men's Leaders
-        m_pts = get_top_stat(df_men, 'PTS')
-        m_reb = get_top_stat(df_men, 'REB')
+        m_pts = get_top_stat('Men', 'PTS')
+        m_reb = get_top_stat('Men', 'REB')
         
         # Women's Leaders
-        w_pts = get_top_stat(df_women, 'PTS')
-        w_reb = get_top_stat(df_women, 'REB')
+        w_pts = get_top_stat('Women', 'PTS')
+        w_reb = get_top_stat('Women', 'REB')
         
         def render_leader_card(title, rows, metric_key):
             # Use separate strings to avoid indentation issues in markdown
@@ -1082,6 +555,7 @@ Tournament Overview
             else:
                 # Court Wise Navigation
                 courts_available = sorted(today_matches['Court'].unique().tolist())
+                manual_scores_today = dm.load_manual_scores()
                 nav_tabs = ["ALL COURTS"] + [c.upper() for c in courts_available]
                 tabs_ui = st.tabs(nav_tabs)
                 
@@ -1097,7 +571,7 @@ Tournament Overview
                             if subset.empty:
                                 st.info("No matches on this court.")
                             else:
-                                render_schedule_table(subset, raw_data_all, key_prefix=f"home_sch_{idx}")
+                                render_schedule_table(subset, match_index, key_prefix=f"home_sch_{idx}", manual_scores=manual_scores_today)
             
             st.markdown("<div style='height: 10px;'></div>", unsafe_allow_html=True)
             if st.button("View Full Schedule", use_container_width=True, key="view_full_sch"):
@@ -1176,7 +650,7 @@ if st.session_state.active_tab == "STANDINGS":
     
     # Calculate Unified Standings
     # Calculate Unified Standings via Central Function
-    df_standings = calculate_power_rankings_v2(raw_data_all)
+    df_standings = calculate_power_rankings_v2()
     
     if df_standings.empty:
         st.info("No standings data available.")
@@ -1184,8 +658,8 @@ if st.session_state.active_tab == "STANDINGS":
         def render_group_table(df_g, group_name):
             st.markdown(f"<h4 style='color: #888; margin-top: 20px; font-family:\"Space Grotesk\";'>GROUP {group_name}</h4>", unsafe_allow_html=True)
             
-            # Sort: Wins DESC, PD DESC, PF DESC
-            df_g = df_g.sort_values(by=['W', 'PD', 'PF'], ascending=[False, False, False]).reset_index(drop=True)
+            # Sort: PTS, then tiebreakers (H2H, group PD, PD, PF) -- see src.core.standings
+            df_g = df_g.sort_values(by='GroupRank').reset_index(drop=True)
             
             # Table Header
             st.markdown("""
@@ -1289,7 +763,7 @@ Tournament Schedule
         st.markdown("</div>", unsafe_allow_html=True)
 
         # Small filter for Court
-        courts = ["All Courts"] + sorted(df_schedule['Court'].unique().tolist())
+        courts = ["All Courts"] + sorted(df_schedule['Court'].dropna().unique().tolist())
         sel_court = st.selectbox("Court Filter", courts, label_visibility="collapsed")
 
         filtered_sch = df_schedule.copy()
@@ -1303,7 +777,7 @@ Tournament Schedule
             filtered_sch = filtered_sch[filtered_sch['Gender'] == cat_filter]
 
         # Display Schedule in Compact Table View
-        render_schedule_table(filtered_sch, raw_data_all)
+        render_schedule_table(filtered_sch, match_index)
 
 
 # --- MATCH DASHBOARD ---
@@ -1399,7 +873,10 @@ if st.session_state.active_tab == "MATCH DASHBOARD":
         st.stop()
         
     selected_id = m_options[sel_label]
-    m = next(x for x in raw_data if str(x['MatchID']) == selected_id)
+    m = match_index.get(selected_id)
+    if m is None:
+        st.warning("Selected match not found. Please check data source.")
+        st.stop()
     
     # --- CONTEXT HEADER ---
     t1, t2 = m['Teams']['t1'], m['Teams']['t2']
@@ -1645,136 +1122,132 @@ Match Scoreboard
         elif period_mode == "2nd Half":
             q_curr = ["Q3", "Q4"]
         else:
-             # Custom
-             c1, c2, c3, c4 = st.columns(4)
-             with c1: 
-                 if st.checkbox("Q1", value=True, key="q1_check"): q_curr.append("Q1")
-             with c2:
-                 if st.checkbox("Q2", value=True, key="q2_check"): q_curr.append("Q2")
-             with c3:
-                 if st.checkbox("Q3", value=True, key="q3_check"): q_curr.append("Q3")
-             with c4:
-                 if st.checkbox("Q4", value=True, key="q4_check"): q_curr.append("Q4")
+             # Custom (Q1-Q4 plus any overtime periods this match has)
+             q_opts = ["Q1", "Q2", "Q3", "Q4"] + [q for q in period_cube.periods_for(m['MatchID']) if q not in ["Q1", "Q2", "Q3", "Q4"]]
+             q_cols = st.columns(len(q_opts))
+             for q_col, q in zip(q_cols, q_opts):
+                 with q_col:
+                     if st.checkbox(q, value=True, key=f"{q.lower()}_check"): q_curr.append(q)
 
         # Aggregation Logic
         if not q_curr:
             st.info("Select at least one period to view box scores.")
         else:
-            raw_recs = []
-            if set(q_curr) == {"Q1", "Q2", "Q3", "Q4"} and period_mode != "Custom":
-                for p, s in m['PlayerStats'].items():
-                    s_copy = s.copy()
-                    s_copy['Player'] = p
-                    raw_recs.append(s_copy)
-            else:
-                for q in q_curr:
-                    q_data = m.get('PeriodStats', {}).get(q, {})
-                    for p, s in q_data.items():
+            # Finished box score HTML per team, reused while the data version and selections are unchanged
+            box_key = ("box_score", data_version, str(m['MatchID']), period_mode, tuple(q_curr), stats_view)
+            box_html = fragment_cache.get(box_key)
+            if box_html is None:
+                box_html = {}
+                if set(q_curr) == {"Q1", "Q2", "Q3", "Q4"} and period_mode != "Custom":
+                    raw_recs = []
+                    for p, s in m['PlayerStats'].items():
                         s_copy = s.copy()
                         s_copy['Player'] = p
                         raw_recs.append(s_copy)
-            
-            df_active = pd.DataFrame(raw_recs)
-            if not df_active.empty:
-                if "MIN_DEC" in df_active.columns: df_active["MIN_CALC"] = df_active["MIN_DEC"]
-                df_active = ant.normalize_stats(df_active)
-                
-                if len(q_curr) != 4 or period_mode == "Custom":
-                    num_cols = df_active.select_dtypes(include=np.number).columns
-                    df_agg = df_active.groupby('Player')[num_cols].sum().reset_index()
-                    df_meta = df_active.groupby('Player')[["Team", "No"]].first().reset_index()
-                    df_active = pd.merge(df_agg, df_meta, on='Player')
-                
-                df_active = ant.calculate_derived_stats(df_active)
-
-                # --- OUTLIER & STAR PLAYER CALCULATION ---
-                # Major stats for outlier detection (including Advanced Metrics)
-                major_stats = ["PTS", "REB", "AST", "STL", "BLK", "GmScr", "OFFRTG", "DEFRTG", "TS%", "eFG%", "USG%", "PIE", "FIC"]
-                outlier_thresholds = {}
+                    df_active = pd.DataFrame(raw_recs)
+                else:
+                    # Summed over the selected periods from the precomputed cube
+                    df_active = period_cube.player_frame(q_curr, match_ids=[m['MatchID']])
+
+                if not df_active.empty:
+                    if "MIN_DEC" in df_active.columns: df_active["MIN_CALC"] = df_active["MIN_DEC"]
+                    df_active = ant.normalize_stats(df_active)
+                    df_active = ant.calculate_derived_stats(df_active)
+
+                    # --- OUTLIER & STAR PLAYER CALCULATION ---
+                    # Major stats for outlier detection (including Advanced Metrics)
+                    major_stats = ["PTS", "REB", "AST", "STL", "BLK", "GmScr", "OFFRTG", "DEFRTG", "TS%", "eFG%", "USG%", "PIE", "FIC"]
+                    outlier_thresholds = {}
                 
-                # Calculate thresholds across ALL players in this view
-                for stat in major_stats:
-                    if stat in df_active.columns:
-                        vals = pd.to_numeric(df_active[stat], errors='coerce').dropna()
-                        if not vals.empty:
-                            # Using Mean + 1.5 * StdDev as "Outlier" threshold
-                            outlier_thresholds[stat] = vals.mean() + (1.5 * vals.std())
+                    # Calculate thresholds across ALL players in this view
+                    for stat in major_stats:
+                        if stat in df_active.columns:
+                            vals = pd.to_numeric(df_active[stat], errors='coerce').dropna()
+                            if not vals.empty:
+                                # Using Mean + 1.5 * StdDev as "Outlier" threshold
+                                outlier_thresholds[stat] = vals.mean() + (1.5 * vals.std())
                             
-                # Identify Star Players (Top 2-3 per team based on GmScr)
-                star_players = []
-                for team_name in [t1, t2]:
-                    team_players = df_active[df_active["Team"] == team_name]
-                    if not team_players.empty:
-                        # Get up to 3 players with GmScr > 10 (arbitrary floor for "stars")
-                        top_p = team_players.sort_values("GmScr", ascending=False).head(3)
-                        # Ensure we only pick players who actually had a good game
-                        top_p = top_p[top_p["GmScr"] > team_players["GmScr"].mean()]
-                        star_players.extend(top_p["Player"].tolist())
-
-                # Prepare data based on view type
-                mode_arg = "Advanced" if stats_view == "Advanced" else "Standard" 
-                df_disp = ant.prepare_display_data(df_active, mode_arg)
+                    # Identify Star Players (Top 2-3 per team based on GmScr)
+                    star_players = []
+                    for team_name in [t1, t2]:
+                        team_players = df_active[df_active["Team"] == team_name]
+                        if not team_players.empty:
+                            # Get up to 3 players with GmScr > 10 (arbitrary floor for "stars")
+                            top_p = team_players.sort_values("GmScr", ascending=False).head(3)
+                            # Ensure we only pick players who actually had a good game
+                            top_p = top_p[top_p["GmScr"] > team_players["GmScr"].mean()]
+                            star_players.extend(top_p["Player"].tolist())
+
+                    # Prepare data based on view type
+                    mode_arg = "Advanced" if stats_view == "Advanced" else "Standard" 
+                    df_disp = ant.prepare_display_data(df_active, mode_arg)
                 
-                # Column selection based on view (Mapping internal keys to display names)
-                base_cols = ["No", "Player", "Mins"]
-                from src.analytics import TOTALS_MAP
+                    # Column selection based on view (Mapping internal keys to display names)
+                    base_cols = ["No", "Player", "Mins"]
+                    from src.analytics import TOTALS_MAP
                 
-                # Map highlight thresholds to display names
-                display_outlier_thresholds = {}
-                for k, v in outlier_thresholds.items():
-                    disp_k = TOTALS_MAP.get(k, k)
-                    display_outlier_thresholds[disp_k] = v
-
-                view_map = {
-                    # Standard Stats Tab
-                    "Summary": ["FGM", "FGA", "FG%", "3PM", "3PA", "3P%", "FTM", "FTA", "FT%", 
-                               "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS", "+/-", "GmScr"],
+                    # Map highlight thresholds to display names
+                    display_outlier_thresholds = {}
+                    for k, v in outlier_thresholds.items():
+                        disp_k = TOTALS_MAP.get(k, k)
+                        display_outlier_thresholds[disp_k] = v
+
+                    view_map = {
+                        # Standard Stats Tab
+                        "Summary": ["FGM", "FGA", "FG%", "3PM", "3PA", "3P%", "FTM", "FTA", "FT%", 
+                                   "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS", "+/-", "GmScr"],
                     
-                    # Advanced Stats Tab
-                    "Advanced": ["OFFRTG", "DEFRTG", "NETRTG", "AST%", "AST/TO", "AST RATIO", 
-                                "OREB%", "DREB%", "REB%", "TO RATIO", "eFG%", "TS%", "USG%", "PACE", "PIE"],
+                        # Advanced Stats Tab
+                        "Advanced": ["OFFRTG", "DEFRTG", "NETRTG", "AST%", "AST/TO", "AST RATIO", 
+                                    "OREB%", "DREB%", "REB%", "TO RATIO", "eFG%", "TS%", "USG%", "PACE", "PIE"],
                     
-                    # Scoring Breakdown Tab
-                    "Scoring": ["%FGA 2PT", "%FGA 3PT", "%PTS 2PT", "%PTS 2PT MR", "%PTS 3PT", 
-                               "%PTS FBPS", "%PTS FT", "%PTS OFFTO", "%PTS PITP", 
-                               "2FGM %AST", "2FGM %UAST", "3FGM %AST", "3FGM %UAST", 
-                               "FGM %AST", "FGM %UAST", "GmScr"],
+                        # Scoring Breakdown Tab
+                        "Scoring": ["%FGA 2PT", "%FGA 3PT", "%PTS 2PT", "%PTS 2PT MR", "%PTS 3PT", 
+                                   "%PTS FBPS", "%PTS FT", "%PTS OFFTO", "%PTS PITP", 
+                                   "2FGM %AST", "2FGM %UAST", "3FGM %AST", "3FGM %UAST", 
+                                   "FGM %AST", "FGM %UAST", "GmScr"],
                     
-                    # USG Tab (team-relative percentages)
-                    "USG": ["USG%", "%FGM", "%FGA", "%3PM", "%3PA", "%FTM", "%FTA", 
-                           "%OREB", "%DREB", "%REB", "%AST", "%TOV", "%STL", "%BLK", "%BLKA", 
-                           "%PF", "%PFD", "%PTS", "GmScr"],
+                        # USG Tab (team-relative percentages)
+                        "USG": ["USG%", "%FGM", "%FGA", "%3PM", "%3PA", "%FTM", "%FTA", 
+                               "%OREB", "%DREB", "%REB", "%AST", "%TOV", "%STL", "%BLK", "%BLKA", 
+                               "%PF", "%PFD", "%PTS", "GmScr"],
                     
-                    # Keep Playmaking and Defense for backward compatibility
-                    "Playmaking": ["AST", "TOV", "AST/TO", "AST%", "USG%"],
-                    "Defense": ["DREB", "STL", "BLK", "PF", "DEFRTG"]
-                }
+                        # Keep Playmaking and Defense for backward compatibility
+                        "Playmaking": ["AST", "TOV", "AST/TO", "AST%", "USG%"],
+                        "Defense": ["DREB", "STL", "BLK", "PF", "DEFRTG"]
+                    }
                 
-                target_internal = view_map.get(stats_view, [])
-                display_cols = list(base_cols)
-                for t in target_internal:
-                    disp_name = TOTALS_MAP.get(t, t)
-                    if disp_name in df_disp.columns:
-                        display_cols.append(disp_name)
-                    elif t in df_disp.columns:
-                        display_cols.append(t)
+                    target_internal = view_map.get(stats_view, [])
+                    display_cols = list(base_cols)
+                    for t in target_internal:
+                        disp_name = TOTALS_MAP.get(t, t)
+                        if disp_name in df_disp.columns:
+                            display_cols.append(disp_name)
+                        elif t in df_disp.columns:
+                            display_cols.append(t)
                 
-                final_cols = [c for c in display_cols if c in df_disp.columns]
-                df_disp = df_disp[final_cols]
-
+                    final_cols = [c for c in display_cols if c in df_disp.columns]
+                    df_disp = df_disp[final_cols]
+
+                    for team_name in [t1, t2]:
+                        players_in_team = df_active[df_active["Team"] == team_name]["Player"].unique()
+                        tdf = df_disp[df_disp["Player"].isin(players_in_team)].copy()
+                        if not tdf.empty:
+                            box_html[team_name] = ec.render_html_table(
+                                tdf, 
+                                star_players=star_players, 
+                                outlier_thresholds=display_outlier_thresholds
+                            )
+                fragment_cache.set(box_key, box_html)
+
+            if box_html:
                 # Render tables
                 st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
                 
                 def render_team_box(team_name):
-                    players_in_team = df_active[df_active["Team"] == team_name]["Player"].unique()
-                    tdf = df_disp[df_disp["Player"].isin(players_in_team)].copy()
-                    if not tdf.empty:
+                    if team_name in box_html:
                         st.markdown(f"<h5 style='font-family: \"Space Grotesk\", sans-serif; color: var(--tappa-orange); margin-bottom: 12px;'>{team_name}</h5>", unsafe_allow_html=True)
-                        st.markdown(ec.render_html_table(
-                            tdf, 
-                            star_players=star_players, 
-                            outlier_thresholds=display_outlier_thresholds
-                        ), unsafe_allow_html=True)
+                        st.markdown(box_html[team_name], unsafe_allow_html=True)
 
                 render_team_box(t1)
                 st.markdown("<div style='height: 10px;'></div>", unsafe_allow_html=True)
@@ -1792,47 +1265,14 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
     with c_period:
         period_sel = st.radio("Time Segment", ["Full Game", "1st Half", "2nd Half", "Q1", "Q2", "Q3", "Q4"], horizontal=True, index=0)
     
-    # Apply stage filter to raw_data before aggregating
+    # Apply stage filter to raw_data before aggregating (precomputed stage index)
     if stage_filter != "All Games":
-        knockout_stages = ["Quarterfinal", "Semifinal", "Final", "PQF", "QF", "SF"]
-        
-        # Load schedule with Genius Match IDs
-        filtered_matches = []
-        df_sch = dm.load_schedule()
-        
-        # Create lookup dict: Genius Match ID -> Group/Stage
-        if not df_sch.empty and 'Genius Match ID' in df_sch.columns:
-            # Filter out empty Genius IDs and create lookup
-            stage_lookup = df_sch[df_sch['Genius Match ID'].notna() & (df_sch['Genius Match ID'] != '')].set_index('Genius Match ID')['Group'].to_dict()
-            
-            for match in raw_data:
-                # Convert match ID to float to match the lookup dict keys
-                try:
-                    match_id = float(match.get("MatchID", 0))
-                except (ValueError, TypeError):
-                    match_id = None
-                
-                # Lookup stage using Genius Match ID
-                if match_id and match_id in stage_lookup:
-                    stage = stage_lookup[match_id]
-                    
-                    if stage_filter == "Knockouts":
-                        if stage in knockout_stages:
-                            filtered_matches.append(match)
-                    else:  # Group Stage
-                        if stage not in knockout_stages and stage not in ["LKO Final"]:
-                            filtered_matches.append(match)
-                else:
-                    # If not found in schedule, default to Group Stage
-                    if stage_filter == "Group Stage":
-                        filtered_matches.append(match)
-        
-        raw_data_filtered = filtered_matches if filtered_matches else raw_data
+        raw_data_filtered = stage_index.filter(raw_data, stage_filter) or raw_data
     else:
         raw_data_filtered = raw_data
     
     # Aggregate all daily stats with period filter
-    df_all_perfs = ant.get_daily_stats(raw_data_filtered, period=period_sel)
+    df_all_perfs = ant.get_daily_stats(raw_data_filtered, period=period_sel, cube=period_cube)
     
     if df_all_perfs.empty:
         if period_sel != "Full Game":
@@ -1865,29 +1305,39 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
 
             # TAB 1: LEADERBOARDS (Grid)
             with tab_lead:
+                # Boards are cached as finished HTML per (data version, match set, period, date)
+                lb_key = (data_version, "top_performances", tuple(str(mt.get("MatchID")) for mt in raw_data_filtered), period_sel, sel_date)
+                # Full-game boards come straight from the top-K index (same stage index as the filter above)
+                leaders = get_leaders() if period_sel == "Full Game" and (stage_filter == "All Games" or stage_index.has(stage_filter)) else None
+
+                def leader_rows(stat):
+                    if leaders is None:
+                        return df_view
+                    return leaders.single_game(stat, category=cat_filter, stage=stage_filter, date=None if sel_date == "Whole Tournament" else sel_date, k=5)
+
                 # Top Highs Grid (2x3)
                 r1_c1, r1_c2, r1_c3 = st.columns(3)
                 with r1_c1:
-                    ec.create_leader_board(df_view, "PTS", "Single Game Points", top_n=5, show_date=show_date_in_cards)
+                    ec.create_leader_board(leader_rows("PTS"), "PTS", "Single Game Points", top_n=5, show_date=show_date_in_cards, cache_key=lb_key)
                 with r1_c2:
                     if "REB" in df_view.columns:
-                        ec.create_leader_board(df_view, "REB", "Single Game Boards", top_n=5, show_date=show_date_in_cards)
+                        ec.create_leader_board(leader_rows("REB"), "REB", "Single Game Boards", top_n=5, show_date=show_date_in_cards, cache_key=lb_key)
                 with r1_c3:
                     if "AST" in df_view.columns:
-                        ec.create_leader_board(df_view, "AST", "Single Game Assists", top_n=5, show_date=show_date_in_cards)
+                        ec.create_leader_board(leader_rows("AST"), "AST", "Single Game Assists", top_n=5, show_date=show_date_in_cards, cache_key=lb_key)
                 
                 st.markdown("<div style='height: 10px;'></div>", unsafe_allow_html=True)
                 
                 r2_c1, r2_c2, r2_c3 = st.columns(3)
                 with r2_c1:
                     if "STL" in df_view.columns:
-                        ec.create_leader_board(df_view, "STL", "Single Game Steals", top_n=5, show_date=show_date_in_cards)
+                        ec.create_leader_board(leader_rows("STL"), "STL", "Single Game Steals", top_n=5, show_date=show_date_in_cards, cache_key=lb_key)
                 with r2_c2:
                     if "BLK" in df_view.columns:
-                        ec.create_leader_board(df_view, "BLK", "Single Game Blocks", top_n=5, show_date=show_date_in_cards)
+                        ec.create_leader_board(leader_rows("BLK"), "BLK", "Single Game Blocks", top_n=5, show_date=show_date_in_cards, cache_key=lb_key)
                 with r2_c3:
                     if "GmScr" in df_view.columns:
-                        ec.create_leader_board(df_view, "GmScr", "Impact (GmScr)", top_n=5, show_date=show_date_in_cards)
+                        ec.create_leader_board(leader_rows("GmScr"), "GmScr", "Impact (GmScr)", top_n=5, show_date=show_date_in_cards, cache_key=lb_key)
 
             # TAB 2: STANDARD STATS (Table)
             with tab_std:
@@ -1912,14 +1362,6 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
                 # Apply universal rounding (totals mode for box scores)
                 df_std = ant.apply_stat_rounding(df_std, mode="totals")
                 
-                # Apply styling to highlight max values
-                def highlight_max(s):
-                    """Highlight the maximum in a Series."""
-                    if s.name in ["PTS", "REB", "AST", "STL", "BLK", "FGM", "3PM", "FTM"]:
-                        is_max = s == s.max()
-                        return ['background-color: rgba(255, 133, 51, 0.3); font-weight: bold' if v else '' for v in is_max]
-                    return ['' for _ in s]
-                
                 # Create format dict for percentage columns
                 pct_cols = ["FG%", "3P%", "FT%", "Min", "GmScr"]
                 format_dict = {}
@@ -1927,7 +1369,8 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
                     if col in df_std.columns:
                         format_dict[col] = "{:.1f}"
                 
-                styled_df = df_std.style.apply(highlight_max).format(format_dict, na_rep="-")
+                # Highlight column maxima in one vectorized pass
+                styled_df = style_max(df_std, ["PTS", "REB", "AST", "STL", "BLK", "FGM", "3PM", "FTM"], format_dict)
                 
                 # Display dataframe without selection
                 st.dataframe(
@@ -1960,14 +1403,6 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
                 # Apply universal rounding (totals mode for box scores)
                 df_adv = ant.apply_stat_rounding(df_adv, mode="totals")
                 
-                # Apply styling to highlight max values
-                def highlight_max(s):
-                    """Highlight the maximum in a Series."""
-                    if s.name in ["PIE", "OFFRTG", "NETRTG", "TS%", "eFG%"]:
-                        is_max = s == s.max()
-                        return ['background-color: rgba(255, 133, 51, 0.3); font-weight: bold' if v else '' for v in is_max]
-                    return ['' for _ in s]
-                
                 # Create format dict for numeric columns
                 numeric_cols = ["OFFRTG", "DEFRTG", "NETRTG", "AST%", "AST/TO", "AST RATIO", "OREB%", "DREB%", "REB%", 
                                "TO RATIO", "eFG%", "TS%", "USG%", "PIE", "PPoss", "MIN"]
@@ -1976,7 +1411,8 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
                     if col in df_adv.columns:
                         format_dict[col] = "{:.1f}"
                 
-                styled_df = df_adv.style.apply(highlight_max).format(format_dict, na_rep="-")
+                # Highlight column maxima in one vectorized pass
+                styled_df = style_max(df_adv, ["PIE", "OFFRTG", "NETRTG", "TS%", "eFG%"], format_dict)
                 
                 # Display dataframe without selection
                 st.dataframe(
@@ -1996,7 +1432,7 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
                     try:
                         # Define columns we want to aggregate - Added MIN_DEC for USG calc
                         agg_cols = ["FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "OREB", "DREB",
-                                   "REB", "AST", "TOV", "STL", "BLK", "PF", "FD", "PTS", "MIN_DEC", "Mins"]
+                                   "REB", "AST", "TOV", "STL", "BLK", "PF", "FD", "PTS", "MIN_DEC"]
                         
                         # Only aggregate columns that actually exist in the full dataset
                         available_agg_cols = {col: "sum" for col in agg_cols if col in df_all_perfs.columns}
@@ -2105,7 +1541,8 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
                             df_usg_display.insert(0, "Rank", range(1, len(df_usg_display) + 1))
                             display_cols = ["Rank"] + available_cols
                             
-                            st.dataframe(df_usg_display[display_cols], use_container_width=True, hide_index=True, height=600)
+                            usg_view, usg_config = dataframe_config(df_usg_display[display_cols], precision=1)
+                            st.dataframe(usg_view, column_config=usg_config, use_container_width=True, hide_index=True, height=600)
                     except Exception as e:
                         st.error(f"Error calculating usage percentages: {str(e)}")
                         import traceback
@@ -2166,7 +1603,8 @@ elif st.session_state.active_tab == "TOP PERFORMANCES":
                     df_scoring_display.insert(0, "Rank", range(1, len(df_scoring_display) + 1))
                     display_cols = ["Rank"] + available_cols
                     
-                    st.dataframe(df_scoring_display[display_cols], use_container_width=True, hide_index=True, height=600)
+                    scoring_view, scoring_config = dataframe_config(df_scoring_display[display_cols])
+                    st.dataframe(scoring_view, column_config=scoring_config, use_container_width=True, hide_index=True, height=600)
                 else:
                     st.info("Scoring data not available.")
 
@@ -2185,63 +1623,9 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
         entity_type = st.radio("Entity", ["Players", "Teams"], horizontal=True)
         period_sel = st.radio("Time Segment", ["Full Game", "Q1", "Q2", "Q3", "Q4", "1st Half", "2nd Half"], horizontal=True, index=0)
     
-    # Apply stage filter to raw_data
+    # Apply stage filter to raw_data (precomputed stage index)
     if stage_filter != "All Games":
-        knockout_stages = ["Quarterfinal", "Semifinal", "Final", "PQF", "QF", "SF"]
-        
-        # Load categorization map (Source of Truth)
-        cat_map = dm.load_category_map()
-        league_ids = set(cat_map.get("league_stage", []))
-        knockout_ids = set(cat_map.get("knockouts", []))
-        
-        # Hardcoded fix for ID "31" (Services-Karnataka) -> Is League
-        league_ids.add("31")
-        league_ids.add("2797633")
-
-        filtered_matches = []
-        for match in raw_data:
-            match_id = str(match.get("MatchID", ""))
-            
-            # 1. Check Explicit Categorization First
-            if stage_filter == "Knockouts":
-                if match_id in knockout_ids:
-                    filtered_matches.append(match)
-            else: # Group Stage
-                if match_id in league_ids:
-                    filtered_matches.append(match)
-                elif match_id not in knockout_ids:
-                    # Fallback Logic: Only include if explicitly NOT knockout
-                    # And maybe check schedule CSV for "Group" column as backup?
-                    # For now, if it's not in knockouts list, and not explicitly League,
-                    # We risk including it. But we just patched the JSON to include ALL games.
-                    # So unknowns effectively don't exist if our patch was good.
-                    # However, to be safe, if it's NOT in Knockouts, we typically assume Group.
-                    # BUT "Placing" games might not be in either if we missed some.
-                    # Given we patched 56/56 games, this safe.
-                    pass
-        
-        # Double check fallback for safety if categorization failed
-        if not filtered_matches and not cat_map:
-             # Fallback to old schedule logic if JSON load failed
-             df_sch = dm.load_schedule()
-             stage_lookup = df_sch[df_sch['Genius Match ID'].notna() & (df_sch['Genius Match ID'] != '')].set_index('Genius Match ID')['Group'].to_dict()
-             
-             for match in raw_data:
-                try:
-                    mid_f = float(match.get("MatchID", 0))
-                except: mid_f = 0
-                
-                # Check schedule
-                if mid_f in stage_lookup:
-                    stg = stage_lookup[mid_f]
-                    if stage_filter == "Knockouts" and stg in knockout_stages:
-                        filtered_matches.append(match)
-                    elif stage_filter == "Group Stage" and stg not in knockout_stages:
-                        filtered_matches.append(match)
-                elif stage_filter == "Group Stage":
-                    filtered_matches.append(match)
-        
-        raw_data_filtered = filtered_matches if filtered_matches else raw_data
+        raw_data_filtered = stage_index.filter(raw_data, stage_filter) or raw_data
     else:
         raw_data_filtered = raw_data
         
@@ -2252,9 +1636,9 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
         stat_mode = st.radio("Stats Mode", opts, horizontal=True)
 
     # --- AGGREGATION ---
-    # --- AGGREGATION ---
-    df_p_all, _ = MetricsEngine.get_tournament_stats(raw_data_filtered, period=period_sel, entity_type="Players")
-    _, df_t_all = MetricsEngine.get_tournament_stats(raw_data_filtered, period=period_sel, entity_type="Teams")
+    # One pass (and one cache entry) for both Players and Teams
+    stats_bundle = MetricsEngine.get_tournament_bundle(raw_data_filtered, period=period_sel, _cube=period_cube, data_version=data_version, _tables=match_tables)
+    df_p_all, df_t_all = stats_bundle["players"], stats_bundle["teams"]
     
     if df_p_all.empty:
         st.warning("No matched processed yet.")
@@ -2269,61 +1653,9 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
             # df_view['Player'] = df_view['Team'] # REMOVED: analytics engine improved
             
         # --- MODE LOGIC ---
-        # Identify columns to scale (All numeric except Metadata and RATE STATS)
-        exclude_cols = ["No", "GP", "MatchID", "Team"]
-        
-        # Rate stats that should NOT be divided (they're already rates/percentages)
-        rate_stats = ["USG%", "AST%", "FG%", "2P%", "3P%", "FT%", "eFG%", "TS%", 
-                     "OFFRTG", "DEFRTG", "NETRTG", "PIE", "OREB%", "DREB%", "REB%",
-                     "TO RATIO", "AST RATIO", "AST/TO"]
-        
-        exclude_cols.extend(rate_stats)
-        numeric_cols = [c for c in df_view.select_dtypes(include=np.number).columns if c not in exclude_cols]
-        
-        df_display = df_view.copy()
-        
-        if stat_mode == "Per Game":
-            for c in numeric_cols:
-                # Ensure we don't divide if column missing (select_dtypes handles this but good to specific)
-                df_display[c] = (df_display[c] / df_display['GP']).round(1)
-                    
-        elif stat_mode == "Per 36 Min":
-            # Avoiding divide by zero
-            valid_mins = df_display['MIN_CALC'] > 0
-            df_display = df_display[valid_mins].copy()
-            factor = df_display['MIN_CALC'] / 36.0
-            
-            for c in numeric_cols:
-                if c != "MIN_CALC": # Don't divide MIN_CALC yet
-                    df_display[c] = (df_display[c] / factor).round(1)
-            df_display['MIN_CALC'] = 36.0 # Set explicit
-            
-        # Preserve USG% from MetricsEngine (it's already correctly calculated)
-        # Recalculating after per-game division breaks the formula because _TmMin becomes per-game
-        usg_preserved = df_display['USG%'].copy() if 'USG%' in df_display.columns else None
-            
-        # Recalculate Derived (Correct % and Ratings)
-        # Recalculate Derived (Correct % and Ratings)
-        if entity_type == "Players":
-            df_display = ant.calculate_derived_stats(df_display)
-        else:
-            df_display = ant.calculate_derived_team_stats(df_display)
-        
-        # Restore preserved USG% (don't use the recalculated one)
-        if usg_preserved is not None:
-            df_display['USG%'] = usg_preserved
-        
-        # Default Sort: Points or PPG
-        if not df_display.empty:
-            sort_col = "PTS" if "PTS" in df_display.columns else df_display.columns[0]
-            df_display = df_display.sort_values(by=sort_col, ascending=False)
-            
-            # Apply universal rounding to the display dataframe (fixes Leaderboards)
-            rounding_mode = "totals"
-            if stat_mode == "Per Game": rounding_mode = "per_game"
-            elif stat_mode == "Per 36 Min": rounding_mode = "per_36"
-            
-            df_display = ant.apply_stat_rounding(df_display, mode=rounding_mode)
+        # Scale (Per Game / Per 36), re-derive, sort and round for display
+        numeric_cols = MetricsEngine.mode_scaled_columns(df_view)
+        df_display = MetricsEngine.apply_stat_mode(df_view, stat_mode, entity_type)
         
         # --- DISPLAY ---
         ts_leaders, ts1, ts2, ts_usg, ts_scoring = st.tabs(["Leaders", "Standard Stats", "Advanced Stats", "USG", "SCORING"])
@@ -2342,16 +1674,27 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
                 if "GP" in df_leaders.columns:
                     df_leaders = df_leaders[df_leaders["GP"] >= 3]
                 
+                # Boards are cached as finished HTML per (data version, match set, period, mode)
+                lb_key = (data_version, "tournament_leaders", tuple(str(mt.get("MatchID")) for mt in raw_data_filtered), period_sel, stat_mode)
+                # Full-game boards come from the top-K index (qualifier applied there);
+                # it uses the same stage index as the filter above
+                leaders = get_leaders() if period_sel == "Full Game" and (stage_filter == "All Games" or stage_index.has(stage_filter)) else None
+
+                def leader_rows(stat):
+                    if leaders is None:
+                        return df_leaders
+                    return leaders.season(stat, category=cat_filter, stage=stage_filter, mode=stat_mode, qualified=True, k=5)
+
                 # Row 1: Primary Stats
                 r1_c1, r1_c2, r1_c3 = st.columns(3)
                 with r1_c1:
-                    ec.create_leader_board(df_leaders, "PTS", "Scoring Leaders", top_n=5)
+                    ec.create_leader_board(leader_rows("PTS"), "PTS", "Scoring Leaders", top_n=5, cache_key=lb_key)
                 with r1_c2:
                     if "REB" in df_leaders.columns:
-                        ec.create_leader_board(df_leaders, "REB", "Rebound Leaders", top_n=5)
+                        ec.create_leader_board(leader_rows("REB"), "REB", "Rebound Leaders", top_n=5, cache_key=lb_key)
                 with r1_c3:
                     if "AST" in df_leaders.columns:
-                        ec.create_leader_board(df_leaders, "AST", "Assist Leaders", top_n=5)
+                        ec.create_leader_board(leader_rows("AST"), "AST", "Assist Leaders", top_n=5, cache_key=lb_key)
                 
                 st.markdown("<div style='height: 10px;'></div>", unsafe_allow_html=True)
                 
@@ -2359,13 +1702,13 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
                 r2_c1, r2_c2, r2_c3 = st.columns(3)
                 with r2_c1:
                     if "STL" in df_leaders.columns:
-                        ec.create_leader_board(df_leaders, "STL", "Steal Leaders", top_n=5)
+                        ec.create_leader_board(leader_rows("STL"), "STL", "Steal Leaders", top_n=5, cache_key=lb_key)
                 with r2_c2:
                     if "BLK" in df_leaders.columns:
-                        ec.create_leader_board(df_leaders, "BLK", "Block Leaders", top_n=5)
+                        ec.create_leader_board(leader_rows("BLK"), "BLK", "Block Leaders", top_n=5, cache_key=lb_key)
                 with r2_c3:
                     if "GmScr" in df_leaders.columns:
-                        ec.create_leader_board(df_leaders, "GmScr", "Impact (GmScr)", top_n=5)
+                        ec.create_leader_board(leader_rows("GmScr"), "GmScr", "Impact (GmScr)", top_n=5, cache_key=lb_key)
             else:
                 st.info("Leader boards available for Players view only")
         
@@ -2403,14 +1746,6 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
                           "OREB", "DREB", "REB", "AST", "TOV", "STL", "BLK",
                           "PF", "FD", "DD2", "TD3"]
                           
-            # Apply styling to highlight max values
-            def highlight_max(s):
-                """Highlight the maximum in a Series."""
-                if s.name in count_cols: # Use predefined count_cols instead of hardcoded list
-                    is_max = s == s.max()
-                    return ['background-color: rgba(255, 133, 51, 0.3); font-weight: bold' if v else '' for v in is_max]
-                return ['' for _ in s]
-            
             # Create format dict for percentage columns
             pct_cols = ["FG%", "3P%", "FT%", "eFG%", "TS%", "USG%", "AST%", 
                        "OREB%", "DREB%", "REB%", "TO RATIO", "AST RATIO"]
@@ -2431,7 +1766,8 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
                     if col in df_std.columns and col != "+/-":  # +/- can be negative, keep as int
                         format_dict[col] = "{:.0f}"
             
-            styled_df = df_std.style.apply(highlight_max).format(format_dict, na_rep="-")
+            # Highlight column maxima in one vectorized pass
+            styled_df = style_max(df_std, count_cols, format_dict)
             
             # Display dataframe without selection
             st.dataframe(
@@ -2466,21 +1802,14 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
             # Apply universal rounding (use totals mode for advanced stats)
             df_adv = ant.apply_stat_rounding(df_adv, mode="totals")
             
-            # Apply styling to highlight max values
-            def highlight_max(s):
-                """Highlight the maximum in a Series."""
-                if s.name in ["PIE", "OFFRTG", "NETRTG", "TS%", "eFG%"]:
-                    is_max = s == s.max()
-                    return ['background-color: rgba(255, 133, 51, 0.3); font-weight: bold' if v else '' for v in is_max]
-                return ['' for _ in s]
-            
             # Create format dict for numeric columns
             format_dict = {}
             for col in numeric_cols:
                 if col in df_adv.columns:
                     format_dict[col] = "{:.1f}"
             
-            styled_df = df_adv.style.apply(highlight_max).format(format_dict, na_rep="-")
+            # Highlight column maxima in one vectorized pass
+            styled_df = style_max(df_adv, ["PIE", "OFFRTG", "NETRTG", "TS%", "eFG%"], format_dict)
             
             # Display dataframe without selection
             st.dataframe(
@@ -2503,7 +1832,7 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
             if entity_type == "Players" and not df_usg_base.empty:
                 try:
                     # Use Centralized Metrics Engine
-                    df_usg, _ = MetricsEngine.get_tournament_stats(raw_data, period=period_sel, entity_type="Players")
+                    df_usg, _ = MetricsEngine.get_tournament_stats(raw_data, period=period_sel, entity_type="Players", cube=period_cube, data_version=data_version, tables=match_tables)
                     
                     if not df_usg.empty:
                          # Filter to > 0 GP just in case
@@ -2557,7 +1886,8 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
                          df_usg.insert(0, "Rank", range(1, len(df_usg) + 1))
                          display_cols_final = ["Rank"] + display_cols
                          
-                         st.dataframe(df_usg[display_cols_final], use_container_width=True, hide_index=True)
+                         usg_view, usg_config = dataframe_config(df_usg[display_cols_final], precision=1)
+                         st.dataframe(usg_view, column_config=usg_config, use_container_width=True, hide_index=True)
                 except Exception as e:
                     st.error(f"Error calculating USG metrics: {e}")
             else:
@@ -2607,7 +1937,8 @@ elif st.session_state.active_tab == "TOURNAMENT STATS":
                     df_scoring_display.insert(0, "Rank", range(1, len(df_scoring_display) + 1))
                     display_cols = ["Rank"] + available_cols
                     
-                    st.dataframe(df_scoring_display[display_cols], use_container_width=True, hide_index=True, height=600)
+                    scoring_view, scoring_config = dataframe_config(df_scoring_display[display_cols])
+                    st.dataframe(scoring_view, column_config=scoring_config, use_container_width=True, hide_index=True, height=600)
                 else:
                     st.info("Scoring data not available.")
             else:
@@ -2625,7 +1956,7 @@ elif st.session_state.active_tab == "BRACKET":
     
     # Load Schedule for Bracket Data
     df_sch_bracket = dm.load_schedule()
-    manual_scores_bracket = dm.load_manual_scores()
+    score_store_bracket = dm.get_manual_score_store()
     
     if df_sch_bracket.empty:
         st.info("Schedule data not available for brackets.")
@@ -2677,16 +2008,8 @@ elif st.session_state.active_tab == "BRACKET":
                 except:
                     s1, s2 = "-", "-"
             else:
-                # Fallback to manual_scores dict
-                m_key = f"{t1.upper()}_VS_{t2.upper()}_{m_row['Gender'].upper()}"
-                m_score = manual_scores_bracket.get(m_key)
-                
-                if not m_score:
-                     # Try reverse key
-                     m_key_rev = f"{t2.upper()}_VS_{t1.upper()}_{m_row['Gender'].upper()}"
-                     m_score_rev = manual_scores_bracket.get(m_key_rev)
-                     if m_score_rev:
-                         m_score = {"s1": m_score_rev["s2"], "s2": m_score_rev["s1"]}
+                # Fallback to manual scores (either key order, oriented to Team A / Team B)
+                m_score = score_store_bracket.lookup(t1, t2, m_row['Gender'])
                 
                 s1 = m_score['s1'] if m_score else "-"
                 s2 = m_score['s2'] if m_score else "-"
@@ -2942,36 +2265,42 @@ elif st.session_state.active_tab == "BRACKET":
 # --- LEADERBOARDS ---
 elif st.session_state.active_tab == "LEADERBOARDS":
     # Get aggregated player data
-    df_p_all, _ = MetricsEngine.get_tournament_stats(raw_data, period="Full Game", entity_type="Players")
+    df_p_all, _ = MetricsEngine.get_tournament_stats(raw_data, period="Full Game", entity_type="Players", data_version=data_version, tables=match_tables)
     
     if df_p_all.empty:
         st.warning("No player data available.")
         st.stop()
         
     # Ensure Advanced Metrics are calculated
-    df_p_all = ant.calculate_derived_stats(df_p_all)
+    df_p_all = ant.calculate_derived_stats(df_p_all, metrics=ant.LEADERBOARD_METRICS)
     
     # Filter out players with 0 games played
     df_p_all = df_p_all[df_p_all['GP'] > 0].copy()
     
     # Simple selectors - NO GENDER FILTER FOR NOW
-    teams_list = sorted(df_p_all['Team'].unique()) if 'Team' in df_p_all.columns else []
+    # Sorted rosters + ranked name search, built once per data version / category
+    player_search = get_player_search(data_version, cat_filter, df_p_all)
+    teams_list = player_search.teams
     
     c_p1, c_p2 = st.columns([1, 1])
     
     with c_p1:
         sel_team_prof = st.selectbox("Filter by Team", ["All Teams"] + teams_list, key="prof_team")
+        prof_query = st.text_input("Search Player", key="prof_search", placeholder="Name, part of a name or team")
     
     with c_p2:
-        if sel_team_prof != "All Teams":
-            p_opts = sorted(df_p_all[df_p_all['Team'] == sel_team_prof]['Player'].unique())
-        else:
-            p_opts = sorted(df_p_all['Player'].unique())
+        p_opts = player_search.filter_options(prof_query, sel_team_prof)
+        if not p_opts and prof_query:
+            st.caption(f"No players match \"{prof_query}\".")
+            p_opts = player_search.options(sel_team_prof)
         
         if not p_opts:
             st.warning("No players available.")
             st.stop()
             
+        # Keep the selection on the best search hit when the options change
+        if st.session_state.get("prof_player") not in p_opts:
+            st.session_state.prof_player = p_opts[0]
         sel_player_prof = st.selectbox("Select Player", p_opts, key="prof_player")
     
     # Get Player Stats
@@ -2983,9 +2312,7 @@ elif st.session_state.active_tab == "LEADERBOARDS":
     # 1. CORE HEADER CARD (Name, Team, GP, PPG, RPG, APG, FIC)
     if sel_player_prof:
         # Strip team suffix to get raw player name for data lookup
-        player_name_raw = sel_player_prof
-        if " (" in player_name_raw:
-            player_name_raw = player_name_raw.split(" (")[0]
+        player_name_raw = player_search.raw_name(sel_player_prof)
         
         # Get player data
         row_p = df_p_all[df_p_all['Player'] == sel_player_prof]
@@ -3137,103 +2464,8 @@ elif st.session_state.active_tab == "LEADERBOARDS":
 
     st.markdown("<div style='height: 32px;'></div>", unsafe_allow_html=True)
     
-    game_log = []
-    
-    # Use raw_data_all to show all games regardless of category filter
-    for match in raw_data_all:
-        # Check PeriodStats for player participation (more reliable)
-        player_found = False
-        player_match_stats = None
-        
-        # First try PlayerStats (aggregated match-level) - use raw name
-        if 'PlayerStats' in match and player_name_raw in match['PlayerStats']:
-            player_match_stats = match['PlayerStats'][player_name_raw]
-            player_found = True
-        else:
-            # Try to find in PeriodStats (quarter-by-quarter)
-            period_stats = match.get('PeriodStats', {})
-            combined_stats = {}
-            
-            for quarter, players in period_stats.items():
-                if player_name_raw in players:
-                    player_found = True
-                    # Aggregate stats across quarters
-                    for stat_key, stat_val in players[player_name_raw].items():
-                        if stat_key in ['Team', 'No', 'Player']:
-                            combined_stats[stat_key] = stat_val
-                        else:
-                            combined_stats[stat_key] = combined_stats.get(stat_key, 0) + stat_val
-            
-            if player_found:
-                # Calculate derived stats for this game
-                player_match_stats = combined_stats
-                # Quick FIC and GmScr calculation
-                player_match_stats['FIC'] = (
-                    player_match_stats.get('PTS', 0) + 
-                    player_match_stats.get('OREB', 0) + 
-                    0.75 * player_match_stats.get('DREB', 0) + 
-                    player_match_stats.get('AST', 0) + 
-                    player_match_stats.get('STL', 0) + 
-                    player_match_stats.get('BLK', 0) - 
-                    0.75 * player_match_stats.get('FGA', 0) - 
-                    0.375 * player_match_stats.get('FTA', 0) - 
-                    player_match_stats.get('TOV', 0) - 
-                    0.5 * player_match_stats.get('PF', 0)
-                )
-                player_match_stats['GmScr'] = (
-                    player_match_stats.get('PTS', 0) + 
-                    0.4 * player_match_stats.get('FGM', 0) - 
-                    0.7 * player_match_stats.get('FGA', 0) - 
-                    0.4 * (player_match_stats.get('FTA', 0) - player_match_stats.get('FTM', 0)) + 
-                    0.7 * player_match_stats.get('OREB', 0) + 
-                    0.3 * player_match_stats.get('DREB', 0) + 
-                    player_match_stats.get('STL', 0) + 
-                    0.7 * player_match_stats.get('AST', 0) + 
-                    0.7 * player_match_stats.get('BLK', 0) - 
-                    0.4 * player_match_stats.get('PF', 0) - 
-                    player_match_stats.get('TOV', 0)
-                )
-        
-        if player_found and player_match_stats:
-            # Determine opponent
-            t1, t2 = match['Teams']['t1'], match['Teams']['t2']
-            opponent = t2 if t1 == player_team else t1
-            
-            # Determine result (W/L)
-            team_stats = match.get('TeamStats', {})
-            if 't1' in team_stats and 't2' in team_stats:
-                s1 = team_stats['t1'].get('PTS', 0)
-                s2 = team_stats['t2'].get('PTS', 0)
-                
-                if t1 == player_team:
-                    result = "W" if s1 > s2 else "L"
-                    score = f"{s1}-{s2}"
-                else:
-                    result = "W" if s2 > s1 else "L"
-                    score = f"{s2}-{s1}"
-            else:
-                result = "-"
-                score = "-"
-            
-            # Get date
-            date = match.get('Metadata', {}).get('MatchDate', 'Unknown')
-            
-            # Extract key stats
-            game_log.append({
-                'Date': date,
-                'Opponent': opponent,
-                'Result': result,
-                'MIN': player_match_stats.get('MIN_DEC', 0),
-                'Score': score,
-                'PTS': player_match_stats.get('PTS', 0),
-                'REB': player_match_stats.get('REB', 0),
-                'AST': player_match_stats.get('AST', 0),
-                'FG': f"{int(player_match_stats.get('FGM', 0))}/{int(player_match_stats.get('FGA', 0))}",
-                '3P': f"{int(player_match_stats.get('3PM', 0))}/{int(player_match_stats.get('3PA', 0))}",
-                'FT': f"{int(player_match_stats.get('FTM', 0))}/{int(player_match_stats.get('FTA', 0))}",
-                'FIC': round(player_match_stats.get('FIC', 0), 1),
-                'GmScr': round(player_match_stats.get('GmScr', 0), 1)
-            })
+    # Player -> games index over raw_data_all (all games regardless of category filter)
+    game_log = player_index.game_log(player_name_raw, player_team)
     
     # 4. GAME LOG
     st.markdown("""
@@ -3260,34 +2492,38 @@ elif st.session_state.active_tab == "PLAYER PROFILE":
     """, unsafe_allow_html=True)
     
     # Get all player data
-    df_p_all, _ = MetricsEngine.get_tournament_stats(raw_data, period="Full Game", entity_type="Players")
+    df_p_all, _ = MetricsEngine.get_tournament_stats(raw_data, period="Full Game", entity_type="Players", data_version=data_version, tables=match_tables)
     
     if df_p_all.empty:
         st.warning("No player data available.")
         st.stop()
     
     # Ensure advanced metrics
-    df_p_all = ant.calculate_derived_stats(df_p_all)
+    df_p_all = ant.calculate_derived_stats(df_p_all, metrics=ant.PROFILE_METRICS)
     df_p_all = df_p_all[df_p_all['GP'] > 0].copy()
     
     # Player Selection
     c_team, c_player = st.columns([1, 2])
     
-    teams_list = sorted(df_p_all['Team'].unique()) if 'Team' in df_p_all.columns else []
+    player_search = get_player_search(data_version, cat_filter, df_p_all)
+    teams_list = player_search.teams
     
     with c_team:
         sel_team = st.selectbox("Filter by Team", ["All Teams"] + teams_list, key="pp_team")
     
     with c_player:
-        if sel_team != "All Teams":
-            player_opts = sorted(df_p_all[df_p_all['Team'] == sel_team]['Player'].unique())
-        else:
-            player_opts = sorted(df_p_all['Player'].unique())
+        pp_query = st.text_input("Search Player", key="pp_search", placeholder="Name, part of a name or team")
+        player_opts = player_search.filter_options(pp_query, sel_team)
+        if not player_opts and pp_query:
+            st.caption(f"No players match \"{pp_query}\".")
+            player_opts = player_search.options(sel_team)
         
         if not player_opts:
             st.warning("No players available")
             st.stop()
         
+        if st.session_state.get("pp_player") not in player_opts:
+            st.session_state.pp_player = player_opts[0]
         selected_player = st.selectbox("Select Player", player_opts, key="pp_player")
     
     # Get player stats
@@ -3403,7 +2639,8 @@ elif st.session_state.active_tab == "PLAYER PROFILE":
         st.markdown("<h3 style='font-family: \"Space Grotesk\", sans-serif; margin-top: 20px;'>Game-by-Game Performance</h3>", unsafe_allow_html=True)
         
         # Get individual game data
-        game_stats = ant.get_daily_stats(raw_data, period="Full Game")
+        # Only the selected player's matches (same category filter as raw_data)
+        game_stats = ant.get_daily_stats(player_index.matches(selected_player, cat_filter), period="Full Game")
         
         if not game_stats.empty:
             player_games = game_stats[game_stats['Player'] == selected_player].copy()
@@ -3472,14 +2709,14 @@ elif st.session_state.active_tab == "COMPARISON":
     st.header("Player Comparison")
     
     # Get aggregated player data
-    df_p_all_comp, _ = MetricsEngine.get_tournament_stats(raw_data, period="Full Game", entity_type="Players")
+    df_p_all_comp, _ = MetricsEngine.get_tournament_stats(raw_data, period="Full Game", entity_type="Players", data_version=data_version, tables=match_tables)
     
     if df_p_all_comp.empty:
         st.warning("No player data available.")
         st.stop()
         
     # Ensure Advanced Metrics
-    df_p_all_comp = ant.calculate_derived_stats(df_p_all_comp)
+    df_p_all_comp = ant.calculate_derived_stats(df_p_all_comp, metrics=ant.COMPARISON_METRICS)
     
     # Filter out players with 0 games played
     df_p_all_comp = df_p_all_comp[df_p_all_comp['GP'] > 0].copy()
@@ -3577,14 +2814,27 @@ elif st.session_state.active_tab == "COMPARISON":
     
     st.markdown("<div style='height: 16px;'></div>", unsafe_allow_html=True)
     
-    # Multi-Select Players
-    all_p_names = sorted(df_p_all_comp['Player'].unique())
-    comp_players = st.multiselect("Select Players to Compare (Max 4)", all_p_names, max_selections=4)
+    # Multi-Select Players (search box adds the best match to the selection)
+    comp_search = get_player_search(data_version, cat_filter, df_p_all_comp)
+    all_p_names = comp_search.options()
+    if "comp_players" not in st.session_state:
+        st.session_state.comp_players = []
+    
+    def on_comp_search():
+        hits = comp_search.search(st.session_state.comp_search, limit=1)
+        chosen = st.session_state.comp_players
+        if hits and hits[0] not in chosen and len(chosen) < 4:
+            st.session_state.comp_players = chosen + hits
+        st.session_state.comp_search = ""
+    
+    st.text_input("Quick Add Player", key="comp_search", on_change=on_comp_search,
+                  placeholder="Type a name (typos and spelling variants are fine) and press Enter")
+    comp_players = st.multiselect("Select Players to Compare (Max 4)", all_p_names, max_selections=4, key="comp_players")
     
     if comp_players:
         comp_df = df_p_all_comp[df_p_all_comp['Player'].isin(comp_players)].copy()
         
-        # Radar Chart
+        # Radar Chart (plotly is only loaded once a comparison is drawn)
         import plotly.graph_objects as go
         
         # --- DYNAMIC METRIC CONFIGURATION ---
@@ -3805,9 +3055,7 @@ elif st.session_state.active_tab == "COMPARISON":
         # Add player headers with their assigned colors
         for idx, (i, row) in enumerate(comp_df.iterrows()):
             color = colors[idx % len(colors)]
-            p_name = str(row["Player"])
-            if " (" in p_name:
-                p_name = p_name.split(" (")[0]
+            p_name = comp_search.raw_name(str(row["Player"]))
             table_html += f'<th class="player-header" style="background: {color}; font-family: \'Space Grotesk\', sans-serif;">{p_name}</th>'
         
         table_html += """
@@ -3903,3 +3151,6 @@ Powered by <span style='color: var(--tappa-orange); font-weight: 600;'>Tappa Pro
 Made by <span style='color: var(--tappa-orange); font-weight: 600;'>Kev Media</span> | Data from Basketball India
 </div>
 </div>""", unsafe_allow_html=True)
+
+profiler.end()
+profiler.render_panel(prof)
@@ -3,6 +3,55 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 import src.analytics as ant
+from src.core import columnar_store as cs
+from src.core.player_identity import get_identity_table
+from src.core.schema import as_category, plain_frame
+
+# Counting columns summed into team-game and tournament totals
+AGG_COLS = ["FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "OREB", "DREB",
+            "REB", "AST", "TOV", "STL", "BLK", "PF", "FD", "PTS", "MIN_DEC", "Mins",
+            "OffPTS", "DefPTS", "TmPoss", "OppPoss"]
+
+# Never scaled by Per Game / Per 36 Min (metadata and stats that are already rates)
+MODE_EXCLUDE_COLS = ["No", "GP", "MatchID", "Team", "P_KEY"]
+MODE_RATE_STATS = ["USG%", "AST%", "FG%", "2P%", "3P%", "FT%", "eFG%", "TS%",
+                   "OFFRTG", "DEFRTG", "NETRTG", "PIE", "OREB%", "DREB%", "REB%",
+                   "TO RATIO", "AST RATIO", "AST/TO"]
+
+
+def weighted_mean(df, by, value_cols, weight_col="MIN_DEC", default=0.0):
+    """
+    Vectorized per-group weighted average: sum(w * x) / sum(w), in place of
+    groupby(...).apply(np.average). Currently only the minute-weighted
+    USG_Robust column uses it; TS%, PIE and the other rates are re-derived
+    from summed totals instead. Groups whose total weight is 0 get `default`.
+    Returns a Series for a single value column, a DataFrame otherwise.
+    """
+    single = isinstance(value_cols, str)
+    cols = [value_cols] if single else list(value_cols)
+    by_cols = [by] if isinstance(by, str) else list(by)
+
+    w = pd.to_numeric(df[weight_col], errors="coerce").fillna(0)
+    parts = df[by_cols].copy()
+    for col in cols:
+        parts[col] = pd.to_numeric(df[col], errors="coerce") * w
+    parts["__w__"] = w
+
+    sums = parts.groupby(by_cols, sort=True).sum()
+    total_w = sums.pop("__w__")
+    out = sums.div(total_w.where(total_w > 0), axis=0)
+    out.loc[total_w <= 0] = default
+
+    return out[cols[0]] if single else out
+
+def match_ids_key(match_list):
+    """Hashable identity of a match list (its MatchIDs in order) for cache keys."""
+    return tuple(str(m.get("MatchID")) for m in match_list)
+
+
+def _current_data_version():
+    import src.data_manager as dm
+    return dm.get_data_version()
 
 class MetricsEngine:
     """
@@ -11,234 +60,380 @@ class MetricsEngine:
     """
 
     @staticmethod
-    @st.cache_data(show_spinner=False)
-    def get_tournament_stats(raw_data, period="Full Game", entity_type="Players"):
+    def get_tournament_stats(raw_data, period="Full Game", entity_type="Players", cube=None, data_version=None,
+                             tables=None):
         """
         Main entry point to get aggregated tournament stats.
         Handles the complex logic of "Active Game Totals" for USG%.
+        Players and Teams are served from the same cached bundle.
         """
-        # 1. Get Daily Stats (Player-Game Level)
-        df_daily = ant.get_daily_stats(raw_data, period=period)
-        
+        bundle = MetricsEngine.get_tournament_bundle(raw_data, period=period, _cube=cube, data_version=data_version,
+                                                     _tables=tables)
+        return MetricsEngine._select_entity(bundle, entity_type)
+
+    @staticmethod
+    def get_tournament_stats_from_tables(tables, period="Full Game", entity_type="Players"):
+        """
+        Same as get_tournament_stats over every match of the typed tables
+        (dm.load_match_tables), for offline / batch use. The hub passes the
+        tables to get_tournament_stats instead, which restricts them to its
+        match list and shares the data_version-keyed cache.
+        """
+        bundle = MetricsEngine.get_tournament_bundle_from_tables(tables, period=period)
+        return MetricsEngine._select_entity(bundle, entity_type)
+
+    @staticmethod
+    def get_tournament_bundle(raw_data, period="Full Game", _cube=None, data_version=None, _tables=None):
+        """
+        One aggregation pass for a period: returns a dict with the player-game frame
+        ("daily"), per-game team totals ("team_game_totals") and the tournament
+        "players" and "teams" aggregates.
+        Cached per (data version, MatchIDs, period): the match list itself is never
+        hashed. data_version defaults to dm.get_data_version().
+        _tables: columnar tables of the same data (dm.get_match_tables); on a cache
+        miss the player-game frame is read from them (restricted to raw_data's
+        MatchIDs, with raw_data's categories) instead of flattening the dicts.
+        """
+        if data_version is None:
+            data_version = _current_data_version()
+        return MetricsEngine._tournament_bundle(data_version, match_ids_key(raw_data), period, raw_data, _cube,
+                                                _tables)
+
+    @staticmethod
+    @st.cache_data(show_spinner=False, max_entries=32)
+    def _tournament_bundle(data_version, match_ids, period, _raw_data, _cube=None, _tables=None):
+        # 1. Get Daily Stats (Player-Game Level) - flattened and derived once
+        if _tables is not None:
+            categories = {str(m.get("MatchID")): m.get("Category") for m in _raw_data}
+            df_daily = ant.get_daily_stats_from_tables(cs.select_matches(_tables, match_ids), period=period,
+                                                       categories=categories)
+        else:
+            df_daily = ant.get_daily_stats(_raw_data, period=period, cube=_cube)
+        return MetricsEngine.aggregate_bundle(df_daily, period=period)
+
+    @staticmethod
+    def get_tournament_bundle_from_tables(tables, period="Full Game"):
+        """
+        get_tournament_bundle over the columnar store tables. Not cached:
+        st.cache_data would hash every table on each call; callers keep the result.
+        """
+        df_daily = ant.get_daily_stats_from_tables(tables, period=period)
+        return MetricsEngine.aggregate_bundle(df_daily, period=period)
+
+    @staticmethod
+    def _select_entity(bundle, entity_type):
+        if entity_type == "Players":
+            return bundle["players"], pd.DataFrame()
+        if entity_type == "Teams":
+            return pd.DataFrame(), bundle["teams"]
+        return pd.DataFrame(), pd.DataFrame()
+
+    @staticmethod
+    def aggregate_daily_stats(df_daily, period="Full Game", entity_type="Players"):
+        """Aggregate a player-game frame into tournament Player or Team stats."""
+        bundle = MetricsEngine.aggregate_bundle(df_daily, period=period)
+        return MetricsEngine._select_entity(bundle, entity_type)
+
+    @staticmethod
+    def aggregate_teams(df_daily, period="Full Game"):
+        """Team aggregates only (skips the player pass)."""
         if df_daily.empty:
-            return pd.DataFrame(), pd.DataFrame()
+            return pd.DataFrame()
+        df_daily, team_game_totals = MetricsEngine._team_game_totals(df_daily)
+        return MetricsEngine._aggregate_teams(df_daily, team_game_totals, period)
+
+    @staticmethod
+    def aggregate_bundle(df_daily, period="Full Game"):
+        """Player and Team aggregates from a single player-game frame."""
+        empty = {"daily": pd.DataFrame(), "team_game_totals": pd.DataFrame(),
+                 "players": pd.DataFrame(), "teams": pd.DataFrame()}
+        if df_daily.empty:
+            return empty
+
+        df_daily, team_game_totals = MetricsEngine._team_game_totals(df_daily)
+        return {
+            "daily": df_daily,
+            "team_game_totals": team_game_totals,
+            "players": MetricsEngine._aggregate_players(df_daily, team_game_totals),
+            "teams": MetricsEngine._aggregate_teams(df_daily, team_game_totals, period),
+        }
+
+    @staticmethod
+    def _team_game_totals(df_daily):
+        """Numeric-coerce the daily frame and sum it per (MatchID, Team)."""
+        df_daily = df_daily.copy()
 
         # 2. Standardize Columns
         # Ensure we have numeric columns for aggregation
-        agg_cols = ["FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "OREB", "DREB",
-                   "REB", "AST", "TOV", "STL", "BLK", "PF", "FD", "PTS", "MIN_DEC", "Mins",
-                   "OffPTS", "DefPTS", "TmPoss", "OppPoss"]
-        
-        for col in agg_cols:
+        for col in AGG_COLS:
             if col in df_daily.columns:
                 df_daily[col] = pd.to_numeric(df_daily[col], errors='coerce').fillna(0)
 
-        # Standardize ID Types to ensure Merge Works
+        # Standardize ID Types to ensure Merge Works (string categories, see src.core.schema)
         if "MatchID" in df_daily.columns:
-            df_daily["MatchID"] = df_daily["MatchID"].astype(str)
+            df_daily["MatchID"] = as_category(df_daily["MatchID"])
         if "Team" in df_daily.columns:
-            df_daily["Team"] = df_daily["Team"].astype(str)
+            df_daily["Team"] = as_category(df_daily["Team"])
 
         # 3. Calculate Team Totals PER GAME (Active Game Context)
-        # Group by MatchID + Team
-        team_game_totals = df_daily.groupby(["MatchID", "Team"])[agg_cols].sum().reset_index()
-        
+        # Group by MatchID + Team (observed: only pairs that played, not every category combination)
+        team_game_totals = df_daily.groupby(["MatchID", "Team"], observed=True)[AGG_COLS].sum().reset_index()
+        return df_daily, team_game_totals
+
+    @staticmethod
+    def _aggregate_players(df_daily, team_game_totals):
+        """Tournament player aggregates (USG% uses active game team totals)."""
+        agg_cols = AGG_COLS
+
         # Rename to TmPrefix
         rename_dict = {col: f"Tm{col}" for col in agg_cols}
         team_game_totals_renamed = team_game_totals.rename(columns=rename_dict)
+
+        # DNP Filter: Remove rows where Minutes=0 and Stats=0
+        # Ensure we only count actual appearances for per-game stats
         
-        # --- PLAYER AGGREGATION ---
-        if entity_type == "Players":
-            # DNP Filter: Remove rows where Minutes=0 and Stats=0
-            # Ensure we only count actual appearances for per-game stats
-            
-            # Key Columns to check for activity (if they had any stat, they played)
-            activity_cols = ["PTS", "REB", "AST", "STL", "BLK", "TOV", "FGA", "FTA", "PF"]
-            check_cols = [c for c in activity_cols if c in df_daily.columns]
-            
-            if "MIN_DEC" in df_daily.columns and check_cols:
-                # Calculate activity sum (absolute values just in case)
-                activity_sum = df_daily[check_cols].abs().sum(axis=1)
-                
-                # Keep row if (Minutes > 0) OR (Activity > 0)
-                # Some box scores might have 0 min but recorded a foul/stat -> Keep.
-                # Some might have 1 min but 00:00 recorded -> Keep if MIN_DEC > 0.
-                mask = (df_daily["MIN_DEC"] > 0) | (activity_sum > 0)
-                df_daily = df_daily[mask]
-
-            # PRE-MERGE CLEANUP: Drop conflicting Tm columns from player perfs
-            cols_to_drop = [c for c in rename_dict.values() if c in df_daily.columns]
-            if cols_to_drop:
-                 df_daily = df_daily.drop(columns=cols_to_drop)
-
-            # Merge Team Totals back to Player Daily Stats
-            df_merged = df_daily.merge(team_game_totals_renamed, on=["MatchID", "Team"], how="left")
-            
-            # Calculate Daily USG% (Robust Formula)
-            if "FGA" in df_merged.columns and "TmFGA" in df_merged.columns:
-                t_poss = df_merged["TmFGA"] + 0.44 * df_merged["TmFTA"] + df_merged["TmTOV"]
-                p_poss_raw = df_merged["FGA"] + 0.44 * df_merged["FTA"] + df_merged["TOV"]
-                
-                p_min = df_merged["MIN_DEC"].replace(0, 0.1)
-                tm_min = df_merged["TmMIN_DEC"]
-                
-                usage_term = (p_poss_raw * (tm_min / 5))
-                poss_term = (p_min * t_poss)
-                
-                df_merged["USG%_Daily"] = np.where(poss_term > 0, 100 * usage_term / poss_term, 0.0)
-                df_merged["USG%_Daily"] = df_merged["USG%_Daily"].clip(0, 100.0)
-
-            # Identity Key (Player + Team only, jersey number can vary across games)
-            if "P_KEY" not in df_merged.columns:
-                 df_merged["P_KEY"] = df_merged["Player"].astype(str) + "_" + df_merged["Team"].astype(str)
-
-            # Aggregation Dictionary
-            final_agg_dict = {col: "sum" for col in agg_cols if col in df_daily.columns}
-            
-            # Add Tm-prefixed columns
-            for t_col in rename_dict.values():
-                if t_col in df_merged.columns:
-                    final_agg_dict[t_col] = "sum"
-            
-            # Add Opp-prefixed columns (for DEFRTG calculation)
-            opp_cols = ["OppFGA", "OppFTA", "OppTOV", "OppOREB", "OppDREB", "OppFGM", 
-                       "OppFTM", "OppAST", "OppSTL", "OppBLK", "OppPF", "OppPTS", "Opp3PM"]
-            for opp_col in opp_cols:
-                if opp_col in df_merged.columns:
-                    final_agg_dict[opp_col] = "sum"
-
-            df_agg = df_merged.groupby("P_KEY").agg(final_agg_dict).reset_index()
-            
-            # GP
-            gp_series = df_merged.groupby("P_KEY")["MatchID"].nunique()
-            gp_series.name = "GP"
-            df_agg = df_agg.merge(gp_series, on="P_KEY", how="left")
-            
-            # Metadata
-            meta_df = df_merged.groupby("P_KEY")[['Player', 'Team', 'No', 'Category']].first().reset_index()
-            df_agg = meta_df.merge(df_agg, on="P_KEY", how="left")
-            
-            # Create MIN column from MIN_DEC or Mins
-            if "MIN_DEC" in df_agg.columns:
-                df_agg["MIN"] = df_agg["MIN_DEC"]
-            elif "Mins" in df_agg.columns:
-                df_agg["MIN"] = df_agg["Mins"]
-            else:
-                df_agg["MIN"] = 0.0
-            
-            # Create MIN_CALC for analytics
-            df_agg["MIN_CALC"] = df_agg["MIN"]
-            
-            # Weighted Average USG%
-            if "USG%_Daily" in df_merged.columns:
-                def weighted_usg(x):
-                    m = x["MIN_DEC"]
-                    u = x.get("USG%_Daily", 0)
-                    if m.sum() > 0:
-                        return np.average(u, weights=m)
-                    else:
-                        return 0.0
-                        
-                weighted_usg_series = df_merged.groupby("P_KEY").apply(weighted_usg)
-                weighted_usg_series.name = "USG_Robust"
-                df_agg = df_agg.merge(weighted_usg_series, on="P_KEY", how="left")
-            
-            # Derived Stats
-            df_agg = ant.calculate_derived_stats(df_agg)
-            
-            # Restore Robust USG - DISABLED
-            # The calculated USG% now uses the correct formula (TmFGA/TmFTA/TmTOV instead of TmPoss)
-            # if "USG_Robust" in df_agg.columns:
-            #     df_agg["USG%"] = df_agg["USG_Robust"]
-            #     df_agg = df_agg.drop(columns=["USG_Robust"])
-            
-            return df_agg, pd.DataFrame()
-
-        # --- TEAM AGGREGATION ---
-        elif entity_type == "Teams":
-            # 1. Get Opponent Stats by Self-Joining team_game_totals
-            # We need to know who played whom. df_daily has this info implicitly if we look at matches.
-            # A better way is to iterate matches in raw_data, but here we only have df_daily.
-            # In df_daily, for a MatchID, there are usually 2 Teams.
-            
-            # Get list of teams per match
-            match_teams = team_game_totals[["MatchID", "Team"]].drop_duplicates()
-            
-            # Self merge on MatchID
-            merged_matches = match_teams.merge(match_teams, on="MatchID", suffixes=("", "_Opp"))
-            # Filter out self (Team == Team_Opp)
-            merged_matches = merged_matches[merged_matches["Team"] != merged_matches["Team_Opp"]]
-            
-            # Now we have Map: MatchID, Team -> Team_Opp
-            # Join stats
-            df_team_ctx = team_game_totals.merge(merged_matches, on=["MatchID", "Team"], how="left")
-            
-            # Now join again to get Opponent Stats
-            # We want to join df_team_ctx (MatchID, Team, Team_Opp) with team_game_totals (MatchID, Team aka Opp)
-            df_full_t = df_team_ctx.merge(
-                team_game_totals, 
-                left_on=["MatchID", "Team_Opp"], 
-                right_on=["MatchID", "Team"], 
-                suffixes=("", "_Opp"),
-                how="left"
-            )
-            
-            # Rename Team_Opp back correctly or just use the _Opp columns
-            # df_full_t has Columns: [Stats], Team_Opp, [Stats_Opp]
-            
-            # Aggregate by Team
-            # T_KEY usually just Team Name + Category
-            if "Category" in df_daily.columns:
-                # recover category from daily
-                cat_map = df_daily[["MatchID", "Category"]].drop_duplicates()
-                df_full_t = df_full_t.merge(cat_map, on="MatchID", how="left")
-                df_full_t["T_KEY"] = df_full_t["Category"].astype(str) + "_" + df_full_t["Team"].astype(str)
-            else:
-                 df_full_t["T_KEY"] = df_full_t["Team"].astype(str)
-
-            # Define Aggregation
-            # Own Stats
-            t_agg_dict = {col: "sum" for col in agg_cols if col in df_full_t.columns}
-            
-            # Opp Stats
-            opp_cols = [f"{col}_Opp" for col in agg_cols]
-            for c in opp_cols:
-                if c in df_full_t.columns:
-                    t_agg_dict[c] = "sum"
-            
-            df_t_agg = df_full_t.groupby("T_KEY").agg(t_agg_dict).reset_index()
-            
-            # Rename Opp columns
-            # Current: FGM_Opp. Desired: OppFGM
-            rename_opp = {c: f"Opp{c.replace('_Opp','')}" for c in opp_cols}
-            df_t_agg = df_t_agg.rename(columns=rename_opp)
-            
-            # Also rename Team_x back to Team?
-            # We need metadata
-            meta_t = df_full_t.groupby("T_KEY")[['Team', 'Category']].first().reset_index()
-            # meta_t = meta_t.rename(columns={'Team_x': 'Team'}) # Already Team
+        # Key Columns to check for activity (if they had any stat, they played)
+        activity_cols = ["PTS", "REB", "AST", "STL", "BLK", "TOV", "FGA", "FTA", "PF"]
+        check_cols = [c for c in activity_cols if c in df_daily.columns]
+        
+        if "MIN_DEC" in df_daily.columns and check_cols:
+            # Calculate activity sum (absolute values just in case)
+            activity_sum = df_daily[check_cols].abs().sum(axis=1)
             
-            # GP
-            gp_t = df_full_t.groupby("T_KEY")["MatchID"].nunique()
-            gp_t.name = "GP"
+            # Keep row if (Minutes > 0) OR (Activity > 0)
+            # Some box scores might have 0 min but recorded a foul/stat -> Keep.
+            # Some might have 1 min but 00:00 recorded -> Keep if MIN_DEC > 0.
+            mask = (df_daily["MIN_DEC"] > 0) | (activity_sum > 0)
+            df_daily = df_daily[mask]
+
+        # PRE-MERGE CLEANUP: Drop conflicting Tm columns from player perfs
+        cols_to_drop = [c for c in rename_dict.values() if c in df_daily.columns]
+        if cols_to_drop:
+             df_daily = df_daily.drop(columns=cols_to_drop)
+
+        # Merge Team Totals back to Player Daily Stats
+        df_merged = df_daily.merge(team_game_totals_renamed, on=["MatchID", "Team"], how="left")
+        
+        # Calculate Daily USG% (Robust Formula)
+        if "FGA" in df_merged.columns and "TmFGA" in df_merged.columns:
+            t_poss = df_merged["TmFGA"] + 0.44 * df_merged["TmFTA"] + df_merged["TmTOV"]
+            p_poss_raw = df_merged["FGA"] + 0.44 * df_merged["FTA"] + df_merged["TOV"]
             
-            df_final_t = meta_t.merge(df_t_agg, on="T_KEY").merge(gp_t, on="T_KEY")
+            p_min = df_merged["MIN_DEC"].replace(0, 0.1)
+            tm_min = df_merged["TmMIN_DEC"]
             
-            # Prefix Own Stats with Tm? analytics.py expects straight names usually, 
-            # but prepare_display_data handles renaming.
-            # Actually, standard analytics expects FGM, FGA etc. for own stats.
+            usage_term = (p_poss_raw * (tm_min / 5))
+            poss_term = (p_min * t_poss)
             
-            # Calculate Derived
-            # For Teams, we usually set MIN_CALC manually based on period
-            if period == "Full Game":
-                df_final_t["MIN_CALC"] = df_final_t["GP"] * 40.0
-            elif "Half" in period:
-                df_final_t["MIN_CALC"] = df_final_t["GP"] * 20.0
-            else:
-                df_final_t["MIN_CALC"] = df_final_t["GP"] * 10.0
-                
-            df_final_t = ant.calculate_derived_team_stats(df_final_t)
+            df_merged["USG%_Daily"] = np.where(poss_term > 0, 100 * usage_term / poss_term, 0.0)
+            df_merged["USG%_Daily"] = df_merged["USG%_Daily"].clip(0, 100.0)
+
+        # Identity Key: stable int player ID (name variants + team, jersey can vary across games)
+        if "P_KEY" not in df_merged.columns:
+             df_merged["P_KEY"] = get_identity_table().assign(df_merged)
+
+        # Aggregation Dictionary
+        final_agg_dict = {col: "sum" for col in agg_cols if col in df_daily.columns}
+        
+        # Add Tm-prefixed columns
+        for t_col in rename_dict.values():
+            if t_col in df_merged.columns:
+                final_agg_dict[t_col] = "sum"
+        
+        # Add Opp-prefixed columns (for DEFRTG calculation)
+        opp_cols = ["OppFGA", "OppFTA", "OppTOV", "OppOREB", "OppDREB", "OppFGM", 
+                   "OppFTM", "OppAST", "OppSTL", "OppBLK", "OppPF", "OppPTS", "Opp3PM"]
+        for opp_col in opp_cols:
+            if opp_col in df_merged.columns:
+                final_agg_dict[opp_col] = "sum"
+
+        df_agg = df_merged.groupby("P_KEY").agg(final_agg_dict).reset_index()
+        
+        # GP
+        gp_series = df_merged.groupby("P_KEY")["MatchID"].nunique()
+        gp_series.name = "GP"
+        df_agg = df_agg.merge(gp_series, on="P_KEY", how="left")
+        
+        # Metadata (jersey: the number worn most often)
+        meta_df = df_merged.groupby("P_KEY")[['Player', 'Team', 'No', 'Category']].first()
+        if "No" in df_merged.columns:
+            no_counts = df_merged.groupby(["P_KEY", "No"], observed=True).size().reset_index(name="n")
+            no_mode = no_counts.sort_values(["P_KEY", "n"], ascending=[True, False], kind="stable")\
+                               .drop_duplicates("P_KEY").set_index("P_KEY")["No"]
+            meta_df["No"] = no_mode.reindex(meta_df.index).fillna(meta_df["No"])
+        df_agg = meta_df.reset_index().merge(df_agg, on="P_KEY", how="left")
+        
+        # Create MIN column from MIN_DEC or Mins
+        if "MIN_DEC" in df_agg.columns:
+            df_agg["MIN"] = df_agg["MIN_DEC"]
+        elif "Mins" in df_agg.columns:
+            df_agg["MIN"] = df_agg["Mins"]
+        else:
+            df_agg["MIN"] = 0.0
+        
+        # Create MIN_CALC for analytics
+        df_agg["MIN_CALC"] = df_agg["MIN"]
+        
+        # Weighted Average USG%
+        if "USG%_Daily" in df_merged.columns:
+            weighted_usg_series = weighted_mean(df_merged, "P_KEY", "USG%_Daily", weight_col="MIN_DEC")
+            weighted_usg_series.name = "USG_Robust"
+            df_agg = df_agg.merge(weighted_usg_series, on="P_KEY", how="left")
+        
+        # Derived Stats
+        df_agg = ant.calculate_derived_stats(df_agg)
+        
+        # Restore Robust USG - DISABLED
+        # The calculated USG% now uses the correct formula (TmFGA/TmFTA/TmTOV instead of TmPoss)
+        # if "USG_Robust" in df_agg.columns:
+        #     df_agg["USG%"] = df_agg["USG_Robust"]
+        #     df_agg = df_agg.drop(columns=["USG_Robust"])
+        
+        return plain_frame(df_agg)
+
+    @staticmethod
+    def _aggregate_teams(df_daily, team_game_totals, period="Full Game"):
+        """Tournament team aggregates with opponent totals from the same games."""
+        agg_cols = AGG_COLS
+
+        # 1. Get Opponent Stats by Self-Joining team_game_totals
+        # We need to know who played whom. df_daily has this info implicitly if we look at matches.
+        # A better way is to iterate matches in raw_data, but here we only have df_daily.
+        # In df_daily, for a MatchID, there are usually 2 Teams.
+        
+        # Get list of teams per match
+        match_teams = team_game_totals[["MatchID", "Team"]].drop_duplicates()
+        
+        # Self merge on MatchID
+        merged_matches = match_teams.merge(match_teams, on="MatchID", suffixes=("", "_Opp"))
+        # Filter out self (Team == Team_Opp)
+        merged_matches = merged_matches[merged_matches["Team"] != merged_matches["Team_Opp"]]
+        
+        # Now we have Map: MatchID, Team -> Team_Opp
+        # Join stats
+        df_team_ctx = team_game_totals.merge(merged_matches, on=["MatchID", "Team"], how="left")
+        
+        # Now join again to get Opponent Stats
+        # We want to join df_team_ctx (MatchID, Team, Team_Opp) with team_game_totals (MatchID, Team aka Opp)
+        df_full_t = df_team_ctx.merge(
+            team_game_totals, 
+            left_on=["MatchID", "Team_Opp"], 
+            right_on=["MatchID", "Team"], 
+            suffixes=("", "_Opp"),
+            how="left"
+        )
+        
+        # Rename Team_Opp back correctly or just use the _Opp columns
+        # df_full_t has Columns: [Stats], Team_Opp, [Stats_Opp]
+        
+        # Aggregate by Team
+        # T_KEY usually just Team Name + Category
+        if "Category" in df_daily.columns:
+            # recover category from daily
+            cat_map = df_daily[["MatchID", "Category"]].drop_duplicates()
+            df_full_t = df_full_t.merge(cat_map, on="MatchID", how="left")
+            df_full_t["T_KEY"] = df_full_t["Category"].astype(str) + "_" + df_full_t["Team"].astype(str)
+        else:
+             df_full_t["T_KEY"] = df_full_t["Team"].astype(str)
+
+        # Define Aggregation
+        # Own Stats
+        t_agg_dict = {col: "sum" for col in agg_cols if col in df_full_t.columns}
+        
+        # Opp Stats
+        opp_cols = [f"{col}_Opp" for col in agg_cols]
+        for c in opp_cols:
+            if c in df_full_t.columns:
+                t_agg_dict[c] = "sum"
+        
+        df_t_agg = df_full_t.groupby("T_KEY").agg(t_agg_dict).reset_index()
+        
+        # Rename Opp columns
+        # Current: FGM_Opp. Desired: OppFGM
+        rename_opp = {c: f"Opp{c.replace('_Opp','')}" for c in opp_cols}
+        df_t_agg = df_t_agg.rename(columns=rename_opp)
+        
+        # Also rename Team_x back to Team?
+        # We need metadata
+        meta_t = df_full_t.groupby("T_KEY")[['Team', 'Category']].first().reset_index()
+        # meta_t = meta_t.rename(columns={'Team_x': 'Team'}) # Already Team
+        
+        # GP
+        gp_t = df_full_t.groupby("T_KEY")["MatchID"].nunique()
+        gp_t.name = "GP"
+        
+        df_final_t = meta_t.merge(df_t_agg, on="T_KEY").merge(gp_t, on="T_KEY")
+        
+        # Prefix Own Stats with Tm? analytics.py expects straight names usually, 
+        # but prepare_display_data handles renaming.
+        # Actually, standard analytics expects FGM, FGA etc. for own stats.
+        
+        # Calculate Derived
+        # For Teams, we usually set MIN_CALC manually based on period
+        if period == "Full Game":
+            df_final_t["MIN_CALC"] = df_final_t["GP"] * 40.0
+        elif "Half" in period:
+            df_final_t["MIN_CALC"] = df_final_t["GP"] * 20.0
+        else:
+            df_final_t["MIN_CALC"] = df_final_t["GP"] * 10.0
             
-            return pd.DataFrame(), df_final_t
+        df_final_t = ant.calculate_derived_team_stats(df_final_t)
+        
+        return plain_frame(df_final_t)
 
-        return pd.DataFrame(), pd.DataFrame()
+    @staticmethod
+    def mode_scaled_columns(df):
+        """Numeric columns divided by games / minutes in the Per Game and Per 36 Min modes."""
+        exclude_cols = MODE_EXCLUDE_COLS + MODE_RATE_STATS
+        return [c for c in df.select_dtypes(include=np.number).columns if c not in exclude_cols]
+
+    @staticmethod
+    def apply_stat_mode(df_view, stat_mode="Totals", entity_type="Players"):
+        """
+        Tournament aggregates as shown for a Stats Mode ("Totals", "Per Game",
+        "Per 36 Min"): scaled, re-derived, sorted by PTS and display-rounded.
+        """
+        numeric_cols = MetricsEngine.mode_scaled_columns(df_view)
+        df_display = df_view.copy()
+
+        if stat_mode == "Per Game":
+            for c in numeric_cols:
+                df_display[c] = (df_display[c] / df_display['GP']).round(1)
+
+        elif stat_mode == "Per 36 Min":
+            # Avoiding divide by zero
+            valid_mins = df_display['MIN_CALC'] > 0
+            df_display = df_display[valid_mins].copy()
+            factor = df_display['MIN_CALC'] / 36.0
+
+            for c in numeric_cols:
+                if c != "MIN_CALC": # Don't divide MIN_CALC yet
+                    df_display[c] = (df_display[c] / factor).round(1)
+            df_display['MIN_CALC'] = 36.0 # Set explicit
+
+        # Preserve USG% from the aggregation (it's already correctly calculated)
+        # Recalculating after per-game division breaks the formula because _TmMin becomes per-game
+        usg_preserved = df_display['USG%'].copy() if 'USG%' in df_display.columns else None
+
+        # Recalculate Derived (Correct % and Ratings); composites are rebuilt from the scaled stats
+        if entity_type == "Players":
+            df_display = ant.calculate_derived_stats(df_display)
+        else:
+            df_display = ant.calculate_derived_team_stats(df_display)
+
+        if usg_preserved is not None:
+            df_display['USG%'] = usg_preserved
+
+        # Default Sort: Points or PPG
+        if not df_display.empty:
+            sort_col = "PTS" if "PTS" in df_display.columns else df_display.columns[0]
+            df_display = df_display.sort_values(by=sort_col, ascending=False)
+
+            # Apply universal rounding to the display dataframe (fixes Leaderboards)
+            rounding_mode = "totals"
+            if stat_mode == "Per Game": rounding_mode = "per_game"
+            elif stat_mode == "Per 36 Min": rounding_mode = "per_36"
+
+            df_display = ant.apply_stat_rounding(df_display, mode=rounding_mode)
+
+        return df_display
@@ -4,7 +4,6 @@ Reusable modern components with glassmorphism, animations, and premium design
 """
 
 import streamlit as st
-import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 import json
@@ -265,6 +264,7 @@ def create_team_score_card(team_name, score, logo_path=None, mvp_name=None, mvp_
 
 def create_comparison_bar_chart(categories, team1_values, team2_values, team1_name, team2_name):
     """Create horizontal bar chart for team comparison"""
+    import plotly.graph_objects as go  # Only the match dashboard draws charts
     
     fig = go.Figure()
     
@@ -330,55 +330,46 @@ def create_comparison_bar_chart(categories, team1_values, team2_values, team1_na
     return fig
 
 
-def create_leader_board(df, stat_col, title, top_n=10, show_team=True, show_date=True):
-    """Create visual leader board with ultra-compact professional design"""
-    
-    if df.empty or stat_col not in df.columns:
-        st.info(f"No data available for {title}")
-        return
-    
-    # Sort and get top N
-    df_sorted = df.nlargest(top_n, stat_col).reset_index(drop=True)
-    
-    st.markdown(f"""<div style="margin-bottom: 12px;">
-<h4 style="font-family: 'Space Grotesk', sans-serif; font-weight: 700; font-size: 0.95rem; text-transform: uppercase; letter-spacing: 0.05em; color: var(--text-primary); margin: 0 0 12px 0; border-left: 3px solid var(--tappa-orange); padding-left: 10px;">
-{title}
-</h4>
-</div>""", unsafe_allow_html=True)
-    
-    for idx, row in df_sorted.iterrows():
-        rank = idx + 1
-        player = str(row.get('Player', row.get('Player_Name', 'Unknown')))
-        stat_value = float(row[stat_col])
-        team = str(row.get('Team', ''))
-        
-        # Clean player name redundancy
-        display_name = player
-        if " (" in display_name:
-            display_name = display_name.split(" (")[0]
-            
-        # Revert to decimal form for precision
-        display_stat = f"{stat_value:.1f}"
-            
-        # Styling for top 3
-        if rank == 1:
-            rank_bg = "background: linear-gradient(135deg, #ff8533, #d16b07);"
-            rank_color = "#000000"
-            border_color = "#d16b07"
-        elif rank <= 3:
-            rank_bg = "background: rgba(209, 107, 7, 0.1);"
-            rank_color = "#ff8533"
-            border_color = "rgba(209, 107, 7, 0.2)"
-        else:
-            rank_bg = "background: rgba(255,255,255,0.03);"
-            rank_color = "#999"
-            border_color = "rgba(255,255,255,0.05)"
-        
-        # Progress bar width
-        max_val = df_sorted[stat_col].max()
-        progress_pct = (stat_value / max_val * 100) if max_val > 0 else 0
-        
-        html = f"""<div style="background: rgba(255,255,255,0.02); border-radius: 8px; padding: 8px 12px; margin-bottom: 6px; border: 1px solid {border_color}; transition: all 0.2s ease;">
+# Rank badge styles: 1st, 2nd-3rd, rest -> (badge background, badge color, card border)
+_RANK_STYLES = [
+    ("background: linear-gradient(135deg, #ff8533, #d16b07);", "#000000", "#d16b07"),
+    ("background: rgba(209, 107, 7, 0.1);", "#ff8533", "rgba(209, 107, 7, 0.2)"),
+    ("background: rgba(255,255,255,0.03);", "#999", "rgba(255,255,255,0.05)"),
+]
+
+
+def _leader_rows_html(df_sorted, stat_col, show_team=True, show_date=True):
+    """HTML for every leader board row, built from column arrays."""
+    n = len(df_sorted)
+    values = df_sorted[stat_col].to_numpy(dtype=np.float64)
+
+    if "Player" in df_sorted.columns:
+        players = df_sorted["Player"].astype(str)
+    elif "Player_Name" in df_sorted.columns:
+        players = df_sorted["Player_Name"].astype(str)
+    else:
+        players = pd.Series(["Unknown"] * n, index=df_sorted.index)
+    # Clean player name redundancy
+    names = players.str.split(" (", n=1, regex=False).str[0].tolist()
+    teams = df_sorted["Team"].astype(str).tolist() if show_team and "Team" in df_sorted.columns else [""] * n
+    stats = [f"{v:.1f}" for v in values]
+
+    if "Opponent" in df_sorted.columns:
+        opp_lines = [f'<div style="font-size: 0.6rem; color: #888; margin-top: 2px; text-align: right;">vs {o}</div>'
+                     for o in df_sorted["Opponent"].tolist()]
+    else:
+        opp_lines = [""] * n
+    if show_date and "Date" in df_sorted.columns:
+        date_lines = [f'<div style="font-size: 0.6rem; color: #666; text-align: right;">{str(d).split(" ")[0]}</div>'
+                      for d in df_sorted["Date"].tolist()]
+    else:
+        date_lines = [""] * n
+
+    rows = []
+    for i in range(n):
+        rank = i + 1
+        rank_bg, rank_color, border_color = _RANK_STYLES[0 if rank == 1 else 1 if rank <= 3 else 2]
+        rows.append(f"""<div style="background: rgba(255,255,255,0.02); border-radius: 8px; padding: 8px 12px; margin-bottom: 6px; border: 1px solid {border_color}; transition: all 0.2s ease;">
 <div style="display: flex; justify-content: space-between; align-items: center;">
 <div style="display: flex; align-items: center; gap: 10px; flex: 1;">
 <div style="{rank_bg} font-family: 'Space Grotesk', sans-serif; font-size: 0.8rem; font-weight: 800; color: {rank_color}; min-width: 26px; height: 26px; display: flex; align-items: center; justify-content: center; border-radius: 4px;">
@@ -386,24 +377,55 @@ def create_leader_board(df, stat_col, title, top_n=10, show_team=True, show_date
 </div>
 <div style="flex: 1;">
 <div style="font-weight: 700; font-size: 0.85rem; color: var(--text-primary); margin-bottom: 0px; font-family: 'Space Grotesk', sans-serif; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; max-width: 140px;">
-{display_name}
+{names[i]}
 </div>
 <div style="font-size: 0.65rem; color: var(--text-muted); font-weight: 500; font-family: 'Space Grotesk', sans-serif; opacity: 0.7; text-transform: uppercase;">
-{team if show_team else ""}
+{teams[i]}
 </div>
 </div>
 </div>
 <div style="display: flex; flex-direction: column; align-items: flex-end; min-width: 45px;">
 <div style="font-family: 'Outfit', sans-serif; font-size: 1.1rem; font-weight: 800; color: var(--tappa-orange); line-height: 1;">
-{display_stat}
+{stats[i]}
 </div>
-{f'<div style="font-size: 0.6rem; color: #888; margin-top: 2px; text-align: right;">vs {row.get("Opponent", "???")}</div>' if "Opponent" in row else ""}
-{f'<div style="font-size: 0.6rem; color: #666; text-align: right;">{str(row.get("Date", "")).split(" ")[0]}</div>' if show_date and "Date" in row else ""}
+{opp_lines[i]}
+{date_lines[i]}
 </div>
 </div>
+</div>""")
+    return rows
+
+
+def create_leader_board(df, stat_col, title, top_n=10, show_team=True, show_date=True, cache_key=None):
+    """
+    Create visual leader board with ultra-compact professional design.
+    The whole board is emitted as one markdown block; pass cache_key (data version,
+    filters) to reuse the finished HTML from the fragment cache on later reruns.
+    """
+    
+    if df.empty or stat_col not in df.columns:
+        st.info(f"No data available for {title}")
+        return
+
+    def build():
+        # Sort and get top N
+        df_sorted = df.nlargest(top_n, stat_col).reset_index(drop=True)
+        header = f"""<div style="margin-bottom: 12px;">
+<h4 style="font-family: 'Space Grotesk', sans-serif; font-weight: 700; font-size: 0.95rem; text-transform: uppercase; letter-spacing: 0.05em; color: var(--text-primary); margin: 0 0 12px 0; border-left: 3px solid var(--tappa-orange); padding-left: 10px;">
+{title}
+</h4>
 </div>"""
-        
-        st.markdown(html, unsafe_allow_html=True)
+        # The flex gap stands in for the spacing Streamlit put between separate markdown calls
+        rows = "".join(_leader_rows_html(df_sorted, stat_col, show_team, show_date))
+        return f'<div style="display: flex; flex-direction: column; gap: 1rem;">{header}{rows}</div>'
+
+    if cache_key is not None:
+        from src.core.fragment_cache import get_fragment_cache
+        key = ("leader_board", stat_col, title, top_n, show_team, show_date) + tuple(cache_key)
+        html = get_fragment_cache().get_or_render(key, build)
+    else:
+        html = build()
+    st.markdown(html, unsafe_allow_html=True)
 
 def create_four_factors_chart(team1_name, stats1, team2_name, stats2):
     """
@@ -415,6 +437,7 @@ def create_four_factors_chart(team1_name, stats1, team2_name, stats2):
     # Extract values ensuring order
     v1 = [stats1.get(f, 0) for f in factors]
     v2 = [stats2.get(f, 0) for f in factors]
+    import plotly.graph_objects as go
     
     fig = go.Figure()
     
@@ -543,12 +566,75 @@ def apply_dataframe_style(df):
         {'selector': 'tr:hover', 'props': [('background-color', '#252525')]}
     ])
 
-def render_html_table(df, highlight_cols=None, star_players=None, outlier_thresholds=None):
+# Cell styles for render_html_table (base + highlight state + column kind)
+_TD_BASE = 'text-align: center; padding: 10px; color: white; border-bottom: 1px solid var(--border-glass); transition: all 0.2s ease;'
+_TD_HIGHLIGHT = 'background: rgba(255, 133, 51, 0.45); border-bottom: 2px solid var(--tappa-orange); font-weight: 800; text-shadow: 0 0 10px rgba(255,133,51,0.5);'
+_TD_PLAIN = 'background: rgba(255, 255, 255, 0.02);'
+_TH = '<th style="text-align: center; padding: 12px; color: var(--text-muted); font-size: 0.8rem; background: rgba(0,0,0,0.3); border-bottom: 2px solid var(--border-glass); font-family: \'Space Grotesk\', sans-serif;">{}</th>'
+
+
+def _td_open(highlighted, is_player_col=False, is_star=False):
+    style = _TD_BASE + (_TD_HIGHLIGHT if highlighted else _TD_PLAIN)
+    if is_player_col:
+        style = style.replace("text-align: center", "text-align: left; padding-left: 15px")
+        style += "font-family: 'Space Grotesk', sans-serif; font-weight: 700;"
+        if is_star:
+            style += "color: var(--tappa-orange);"
+    else:
+        style += "font-family: 'Outfit', sans-serif;"
+    return f'<td style="{style}">'
+
+
+_TD_OPEN = {(h, p, s): _td_open(h, p, s) for h in (False, True) for p in (False, True) for s in (False, True)}
+
+
+def _scalar_text(val):
+    """Cell text for one value: whole numbers as ints, other numbers to 1 decimal."""
+    if isinstance(val, (int, float, np.integer, np.floating)):
+        return f"{int(val)}" if val % 1 == 0 else f"{float(val):.1f}"
+    return f"{val}"
+
+
+def _scalar_float(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _column_text_and_numbers(col):
+    """(cell texts, float values) for one column; NaN where a cell is not numeric."""
+    values = col.to_numpy()
+    kind = values.dtype.kind if isinstance(col.dtype, np.dtype) else "O"
+    if kind in "iu":
+        return values.astype(str).astype(object), values.astype(np.float64)
+    if kind == "f":
+        with np.errstate(invalid="ignore"):
+            whole = np.mod(values, 1) == 0
+        texts = np.char.mod("%.1f", values).astype(object)
+        if whole.any():
+            texts[whole] = np.char.mod("%d", values[whole]).astype(object)
+        return texts, values.astype(np.float64)
+    # Mixed / object / bool / nullable columns keep per-value semantics
+    values = col.astype(object).to_numpy()
+    return (np.array([_scalar_text(v) for v in values], dtype=object),
+            np.array([_scalar_float(v) for v in values], dtype=np.float64))
+
+
+def render_html_table(df, highlight_cols=None, star_players=None, outlier_thresholds=None, cache_key=None):
     """
     Render a styled HTML table with advanced conditional formatting.
     - star_players: List of player names whose rows should be highlighted.
     - outlier_thresholds: Dict of col -> threshold. Cells exceeding this get an outlier glow.
+    - cache_key: Optional hashable key (data version, table spec, filters); the finished
+      HTML is stored in the fragment cache and returned directly on later calls.
     """
+    if cache_key is not None:
+        from src.core.fragment_cache import get_fragment_cache
+        return get_fragment_cache().get_or_render(
+            ("html_table",) + tuple(cache_key),
+            lambda: render_html_table(df, highlight_cols, star_players, outlier_thresholds))
+
     if df.empty: return ""
     
     if highlight_cols is None:
@@ -573,68 +659,46 @@ def render_html_table(df, highlight_cols=None, star_players=None, outlier_thresh
                     pass
 
     # Generate Table Headers
-    headers = "".join([f'<th style="text-align: center; padding: 12px; color: var(--text-muted); font-size: 0.8rem; background: rgba(0,0,0,0.3); border-bottom: 2px solid var(--border-glass); font-family: \'Space Grotesk\', sans-serif;">{col}</th>' for col in df.columns])
-    
-    # Generate Rows
-    rows_html = ""
-    for _, row in df.iterrows():
-        p_name = str(row.get('Player', row.get('PLAYER', '')))
-        is_star = any(star in p_name for star in star_players) if p_name else False
-        
-        row_style = "transition: background 0.2s;"
-        if is_star:
-            row_style += "background: rgba(255, 133, 51, 0.08);"
-
-        cells = ""
-        for col in df.columns:
-            val = row[col]
-            display_val = val
-            
-            # Formatting
-            if isinstance(val, (int, float, np.integer, np.floating)):
-                if val % 1 == 0:
-                    display_val = f"{int(val)}"
-                else:
-                    display_val = f"{float(val):.1f}"
-            
-            # Base style
-            style = f'text-align: center; padding: 10px; color: white; border-bottom: 1px solid var(--border-glass); transition: all 0.2s ease;'
-            
-            # 1. Outlier/Leader Highlight (Cell level)
-            is_highlighted = False
-            try:
-                numeric_val = float(val)
-                if col in outlier_thresholds:
-                    if numeric_val >= outlier_thresholds[col] and numeric_val > 0:
-                        is_highlighted = True
-                elif col in max_values:
-                    if numeric_val == max_values[col] and numeric_val > 0:
-                        is_highlighted = True
-                
-                if is_highlighted:
-                    style += 'background: rgba(255, 133, 51, 0.45); border-bottom: 2px solid var(--tappa-orange); font-weight: 800; text-shadow: 0 0 10px rgba(255,133,51,0.5);'
-                else:
-                    # Subtle background to maintain uniformity
-                    style += 'background: rgba(255, 255, 255, 0.02);'
-            except:
-                style += 'background: rgba(255, 255, 255, 0.02);'
-            
-            # 2. Player names - Left align + Clean Redundancy
-            if col in ["Player", "PLAYER"]:
-                # Strip (Team) if present in name to avoid redundancy with the Team column
-                if isinstance(display_val, str) and " (" in display_val:
-                    display_val = display_val.split(" (")[0]
-                    
-                style = style.replace("text-align: center", "text-align: left; padding-left: 15px")
-                style += "font-family: 'Space Grotesk', sans-serif; font-weight: 700;"
-                if is_star:
-                    style += "color: var(--tappa-orange);"
+    headers = "".join([_TH.format(col) for col in df.columns])
+
+    # Star rows (matched on the Player / PLAYER column)
+    n_rows = len(df)
+    if "Player" in df.columns or "PLAYER" in df.columns:
+        names = [str(v) for v in df["Player" if "Player" in df.columns else "PLAYER"].to_numpy()]
+        is_star = np.array([bool(n) and any(star in n for star in star_players) for n in names], dtype=bool)
+    else:
+        is_star = np.zeros(n_rows, dtype=bool)
+
+    # Build every column as an array of finished <td> cells
+    cell_columns = []
+    for i, col in enumerate(df.columns):
+        texts, numbers = _column_text_and_numbers(df.iloc[:, i])
+
+        # 1. Outlier/Leader Highlight (Cell level)
+        with np.errstate(invalid="ignore"):
+            if col in outlier_thresholds:
+                highlighted = (numbers >= outlier_thresholds[col]) & (numbers > 0)
+            elif col in max_values:
+                highlighted = (numbers == max_values[col]) & (numbers > 0)
             else:
-                style += "font-family: 'Outfit', sans-serif;"
+                highlighted = np.zeros(n_rows, dtype=bool)
 
-            cells += f'<td style="{style}">{display_val}</td>'
-        
-        rows_html += f'<tr style="{row_style}">{cells}</tr>'
+        # 2. Player names - Left align + Clean Redundancy (strip "(Team)" suffixes)
+        if col in ["Player", "PLAYER"]:
+            raw = df.iloc[:, i].to_numpy()
+            texts = [v.split(" (")[0] if isinstance(v, str) and " (" in v else t for v, t in zip(raw, texts)]
+            opens = [_TD_OPEN[(h, True, s)] for h, s in zip(highlighted.tolist(), is_star.tolist())]
+        else:
+            opens = np.where(highlighted, _TD_OPEN[(True, False, False)], _TD_OPEN[(False, False, False)])
+
+        cell_columns.append([f"{o}{t}</td>" for o, t in zip(opens, texts)])
+
+    row_open_plain = '<tr style="transition: background 0.2s;">'
+    row_open_star = '<tr style="transition: background 0.2s;background: rgba(255, 133, 51, 0.08);">'
+    rows_html = "".join(
+        (row_open_star if star else row_open_plain) + "".join(cells) + "</tr>"
+        for star, cells in zip(is_star.tolist(), zip(*cell_columns))
+    )
 
     html = f"""
     <div style="
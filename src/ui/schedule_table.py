@@ -0,0 +1,155 @@
+"""Schedule table rendered as one HTML grid.
+
+The old renderer built six st.columns, five markdown cells and a button per
+schedule row (hundreds of Streamlit deltas for a full schedule). Here the rows
+are resolved in one pass (scores via src.core.standings.schedule_games, the
+detailed match via the match index), the table is emitted as a single
+markdown block cached in the fragment cache, and the "open in Match
+Dashboard" action is one selectbox + button under the table.
+"""
+import html
+
+import pandas as pd
+import streamlit as st
+
+from src.core.fragment_cache import get_fragment_cache
+from src.core.standings import schedule_games
+
+GRID_COLUMNS = "0.5fr 1.2fr 2.5fr 0.6fr 1.2fr 1fr"
+HEADERS = ["ID", "Time / Court", "Matchup", "Group", "Result", "Action"]
+
+STATUS_STATS = ("FINAL (STATS)", "#4CAF50")
+STATUS_MANUAL = ("FINAL", "#FF9800")
+STATUS_SCHEDULED = ("SCHEDULED", "#666")
+
+TABLE_CSS = """<style>
+.sch-grid { display: grid; grid-template-columns: %s; align-items: stretch; }
+.sch-header {
+    background: rgba(255,133,51,0.08);
+    border-bottom: 2px solid var(--tappa-orange);
+    padding: 10px 0 10px 10px;
+    font-weight: bold;
+    color: #888;
+    font-size: 0.75rem;
+    text-transform: uppercase;
+    letter-spacing: 0.1em;
+}
+.sch-row { display: contents; }
+.sch-row > div {
+    background: rgba(255,255,255,0.03);
+    border-bottom: 1px solid rgba(255,255,255,0.05);
+    padding: 10px 0 10px 10px;
+    transition: background 0.2s;
+    display: flex;
+    flex-direction: column;
+    align-items: flex-start;
+    justify-content: center;
+}
+.sch-row:hover > div { background: rgba(255,255,255,0.06); }
+</style>""" % GRID_COLUMNS
+
+
+def _text(value, default=""):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return default
+    s = str(value).strip()
+    return default if not s or s.lower() == "nan" else s
+
+
+def _score(value):
+    """Score as shown in the table (manual scores load as floats: 71.0 -> "71")."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def schedule_rows(schedule_df, match_index, manual_scores):
+    """
+    One display row per schedule row with teams: Match ID, Time, Court, Team A,
+    Team B, Gender, Group, Score, Status, StatusColor and StatsID (MatchID of
+    the detailed-stats match, or None).
+
+    Scores come from the detailed match when there is one, else from
+    manual_scores.json (either key order), and are oriented to Team A / Team B.
+    """
+    sch = schedule_df[schedule_df["Team A"].notna()]
+    games = schedule_games(sch, manual_scores, match_index)
+    rows = []
+    for rec, s1, s2 in zip(sch.to_dict("records"), games["S1"], games["S2"]):
+        m_found = match_index.for_schedule_row(rec)
+        played = pd.notna(s1) and pd.notna(s2)
+        if m_found is not None:
+            status, color = STATUS_STATS
+        elif played:
+            status, color = STATUS_MANUAL
+        else:
+            status, color = STATUS_SCHEDULED
+        rows.append({
+            "Match ID": _text(rec.get("Match ID")),
+            "Time": _text(rec.get("Time"), "TBD"),
+            "Court": _text(rec.get("Court")),
+            "Team A": _text(rec.get("Team A")),
+            "Team B": _text(rec.get("Team B")),
+            "Gender": _text(rec.get("Gender")),
+            "Group": _text(rec.get("Group")),
+            "Score": f"{_score(s1)} - {_score(s2)}" if played else "VS",
+            "Status": status,
+            "StatusColor": color,
+            "StatsID": str(m_found.get("MatchID")) if m_found is not None else None,
+        })
+    return rows
+
+
+def _row_html(r):
+    e = {k: html.escape(v) if isinstance(v, str) else v for k, v in r.items()}
+    action = ("<div style='font-size:0.7rem; font-weight:700; color:#4CAF50;'>📊 STATS</div>"
+              if r["StatsID"] else "<div style='color:#444; font-size:0.7rem;'>-</div>")
+    return f"""<div class='sch-row'>
+<div style='font-family:"Outfit"; font-weight:700; color:#555;'>{e['Match ID']}</div>
+<div><div style='font-size: 0.85rem; font-weight: 600;'>{e['Time']}</div><div style='font-size: 0.65rem; color: #888;'>{e['Court']}</div></div>
+<div><div style='display: flex; align-items: center; gap: 8px;'><span style='font-weight: 700; font-size: 0.9rem; color: #fff;'>{e['Team A']}</span><span style='color: #444; font-size: 0.65rem; font-weight: 900;'>VS</span><span style='font-weight: 700; font-size: 0.9rem; color: #fff;'>{e['Team B']}</span></div><div style='font-size: 0.65rem; color: #666; text-transform: uppercase;'>{e['Gender']} Division</div></div>
+<div style='color:#aaa; font-size:0.8rem;'>{e['Group']}</div>
+<div><div style='font-family:"Outfit"; font-weight:900; color:var(--tappa-orange); font-size:1.1rem;'>{e['Score']}</div><div style='font-size:0.6rem; color:{r['StatusColor']}; font-weight:700;'>{e['Status']}</div></div>
+<div>{action}</div>
+</div>"""
+
+
+def schedule_table_html(rows):
+    """The whole table (CSS, header and rows) as one HTML string."""
+    header = "".join(f"<div class='sch-header'>{h}</div>" for h in HEADERS)
+    body = "".join(_row_html(r) for r in rows)
+    return f"{TABLE_CSS}<div class='sch-grid'>{header}{body}</div>"
+
+
+def render_schedule_table(schedule_df, match_index, manual_scores, key_prefix="sch", cache_key=None):
+    """
+    Render a schedule subset as one markdown block plus a single "View Stats"
+    control for the matches that have detailed stats.
+    cache_key: hashable (data version, inputs token, ...); the finished HTML and
+    jump options are reused from the fragment cache on later reruns.
+    """
+    if schedule_df.empty:
+        st.info("No matches match the selected filters.")
+        return
+
+    def build():
+        rows = schedule_rows(schedule_df, match_index, manual_scores)
+        options = {f"#{r['Match ID']}  {r['Team A']} vs {r['Team B']} ({r['Gender']})": r["StatsID"]
+                   for r in rows if r["StatsID"]}
+        return schedule_table_html(rows), options
+
+    if cache_key is not None:
+        table_html, options = get_fragment_cache().get_or_render(("schedule_table",) + tuple(cache_key), build)
+    else:
+        table_html, options = build()
+    st.markdown(table_html, unsafe_allow_html=True)
+
+    if options:
+        c_sel, c_btn = st.columns([3, 1])
+        with c_sel:
+            label = st.selectbox("Match", list(options), key=f"{key_prefix}_stats_match", label_visibility="collapsed")
+        with c_btn:
+            if st.button("📊 View Stats", key=f"{key_prefix}_stats_btn", use_container_width=True):
+                st.session_state.active_tab = "MATCH DASHBOARD"
+                st.session_state.jump_to_match = options[label]
+                st.rerun()
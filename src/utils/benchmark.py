@@ -0,0 +1,198 @@
+"""Benchmark harness for the analytics pipeline.
+
+Times each stage on synthetic tournaments (src.utils.synthetic_tournament) and
+records wall time and peak traced memory to a JSON results file, so runs from
+different commits can be compared.
+
+Usage:
+    python -m src.utils.benchmark                         # 56, 1k, 10k, 100k matches
+    python -m src.utils.benchmark --sizes 56 1000 --out bench_results.json
+    python -m src.utils.benchmark --sizes 1000 --compare old_results.json
+
+Note: 100k matches with 10 players per team needs several GB of RAM.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+import src.analytics as ant
+from src.core import columnar_store as cs
+from src.core.formatters import dataframe_config, format_df
+from src.core.leaderboard_index import LeaderboardIndex
+from src.core.match_index import MatchIndex
+from src.core.period_cube import PeriodCube
+from src.core.player_index import PlayerGameIndex
+from src.core.player_search import PlayerSearchIndex
+from src.core.power_rankings import PowerRankings
+from src.core.standings import schedule_games, standings_from_games, rank_standings
+from src.metrics_engine import MetricsEngine
+from src.utils.synthetic_tournament import generate_tournament
+
+DEFAULT_SIZES = [56, 1000, 10000, 100000]
+
+
+def _stages():
+    """(name, func(ctx) -> result, ctx key to store the result under)."""
+    return [
+        ("get_daily_stats[Full Game]",
+         lambda c: ant.get_daily_stats(c["matches"], period="Full Game"), "daily"),
+        ("get_daily_stats[1st Half]",
+         lambda c: ant.get_daily_stats(c["matches"], period="1st Half"), None),
+        ("period_cube_build",
+         lambda c: PeriodCube(c["matches"]), "cube"),
+        ("get_daily_stats[1st Half, cube]",
+         lambda c: ant.get_daily_stats(c["matches"], period="1st Half", cube=c["cube"]), None),
+        ("calculate_derived_stats",
+         lambda c: ant.calculate_derived_stats(c["daily"].copy()), None),
+        ("get_tournament_stats[cold]",
+         _tournament_stats_cold, "bundle"),
+        ("columnar_tables_build",
+         lambda c: cs.flatten_matches(c["matches"]), "tables"),
+        ("get_tournament_stats[tables]",
+         lambda c: MetricsEngine.get_tournament_bundle_from_tables(c["tables"], "Full Game"), None),
+        ("power_rankings_standings",
+         _standings, None),
+        ("power_rankings_snapshots",
+         lambda c: PowerRankings(c["schedule"], {}, MatchIndex(c["matches"])).latest(), None),
+        ("format_df[players]",
+         lambda c: format_df(c["bundle"]["players"], precision=1).to_html(), None),
+        ("leaderboard_index_build",
+         lambda c: LeaderboardIndex(c["matches"]), None),
+        ("player_index_build",
+         lambda c: PlayerGameIndex(c["matches"]), None),
+        ("player_search_build",
+         lambda c: PlayerSearchIndex(c["bundle"]["players"]["Player"], c["bundle"]["players"]["Team"]), None),
+        ("dataframe_config[players]",
+         lambda c: dataframe_config(c["bundle"]["players"], precision=1), None),
+    ]
+
+
+def _tournament_stats_cold(ctx):
+    """get_tournament_stats with an empty cache (includes building the MatchID cache key)."""
+    MetricsEngine._tournament_bundle.clear()
+    p, _ = MetricsEngine.get_tournament_stats(ctx["matches"], "Full Game", entity_type="Players", data_version="benchmark")
+    _, t = MetricsEngine.get_tournament_stats(ctx["matches"], "Full Game", entity_type="Teams", data_version="benchmark")
+    return {"players": p, "teams": t}
+
+
+def _standings(ctx):
+    """The standings engine behind the power rankings (hub_app is a script, not importable)."""
+    games = schedule_games(ctx["schedule"], {}, MatchIndex(ctx["matches"]))
+    return rank_standings(standings_from_games(games), games)
+
+
+def _run(func, ctx, trace_memory):
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    result = func(ctx)
+    wall = time.perf_counter() - t0
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result, wall, peak
+
+
+def run_size(n_matches, repeat=1, trace_memory=True, **gen_kwargs):
+    """Benchmark every stage for one tournament size; returns a list of result rows."""
+    t0 = time.perf_counter()
+    data, schedule = generate_tournament(n_matches, **gen_kwargs)
+    gen_s = time.perf_counter() - t0
+    ctx = {"matches": list(data.values()), "schedule": pd.DataFrame(schedule)}
+    rows = [{"size": n_matches, "stage": "generate", "wall_s": round(gen_s, 6), "peak_mb": None}]
+
+    for name, func, key in _stages():
+        # Wall time without tracemalloc overhead, best of `repeat`
+        walls = []
+        for _ in range(max(1, repeat)):
+            result, wall, _ = _run(func, ctx, trace_memory=False)
+            walls.append(wall)
+        peak = None
+        if trace_memory:
+            result, _, peak = _run(func, ctx, trace_memory=True)
+        if key:
+            ctx[key] = result
+        rows.append({"size": n_matches, "stage": name, "wall_s": round(min(walls), 6),
+                     "peak_mb": round(peak, 3) if peak is not None else None})
+        print(f"  {n_matches:>7} {name:<36} {min(walls):9.4f}s"
+              + (f" {peak:9.1f} MB" if peak is not None else ""))
+    return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print wall-time ratios against a previous results file."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    base_map = {(r["size"], r["stage"]): r for r in base.get("results", [])}
+    print(f"\nCompared with {baseline_path} ({base.get('meta', {}).get('commit')}):")
+    for r in results:
+        b = base_map.get((r["size"], r["stage"]))
+        if not b or not b["wall_s"]:
+            continue
+        ratio = r["wall_s"] / b["wall_s"]
+        flag = "  SLOWER" if ratio > 1.2 else ""
+        print(f"  {r['size']:>7} {r['stage']:<36} {b['wall_s']:9.4f}s -> {r['wall_s']:9.4f}s  x{ratio:.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analytics pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="match counts")
+    parser.add_argument("--teams", type=int, default=64)
+    parser.add_argument("--players", type=int, default=10, help="players per team")
+    parser.add_argument("--quarters", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per stage (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to diff against")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n in args.sizes:
+        print(f"Size {n} matches")
+        results.extend(run_size(n, repeat=args.repeat, trace_memory=not args.no_memory,
+                                n_teams=args.teams, players_per_team=args.players,
+                                quarters=args.quarters, seed=args.seed))
+
+    payload = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Import-time budget for the hub's cold start.
+
+Collects the module-level imports of src/hub_app.py (the hub is a Streamlit
+script, so it cannot be imported itself), runs them in a fresh interpreter
+with `python -X importtime` and reports the cumulative import time per
+top-level package. streamlit and pandas are the framework floor every page
+needs; the budget applies to everything the hub imports on top of them.
+
+The check fails (exit code 1) when
+    - the hub's own imports take longer than the budget (best of --runs), or
+    - a module that must stay lazy (LAZY_MODULES) is imported at startup.
+
+Usage:
+    python -m src.utils.import_budget                   # report + check
+    python -m src.utils.import_budget --budget-ms 250 --runs 5
+    python -m src.utils.import_budget --json import_times.json
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HUB_PATH = os.path.join(ROOT, "src", "hub_app.py")
+
+FRAMEWORK = ("streamlit", "pandas")
+INTERPRETER = ("site", "encodings", "_frozen_importlib_external")   # paid by any python process
+DEFAULT_BUDGET_MS = 120
+# Only needed by a single tab or not at all; importing these at startup is a regression
+LAZY_MODULES = ("altair", "src.ui.social_generator")
+
+
+def hub_imports(path=HUB_PATH):
+    """Import statements executed at module level of the hub (including inside top-level try blocks)."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    statements = []
+
+    def visit(body):
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                statements.append(ast.unparse(node))
+            elif isinstance(node, ast.Try):
+                visit(node.body)
+    visit(tree.body)
+    return statements
+
+
+def _importtime(statements):
+    """{top-level module: cumulative microseconds} for statements run in a fresh interpreter."""
+    code = "\n".join(statements)
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import failed:\n{proc.stderr[-2000:]}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level entries are indented by exactly one space
+        if name.startswith(" ") and not name.startswith("  "):
+            times[name.strip()] = times.get(name.strip(), 0) + int(cumulative)
+    return times
+
+
+def measure(statements, runs=3):
+    """Best-of-runs import times: {module: microseconds}, taking the minimum per module."""
+    best = {}
+    for _ in range(max(1, runs)):
+        for mod, us in _importtime(statements).items():
+            best[mod] = min(best.get(mod, us), us)
+    return best
+
+
+def _group(module):
+    """Report group for a module: first-party modules by name, third-party by package."""
+    return module if module.startswith("src.") else module.split(".")[0]
+
+
+def report(times):
+    """Rows (group, ms), slowest first."""
+    grouped = {}
+    for mod, us in times.items():
+        grouped[_group(mod)] = grouped.get(_group(mod), 0) + us
+    return sorted(((g, us / 1000) for g, us in grouped.items()), key=lambda r: -r[1])
+
+
+def check(statements, budget_ms=DEFAULT_BUDGET_MS, runs=3):
+    """(rows, framework_ms, hub_ms, lazy_violations)."""
+    times = measure(statements, runs)
+    rows = report(times)
+    framework_ms = sum(ms for g, ms in rows if g in FRAMEWORK)
+    hub_ms = sum(ms for g, ms in rows if g not in FRAMEWORK + INTERPRETER)
+    loaded = set(times)
+    violations = [m for m in LAZY_MODULES if m in loaded or any(x.startswith(m + ".") for x in loaded)]
+    return rows, framework_ms, hub_ms, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the hub's startup import time")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="allowed import time on top of streamlit + pandas")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters (best is kept)")
+    parser.add_argument("--hub", default=HUB_PATH)
+    parser.add_argument("--json", help="write the breakdown to this file")
+    args = parser.parse_args(argv)
+
+    statements = hub_imports(args.hub)
+    # Framework first, so its cost is not attributed to whichever hub import pulls it in
+    statements = [f"import {m}" for m in FRAMEWORK] + statements
+    rows, framework_ms, hub_ms, violations = check(statements, args.budget_ms, args.runs)
+
+    print(f"{'package':<36} {'ms':>9}")
+    for group, ms in rows:
+        if ms >= 0.5:
+            print(f"{group:<36} {ms:9.1f}" + ("  (framework)" if group in FRAMEWORK else ""))
+    print(f"\nframework (streamlit + pandas): {framework_ms:8.1f} ms")
+    print(f"hub imports on top:             {hub_ms:8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"framework_ms": framework_ms, "hub_ms": hub_ms, "budget_ms": args.budget_ms,
+                       "packages": dict(rows), "lazy_violations": violations}, f, indent=2)
+
+    failed = False
+    if hub_ms > args.budget_ms:
+        print(f"FAIL: hub imports take {hub_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    for mod in violations:
+        print(f"FAIL: {mod} is imported at startup (import it inside the tab that uses it)")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,52 @@
-import re
+"""Parse daily score sheets into data/processed/manual_scores.json.
+
+A score line looks like
+    CHHATTISGARH 67 - 30 UTTARAKHAND Match: No 9 Pool: WOMEN D 07:00 AM
+
+update_scores() handles one sheet; ingest_score_files() takes any number of
+sheets or directories of *.txt sheets, dedupes every parsed line against the
+existing scores in one pass and writes the file once (atomically, via
+src.core.manual_scores). Lines are matched on the order-independent (team
+pair, gender) key, so "GOA 60 - 70 KERALA" updates a stored
+KERALA_VS_GOA_MEN entry (as 70 - 60) instead of adding a second one. It returns a report with the parsed / updated /
+unchanged counts and the lines that failed to parse (file + line number).
+
+Usage:
+    python -m src.utils.parse_daily_scores "day 1 scores.txt"
+    python -m src.utils.parse_daily_scores scores/ day9.txt --dry-run --report report.json
+"""
+import argparse
 import json
+import re
 import os
 import sys
+import time
+
+# Runnable as a script from the repo root as well as with -m
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.core import manual_scores as ms
+from src.core.match_index import pair_key
+
+# Pattern to match: TEAM_A ScoreA - ScoreB TEAM_B Match: No ID Pool: GENDER GROUP TIME
+# Handling variations inc spacing
+# Example: CHHATTISGARH 67 - 30 UTTARAKHAND Match: No 9 Pool: WOMEN D 07:00 AM
+# Example: KARNATAKA 79- 17 TRIPURA Match: No 17 Pool: MEN F 06:30 PM
+#
+# Regex Breakdown:
+# ^(.+?): Start with Team A name (non-greedy)
+# \s+(\d+): Score A
+# \s*-\s*: Hyphen with optional spaces
+# (\d+): Score B
+# \s+(.+?): Team B name (non-greedy)
+# \s+Match:\s+No\s+(\d+): Match ID
+# \s+Pool:\s+(\w+): Gender
+SCORE_LINE_RE = re.compile(r"^(.+?)\s+(\d+)\s*-\s*(\d+)\s+(.+?)\s+Match:\s+No\s+(\d+)\s+Pool:\s+(\w+)", re.IGNORECASE)
+
+SHEET_EXT = ".txt"
+
 
 def parse_score_line(line):
-    # Pattern to match: TEAM_A ScoreA - ScoreB TEAM_B Match: No ID Pool: GENDER GROUP TIME
-    # Handling variations inc spacing
-    # Example: CHHATTISGARH 67 - 30 UTTARAKHAND Match: No 9 Pool: WOMEN D 07:00 AM
-    # Example: KARNATAKA 79- 17 TRIPURA Match: No 17 Pool: MEN F 06:30 PM
-    
-    # Regex Breakdown:
-    # ^(.+?): Start with Team A name (non-greedy)
-    # \s+(\d+): Score A
-    # \s*-\s*: Hyphen with optional spaces
-    # (\d+): Score B
-    # \s+(.+?): Team B name (non-greedy)
-    # \s+Match:\s+No\s+(\d+): Match ID
-    # \s+Pool:\s+(\w+): Gender
-    
-    pattern = r"^(.+?)\s+(\d+)\s*-\s*(\d+)\s+(.+?)\s+Match:\s+No\s+(\d+)\s+Pool:\s+(\w+)"
-    
-    match = re.search(pattern, line.strip(), re.IGNORECASE)
+    match = SCORE_LINE_RE.search(line.strip())
     if match:
         t1 = match.group(1).strip().upper()
         s1 = int(match.group(2))
@@ -28,11 +54,11 @@ def parse_score_line(line):
         t2 = match.group(4).strip().upper()
         mid = match.group(5).strip()
         gender = match.group(6).strip().upper()
-        
+
         # Normalize Gender (WOMEN/MEN)
         if 'WOMEN' in gender: gender = 'WOMEN'
         elif 'MEN' in gender: gender = 'MEN'
-        
+
         return {
             "t1": t1, "s1": s1,
             "t2": t2, "s2": s2,
@@ -41,60 +67,136 @@ def parse_score_line(line):
         }
     return None
 
+
+def score_files(paths):
+    """Score sheets to read: files as given, directories expanded to their sorted *.txt files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, _, names in os.walk(path):
+                found.extend(os.path.join(root, n) for n in names if n.lower().endswith(SHEET_EXT))
+            files.extend(sorted(found))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def ingest_score_files(paths, json_file=None, dry_run=False):
+    """
+    Parse every line of the given sheets / directories, merge them into the
+    existing manual scores and write the file once (skipped when nothing
+    changed or with dry_run). A match repeated across sheets (in either team
+    order) keeps its last line. A match already stored keeps its stored key and
+    team order; the parsed scores are swapped to match when the line lists the
+    teams the other way round.
+
+    Returns a report dict:
+        files, lines, parsed      counts
+        updated                   [key, ...] new or changed scores
+        unchanged                 [key, ...] already stored with the same score
+        failed                    [{"file", "line", "text"}, ...] lines that did not parse
+        missing                   [path, ...] inputs that do not exist
+        written                   path written, or None
+        seconds
+    """
+    t0 = time.perf_counter()
+    json_file = ms.resolve_path(json_file)
+    report = {"files": 0, "lines": 0, "parsed": 0, "updated": [], "unchanged": [],
+              "failed": [], "missing": [], "written": None}
+
+    # Last parsed line per (team pair, gender), across all sheets
+    parsed = {}
+    for path in score_files(paths):
+        try:
+            with open(path, "r", encoding="utf-8-sig") as f:
+                text = f.read()
+        except OSError:
+            report["missing"].append(path)
+            continue
+        report["files"] += 1
+        for lineno, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            report["lines"] += 1
+            p = parse_score_line(line)
+            if p is None:
+                report["failed"].append({"file": path, "line": lineno, "text": line.strip()})
+                continue
+            report["parsed"] += 1
+            parsed[pair_key(p["t1"], p["t2"], p["gender"])] = p
+
+    # One pass against the stored scores, matched through the store's pair index
+    data = ms.read_scores(json_file)
+    store = ms.ManualScoreStore(data, json_file)
+    for p in parsed.values():
+        key = store.stored_key(p["t1"], p["t2"], p["gender"])
+        if key is None:
+            key = ms.score_key(p["t1"], p["t2"], p["gender"])
+            entry = {"s1": p["s1"], "s2": p["s2"], "id": p["mid"]}
+        elif ms.parse_key(key)[0].upper() == p["t1"]:
+            entry = {"s1": p["s1"], "s2": p["s2"], "id": p["mid"]}
+        else:
+            entry = {"s1": p["s2"], "s2": p["s1"], "id": p["mid"]}
+        old = data.get(key)
+        if isinstance(old, dict) and old.get("s1") == entry["s1"] and old.get("s2") == entry["s2"]:
+            report["unchanged"].append(key)
+            continue
+        data[key] = entry
+        report["updated"].append(key)
+
+    if report["updated"] and not dry_run:
+        report["written"] = ms.write_scores(data, json_file)
+    report["seconds"] = time.perf_counter() - t0
+    return report
+
+
+def format_report(report):
+    """Human-readable summary of an ingest_score_files report."""
+    lines = [f"{report['files']} file(s), {report['lines']} line(s): {report['parsed']} parsed, "
+             f"{len(report['updated'])} updated, {len(report['unchanged'])} unchanged, "
+             f"{len(report['failed'])} failed ({report['seconds'] * 1000:.0f} ms)"]
+    for path in report["missing"]:
+        lines.append(f"  missing: {path}")
+    for fail in report["failed"]:
+        lines.append(f"  {fail['file']}:{fail['line']}: could not parse: {fail['text']}")
+    lines.append(f"  written: {report['written']}" if report["written"] else "  nothing written")
+    return "\n".join(lines)
+
+
 def update_scores(input_file, json_file):
     if not os.path.exists(input_file):
         print(f"Input file not found: {input_file}")
         return
 
-    # Load existing
-    if os.path.exists(json_file):
-        with open(json_file, "r") as f:
-            try:
-                data = json.load(f)
-            except:
-                data = {}
-    else:
-        data = {}
-        
-    updated_count = 0
-    with open(input_file, "r") as f:
-        for line in f:
-            if not line.strip(): continue
-            
-            parsed = parse_score_line(line)
-            if parsed:
-                # Create Key: TEAM_A_VS_TEAM_B_GENDER
-                # We need to ensure we match the keys generated by the app.
-                # The app tries both T1_VS_T2 and T2_VS_T1.
-                # So we just insert one standard key.
-                
-                key = f"{parsed['t1']}_VS_{parsed['t2']}_{parsed['gender']}"
-                
-                # Check if exists or needs update
-                if key not in data or data[key]['s1'] != parsed['s1'] or data[key]['s2'] != parsed['s2']:
-                    data[key] = {
-                        "s1": parsed['s1'],
-                        "s2": parsed['s2'],
-                        "id": parsed['mid']
-                    }
-                    updated_count += 1
-                    print(f"Updated: {key} -> {parsed['s1']}-{parsed['s2']}")
-            else:
-                print(f"Failed to parse: {line.strip()}")
-
-    # Save
-    with open(json_file, "w") as f:
-        json.dump(data, f, indent=2)
-    
-    print(f"\nSuccessfully updated {updated_count} matches in {json_file}")
+    report = ingest_score_files([input_file], json_file)
+    data = ms.read_scores(json_file)
+    for key in report["updated"]:
+        print(f"Updated: {key} -> {data[key]['s1']}-{data[key]['s2']}")
+    for fail in report["failed"]:
+        print(f"Failed to parse: {fail['text']}")
+
+    print(f"\nSuccessfully updated {len(report['updated'])} matches in {json_file}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest daily score sheets into manual_scores.json")
+    parser.add_argument("inputs", nargs="*", default=["day 1 scores.txt"],
+                        help="score sheets and/or directories of *.txt sheets")
+    parser.add_argument("--out", default=ms.MANUAL_SCORES_PATH, help="manual scores JSON to update")
+    parser.add_argument("--dry-run", action="store_true", help="report only, do not write")
+    parser.add_argument("--report", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    print(f"Parsing {', '.join(args.inputs)}...")
+    report = ingest_score_files(args.inputs, args.out, dry_run=args.dry_run)
+    print(format_report(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["missing"] else 0
+
 
 if __name__ == "__main__":
-    # Default paths
-    INPUT_TXT = "day 1 scores.txt" 
-    OUTPUT_JSON = "data/processed/manual_scores.json"
-    
-    if len(sys.argv) > 1:
-        INPUT_TXT = sys.argv[1]
-        
-    print(f"Parsing {INPUT_TXT}...")
-    update_scores(INPUT_TXT, OUTPUT_JSON)
+    sys.exit(main())
@@ -1,6 +1,10 @@
 import pandas as pd
-import json
 import os
+import sys
+
+# Runnable as a script from the repo root as well as with -m
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.core import manual_scores as ms
 
 # Data extracted manually from the "Day 1 Results" image
 IMAGE_DATA = [
@@ -50,12 +54,8 @@ def run_update():
         return
 
     # Load Scores
-    scores_path = "data/processed/manual_scores.json"
-    if os.path.exists(scores_path):
-        with open(scores_path, "r") as f:
-            scores = json.load(f)
-    else:
-        scores = {}
+    scores_path = ms.MANUAL_SCORES_PATH
+    scores = ms.read_scores(scores_path)
 
     exact_matches = 0
     fuzzy_matches = 0
@@ -157,9 +157,8 @@ def run_update():
                 "id": f"IMG_{item['num']}"
             }
 
-    # Save
-    with open(scores_path, "w") as f:
-        json.dump(scores, f, indent=2)
+    # Save (validated, atomic: the hub never reads a half-written file)
+    ms.write_scores(scores, scores_path)
         
     print(f"\nSummary:\nExact Matches: {exact_matches}\nFuzzy Matches: {fuzzy_matches}\nMissing Matches: {missing_matches}")
 
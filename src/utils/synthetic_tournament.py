@@ -0,0 +1,141 @@
+"""Synthetic tournament generator producing data.json-shaped matches.
+
+Used by the benchmark harness (src.utils.benchmark) to exercise the pipeline at
+sizes well beyond the real tournament.
+
+Usage:
+    python -m src.utils.synthetic_tournament --matches 1000 --out data/processed/synthetic.json
+"""
+import argparse
+import json
+import os
+import random
+
+COUNT_STATS = ["2PM", "2PA", "3PM", "3PA", "FGM", "FGA", "FTM", "FTA", "OREB", "DREB", "REB",
+               "AST", "STL", "BLK", "BLKR", "TOV", "PF", "FD", "PTS", "OffPTS", "DefPTS",
+               "TmPoss", "OppPoss", "MIN_DEC"]
+
+GENDERS = ["Men", "Women"]
+
+
+def _player_period(rng, name, team, no, mins):
+    """One player's line for one period."""
+    fga2 = rng.randint(0, 5)
+    fga3 = rng.randint(0, 3)
+    fgm2 = rng.randint(0, fga2)
+    fgm3 = rng.randint(0, fga3)
+    fta = rng.randint(0, 2)
+    ftm = rng.randint(0, fta)
+    oreb = rng.randint(0, 1)
+    dreb = rng.randint(0, 2)
+    return {
+        "Player": name, "Team": team, "No": str(no),
+        "MIN_DEC": round(mins, 2),
+        "2PM": fgm2, "2PA": fga2, "3PM": fgm3, "3PA": fga3,
+        "FGM": fgm2 + fgm3, "FGA": fga2 + fga3, "FTM": ftm, "FTA": fta,
+        "OREB": oreb, "DREB": dreb, "REB": oreb + dreb,
+        "AST": rng.randint(0, 2), "STL": rng.randint(0, 1), "BLK": rng.randint(0, 1), "BLKR": 0,
+        "TOV": rng.randint(0, 1), "PF": rng.randint(0, 1), "FD": rng.randint(0, 1),
+        "PTS": 2 * fgm2 + 3 * fgm3 + ftm,
+        "OffPTS": rng.randint(4, 20), "DefPTS": rng.randint(4, 20),
+        "TmPoss": rng.randint(4, 18), "OppPoss": rng.randint(4, 18),
+    }
+
+
+def _mins_str(mins):
+    return f"{int(mins):02d}:{int(round((mins % 1) * 60)) % 60:02d}"
+
+
+def make_teams(n_teams):
+    """Team names per gender; the same names are used in both divisions."""
+    return [f"TEAM {i:03d}" for i in range(n_teams)]
+
+
+def make_match(rng, mid, t1, t2, gender, date, players_per_team=10, quarters=4, overtime=0):
+    """One data.json match dict (PlayerStats is the sum of PeriodStats)."""
+    periods = [f"Q{q}" for q in range(1, quarters + 1)] + [f"OT{o}" for o in range(1, overtime + 1)]
+    period_stats = {}
+    full = {}
+    for q in periods:
+        q_stats = {}
+        for team in (t1, t2):
+            for j in range(players_per_team):
+                name = f"{team.title()} {gender} P{j:02d}"
+                line = _player_period(rng, name, team, j + 4, rng.uniform(0, 10.0 / max(1, players_per_team // 5)))
+                line["Mins"] = _mins_str(line["MIN_DEC"])
+                q_stats[name] = line
+                if name not in full:
+                    full[name] = dict(line)
+                else:
+                    for k in COUNT_STATS:
+                        full[name][k] += line[k]
+        period_stats[q] = q_stats
+
+    for s in full.values():
+        s["MIN_DEC"] = round(s["MIN_DEC"], 2)
+        s["Mins"] = _mins_str(s["MIN_DEC"])
+
+    team_stats = {}
+    for key, team in (("t1", t1), ("t2", t2)):
+        team_stats[key] = {k: sum(s[k] for s in full.values() if s["Team"] == team)
+                           for k in COUNT_STATS if k != "MIN_DEC"}
+
+    return {
+        "MatchID": str(mid),
+        "Category": gender,
+        "Teams": {"t1": t1, "t2": t2},
+        "Metadata": {"MatchDate": date},
+        "TeamStats": team_stats,
+        "PlayerStats": full,
+        "PeriodStats": period_stats,
+    }
+
+
+def generate_tournament(n_matches=56, n_teams=32, players_per_team=10, quarters=4,
+                        overtime_rate=0.05, group_size=4, seed=0, start_id=2797000):
+    """
+    Return (matches, schedule_rows).
+
+    matches is a {MatchID: match} dict like the production data.json; schedule_rows
+    are compiled_schedule.csv-shaped dicts (Day, Match ID, Team A, Team B, Gender,
+    Group, Genius Match ID) pointing at the same games, grouped round-robin style.
+    """
+    rng = random.Random(seed)
+    teams = make_teams(n_teams)
+    groups = [teams[i:i + group_size] for i in range(0, len(teams), group_size)]
+    groups = [g for g in groups if len(g) > 1] or [teams]
+
+    matches = {}
+    schedule = []
+    for i in range(n_matches):
+        gender = GENDERS[i % 2]
+        g_idx = (i // 2) % len(groups)
+        t1, t2 = rng.sample(groups[g_idx], 2)
+        mid = start_id + i
+        day = (i // 40) % 28 + 1
+        date = f"2026-01-{day:02d} {8 + (i % 12):02d}:00"
+        ot = 1 if rng.random() < overtime_rate else 0
+        matches[str(mid)] = make_match(rng, mid, t1, t2, gender, date, players_per_team, quarters, ot)
+        schedule.append({
+            "Day": day, "Match ID": i + 1, "Team A": t1, "Team B": t2, "Gender": gender,
+            "Group": chr(ord("A") + g_idx % 26) + (str(g_idx // 26) if g_idx >= 26 else ""),
+            "Genius Match ID": float(mid),
+        })
+    return matches, schedule
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic data.json")
+    parser.add_argument("--matches", type=int, default=56)
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--players", type=int, default=10, help="players per team")
+    parser.add_argument("--quarters", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=os.path.join("data", "processed", "synthetic.json"))
+    args = parser.parse_args()
+
+    data, _ = generate_tournament(args.matches, args.teams, args.players, args.quarters, seed=args.seed)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    print(f"Wrote {len(data)} matches to {args.out}")